@@ -0,0 +1,162 @@
+"""
+Rendering benchmark (offscreen - runs with SDL_VIDEODRIVER=dummy, so it needs no display).
+
+Runs UI.update (with UI.hud) on populations of enemies, towers and projectiles scripted
+by the synthetic scenarios of the simulation benchmark (towers of the game's upgrade trees only) (the world advances one tick per frame, not timed).
+The frame cap is turned off, so only drawing and updating the display is measured.
+
+Reported for every scenario:
+    ms_per_frame - mean time of UI.update (best of the repeated runs),
+    hud_ms_per_frame - mean time of UI.hud (part of ms_per_frame),
+    blits_per_frame - sprites drawn through the dirty-rectangle renderer,
+    text_renders_per_frame - texts rasterised (misses of the UI text cache).
+
+Results are compared against the stored baseline (rendering_baseline.json), a scenario regresses if it gets slower
+by more than the tolerance or draws more sprites or texts than before (counts are deterministic).
+
+Usage (from the root directory of the repository):
+    python -m Benchmarks.rendering_benchmark                    # run all scenarios and compare against the baseline
+    python -m Benchmarks.rendering_benchmark --quick            # fewer frames and repeats (smoke run)
+    python -m Benchmarks.rendering_benchmark --update-baseline  # run and store the results as the new baseline
+"""
+
+import os, sys, json, platform
+from time import perf_counter
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from .simulation_benchmark import ROOT_DIRECTORY, synthetic_scenario
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rendering_baseline.json")
+# Scenarios: name -> (enemies on the map, towers of every type)
+SCENARIOS = {"no enemies, 1 tower per type": (0, 1),
+             "100 enemies, 1 tower per type": (100, 1),
+             "500 enemies, 2 towers per type": (500, 2),
+             "1000 enemies, 4 towers per type": (1000, 4)}
+
+
+def create_ui():
+    """Creates the UI (on the dummy display) with the frame cap turned off."""
+    from Classes.UI.UI import UI
+    ui = UI(ROOT_DIRECTORY)
+    # Load HUD and towers graphics (otherwise loaded with the first level)
+    ui.load_gfx(ui.directory)
+    ui.gfx_loaded = True
+    # clock.tick(0) doesn't wait
+    ui.FPS = 0
+    return ui
+
+def run_scenario(ui, name: str, frames: int = 300, repeat: int = 5) -> dict:
+    """
+    Measures a single scenario.
+
+    Arguments:
+        ui (UI): The UI to draw with (see create_ui).
+        name (str): Name of the scenario (key of SCENARIOS).
+        frames (int): Number of measured frames. Defaults to 300.
+        repeat (int): Number of runs, the fastest one is reported. Defaults to 5.
+
+    Returns:
+        dict: ms_per_frame, hud_ms_per_frame, blits_per_frame and text_renders_per_frame.
+    """
+    from Classes.UI.UI import UI
+    from Classes.Enemy.Enemy import Enemy
+
+    enemies, towers_per_type = SCENARIOS[name]
+    best = None
+    for _ in range(repeat):
+        # Towers the game draws (test towers have no graphics)
+        simulation, tick = synthetic_scenario(enemies, towers_per_type, list(ui.towers_gfx))
+        UI.state["wave"] = True
+        ui.load_lvl(simulation.player.name, simulation.level.waves_num, simulation.level.current_wave,
+                    simulation.level.map.name, enemies_names={name: name + ".png" for name in Enemy.enemy_types})
+
+        # Count sprites drawn and time the HUD
+        counts = {"blits": 0, "hud": 0.0}
+        blit = ui.renderer.blit
+        def counting_blit(*arguments):
+            counts["blits"] += 1
+            return blit(*arguments)
+        ui.renderer.blit = counting_blit
+        hud = ui.hud
+        def timed_hud(*arguments):
+            start = perf_counter()
+            hud(*arguments)
+            counts["hud"] += perf_counter() - start
+        ui.hud = timed_hud
+
+        # First frame draws the whole screen (and fills the emptied text cache)
+        ui.text_cache.clear()
+        ui.update(simulation.player.gold, simulation.player.lives, simulation.level.enemies, simulation.level.map)
+        counts["blits"], counts["hud"] = 0, 0.0
+        misses = ui.text_cache.misses
+        elapsed = 0.0
+        for _ in range(frames):
+            tick()
+            start = perf_counter()
+            ui.update(simulation.player.gold, simulation.player.lives, simulation.level.enemies, simulation.level.map)
+            elapsed += perf_counter() - start
+        del ui.renderer.blit, ui.hud
+
+        result = {"ms_per_frame": round(elapsed / frames * 1000, 3),
+                  "hud_ms_per_frame": round(counts["hud"] / frames * 1000, 3),
+                  "blits_per_frame": round(counts["blits"] / frames, 1),
+                  "text_renders_per_frame": round((ui.text_cache.misses - misses) / frames, 2)}
+        if best is None or result["ms_per_frame"] < best["ms_per_frame"]:
+            best = result
+    UI.state["wave"] = False
+    return best
+
+def compare(baseline: dict[str, dict], results: dict[str, dict], tolerance: float = 0.3) -> list[str]:
+    """
+    Compares results against the baseline.
+
+    Arguments:
+        baseline (dict[str, dict]): Baseline results by scenario name.
+        results (dict[str, dict]): Current results by scenario name.
+        tolerance (float): Relative slowdown treated as noise (defaults to 30%, plus 0.1 ms for the cheapest frames - counts are the exact check).
+
+    Returns:
+        list[str]: Descriptions of regressions (empty if there are none).
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        expected = baseline[name]
+        change = result["ms_per_frame"] / expected["ms_per_frame"] - 1
+        print(f"{name:<35} ms/frame {change:>+7.1%}   blits {expected['blits_per_frame']} -> {result['blits_per_frame']}   "
+              f"text renders {expected['text_renders_per_frame']} -> {result['text_renders_per_frame']}")
+        if result["ms_per_frame"] > expected["ms_per_frame"] * (1 + tolerance) + 0.1:
+            regressions.append(f"{name}: {change:.0%} slower")
+        for count in ("blits_per_frame", "text_renders_per_frame"):
+            if result[count] > expected[count]:
+                regressions.append(f"{name}: {count} {expected[count]} -> {result[count]}")
+    return regressions
+
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    settings = {"frames": 60, "repeat": 1} if "--quick" in arguments else {}
+
+    ui = create_ui()
+    results = {}
+    for name in SCENARIOS:
+        results[name] = run_scenario(ui, name, **settings)
+        print(f"{name:<35} {results[name]['ms_per_frame']:>7.3f} ms/frame (hud {results[name]['hud_ms_per_frame']:.3f}) "
+              f"{results[name]['blits_per_frame']:>7.1f} blits {results[name]['text_renders_per_frame']:>6.2f} text renders", flush=True)
+
+    if "--update-baseline" in arguments:
+        with open(BASELINE_PATH, "w") as file:
+            json.dump({"machine": f"{platform.processor() or platform.machine()}, {platform.system()}, Python {platform.python_version()}",
+                       "scenarios": results}, file, indent=4)
+        print(f"Baseline saved to {BASELINE_PATH}")
+    elif os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as file:
+            baseline = json.load(file)
+        print(f"\nCompared to baseline ({baseline['machine']}):")
+        regressions = compare(baseline["scenarios"], results)
+        for regression in regressions:
+            print("REGRESSION:", regression)
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,236 @@
+"""
+Simulation throughput benchmark (headless - no display, no frame cap).
+
+Drives Level, EnemyManager and Tower_Manager through Simulation.tick in reproducible scenarios:
+    - the real TEST and TRUANCY levels played from start to end with a fixed set of towers,
+    - synthetic waves keeping N enemies (of all Enemy.enemy_types) on the TRUANCY map,
+      shot at by M towers of every Tower.tower_types entry.
+Every scenario is run in a separate process (so class-level game state and peak RSS don't leak between them).
+
+Reported for every scenario:
+    ticks_per_second - median of the repeated timed runs,
+    peak_kib_per_tick - mean tracemalloc peak of a tick: memory allocated within the tick and not yet freed at its peak
+                        (above the memory traced at the start of the tick, measured in a separate run - not a count of allocations),
+    peak_rss_mib - peak resident memory of the process (None where the resource module is not available, eg. Windows).
+
+Results are compared against the stored baseline (simulation_baseline.json, measured on the machine noted in it),
+a scenario regresses if it gets slower or its peak memory per tick grows by more than the tolerance.
+Quick runs measure fewer ticks than the baseline, so they are not compared against it (nor stored as one).
+
+Usage (from the root directory of the repository):
+    python -m Benchmarks.simulation_benchmark                    # run all scenarios and compare against the baseline
+    python -m Benchmarks.simulation_benchmark --quick            # fewer ticks and repeats (smoke run, not compared)
+    python -m Benchmarks.simulation_benchmark --update-baseline  # run and store the results as the new baseline
+    python -m Benchmarks.simulation_benchmark --scenario NAME    # run a single scenario (prints JSON)
+"""
+
+import os, sys, json, platform, subprocess, tracemalloc
+from math import ceil
+from statistics import median
+from time import perf_counter
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "simulation_baseline.json")
+
+# Towers of the level scenarios (the same as in golden traces): (tower, tile, target criteria)
+LEVEL_TOWERS = (("Algebra_LT", (4, 2), 'front'),
+                ("Analysis_calculus_specialist", (6, 2), 'back'),
+                ("Algebra_complex_", (8, 2), 'high_hp'),
+                ("Analysis_basic", (10, 2), 'low_hp'),
+                ("Programming_object", (11, 3), 'front'),
+                ("Programing_spaghetti_decoder", (13, 5), 'low_hp'))
+# Scenarios: name -> ("level", level name) or ("synthetic", enemies on the map, towers of every type)
+SCENARIOS = {"level TEST": ("level", "TEST"),
+             "level TRUANCY": ("level", "TRUANCY"),
+             "synthetic 100 enemies, 1 tower per type": ("synthetic", 100, 1),
+             "synthetic 500 enemies, 2 towers per type": ("synthetic", 500, 2),
+             "synthetic 1000 enemies, 4 towers per type": ("synthetic", 1000, 4)}
+# Health multiplier of synthetic enemies (so that towers kill some of them, but the map doesn't empty)
+SYNTHETIC_HP = 30
+# Ticks of synthetic scenarios before measuring (the map fills with enemies)
+SYNTHETIC_WARMUP = 300
+
+
+def level_scenario(level_name: str):
+    """
+    Prepares the real level with the fixed set of towers.
+
+    Returns:
+        tuple[Simulation, Callable[[], bool]]: The simulation and a function advancing it by a tick (False when the level is finished).
+    """
+    from Classes.Simulation.Simulation import Simulation
+    from Classes.Tower.Tower_Classes import Tower_Manager
+    from Classes.Utilities import Coord
+
+    simulation = Simulation(level_name, ROOT_DIRECTORY, auto_start_waves=True)
+    simulation.player.gold = 10**6
+    for tower, (x, y), criteria in LEVEL_TOWERS:
+        simulation.place_tower(tower, Coord(x, y))
+        list(Tower_Manager.towers)[-1].target_criteria = criteria
+    return simulation, lambda: simulation.step() == 1
+
+def synthetic_scenario(enemies: int, towers_per_type: int, tower_names: list[str] = None):
+    """
+    Prepares the TRUANCY map with towers_per_type towers of every type (on tiles closest to the path)
+    and a spawner keeping enemies enemies (of all types in turn) on the map.
+    tower_names limits the types of towers placed (defaults to all Tower.tower_types).
+
+    Returns:
+        tuple[Simulation, Callable[[], bool]]: The simulation and a function advancing it by a tick.
+    """
+    from Classes.Simulation.Simulation import Simulation
+    from Classes.Enemy.Enemy import Enemy, EnemyManager
+    from Classes.Tower.Tower_Classes import Tower
+    from Classes.Utilities import Coord
+
+    simulation = Simulation("TRUANCY", ROOT_DIRECTORY)
+    simulation.player.gold = 10**9
+    simulation.player.lives = 10**9
+    level = simulation.level
+    # Waves of the level are replaced by the spawner
+    level.remaining_enemies = 0
+
+    # Towers on accessible tiles, closest to the path first
+    path = level.map.paths[0]
+    tiles = sorted((Coord(x, y) for y in range(len(level.map.grid)) for x in range(len(level.map.grid[0]))),
+                   key=lambda tile: (min(max(abs(tile.x - step.x), abs(tile.y - step.y)) for step in path), tile.y, tile.x))
+    tiles = iter([tile for tile in tiles if level.map.tile_accessibility(tile)])
+    for tower in Tower.tower_types if tower_names is None else tower_names:
+        for _ in range(towers_per_type):
+            simulation.place_tower(tower, next(tiles))
+
+    types = list(Enemy.enemy_types)
+    spawn_rate = ceil(enemies / 200)
+    spawned = [0]
+    simulation.start_wave()
+
+    def tick() -> bool:
+        for _ in range(min(spawn_rate, enemies - len(EnemyManager.present))):
+            EnemyManager(level.map, types[spawned[0] % len(types)], SYNTHETIC_HP)
+            spawned[0] += 1
+        simulation.tick()
+        return True
+
+    for _ in range(SYNTHETIC_WARMUP):
+        tick()
+    return simulation, tick
+
+def prepare(name: str):
+    """Prepares the scenario (see SCENARIOS), returns the simulation and its tick function."""
+    kind, *arguments = SCENARIOS[name]
+    return level_scenario(*arguments) if kind == "level" else synthetic_scenario(*arguments)
+
+def run_scenario(name: str, ticks: int = 2000, repeat: int = 5, alloc_ticks: int = 200) -> dict:
+    """
+    Measures a single scenario (in the current process).
+
+    Arguments:
+        name (str): Name of the scenario (key of SCENARIOS).
+        ticks (int): Maximal number of timed ticks (levels stop when finished). Defaults to 2000.
+        repeat (int): Number of timed runs, the median is reported. Defaults to 5.
+        alloc_ticks (int): Number of ticks traced for peak memory. Defaults to 200.
+
+    Returns:
+        dict: ticks, ticks_per_second, peak_kib_per_tick and peak_rss_mib.
+    """
+    speeds = []
+    for _ in range(repeat):
+        simulation, tick = prepare(name)
+        done = 0
+        start = perf_counter()
+        while done < ticks and tick():
+            done += 1
+        speeds.append(done / (perf_counter() - start))
+
+    # Peak memory of ticks (traced run - slower, so not timed)
+    simulation, tick = prepare(name)
+    tracemalloc.start()
+    allocated = traced = 0
+    while traced < min(alloc_ticks, done):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        if not tick():
+            break
+        allocated += tracemalloc.get_traced_memory()[1] - before
+        traced += 1
+    tracemalloc.stop()
+
+    peak_rss = None
+    if resource is not None:
+        # kilobytes on Linux, bytes on macOS
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (2**20 if sys.platform == "darwin" else 2**10)
+
+    return {"ticks": done,
+            "ticks_per_second": round(median(speeds), 1),
+            "peak_kib_per_tick": round(allocated / max(traced, 1) / 1024, 2),
+            "peak_rss_mib": None if peak_rss is None else round(peak_rss, 1)}
+
+def run_all(quick: bool = False) -> dict[str, dict]:
+    """Runs every scenario in a separate process, returns results by scenario name."""
+    results = {}
+    for name in SCENARIOS:
+        command = [sys.executable, "-m", "Benchmarks.simulation_benchmark", "--scenario", name] + (["--quick"] if quick else [])
+        output = subprocess.run(command, cwd=ROOT_DIRECTORY, capture_output=True, text=True, check=True).stdout
+        results[name] = json.loads(output.strip().splitlines()[-1])
+        print(f"{name:<45} {results[name]['ticks_per_second']:>10.1f} ticks/s "
+              f"{results[name]['peak_kib_per_tick']:>8.2f} KiB peak/tick {results[name]['peak_rss_mib']} MiB RSS", flush=True)
+    return results
+
+def compare(baseline: dict[str, dict], results: dict[str, dict], tolerance: float = 0.35) -> list[str]:
+    """
+    Compares results against the baseline.
+
+    Arguments:
+        baseline (dict[str, dict]): Baseline results by scenario name.
+        results (dict[str, dict]): Current results by scenario name.
+        tolerance (float): Relative change treated as noise (defaults to 35% - run-to-run noise of the median reaches about 20%).
+
+    Returns:
+        list[str]: Descriptions of regressions (empty if there are none).
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        expected = baseline[name]
+        speed = result["ticks_per_second"] / expected["ticks_per_second"] - 1
+        print(f"{name:<45} ticks/s {speed:>+7.1%}   KiB peak/tick {expected['peak_kib_per_tick']:.2f} -> {result['peak_kib_per_tick']:.2f}")
+        if speed < -tolerance:
+            regressions.append(f"{name}: {-speed:.0%} slower")
+        if result["peak_kib_per_tick"] > expected["peak_kib_per_tick"] * (1 + tolerance) + 1:
+            regressions.append(f"{name}: peak of {result['peak_kib_per_tick']:.2f} KiB per tick (baseline {expected['peak_kib_per_tick']:.2f})")
+    return regressions
+
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    quick = "--quick" in arguments
+    settings = {"ticks": 300, "repeat": 1, "alloc_ticks": 50} if quick else {}
+
+    # Single scenario (run by run_all in a separate process)
+    if "--scenario" in arguments:
+        print(json.dumps(run_scenario(arguments[arguments.index("--scenario") + 1], **settings)))
+        sys.exit()
+
+    results = run_all(quick)
+    if quick:
+        # Fewer (and earlier) ticks than the baseline - not comparable
+        print("\nQuick run - not compared against the baseline.")
+    elif "--update-baseline" in arguments:
+        with open(BASELINE_PATH, "w") as file:
+            json.dump({"machine": f"{platform.processor() or platform.machine()}, {platform.system()}, Python {platform.python_version()}",
+                       "scenarios": results}, file, indent=4)
+        print(f"Baseline saved to {BASELINE_PATH}")
+    elif os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as file:
+            baseline = json.load(file)
+        print(f"\nCompared to baseline ({baseline['machine']}):")
+        regressions = compare(baseline["scenarios"], results)
+        for regression in regressions:
+            print("REGRESSION:", regression)
+        sys.exit(1 if regressions else 0)
@@ -1,6 +1,9 @@
 from ..Utilities import Coord
 from ..Map.Map_Class import Map
+from .Enemy_Pool import EnemyPool
+from .Spatial_Grid import SpatialGrid
 from typing import Type, Self
+from math import ceil
 
 
 class Enemy:
@@ -49,66 +52,73 @@ class EnemyManager:
     Manages enemies on the map, defining how the the moves along the created path,
     storing their current life and checking if the enemy has died.
 
+    State of all enemies is kept in a struct-of-arrays EnemyPool, EnemyManager instance
+    is a read-only view of a single enemy in that pool (used by Tower_Manager and UI).
+
     Class Attributes:
-    present (list): A list that is storing all currently active enemies.
+    pool (EnemyPool): Struct-of-arrays store of all active enemies.
+    present (list): A list that is storing all currently active enemies (views of the pool in slot order).
+    grid (SpatialGrid): Spatial hash of active enemies keyed by tiles (for range queries).
+    gold (int): Gold gathered from killed enemies, collected by Level.
 
     Instance Attributes:
     name (str): The type of enemy being managed.
     map (Map): The game map on which the enemies will move.
     path (list): The path along which the enemies move.
     enemy_type (Enemy): The enemy instance being managed.
+    hp_display: Placeholder for the enemy's health display in the UI.
+
+    Properties (read from the pool):
     speed (int): The speed of the enemy.
     life (int): The current health of the enemy.
     pos (Coord): The current position of the enemy on the map.
     display_pos (tuple): The display position of the enemy for UI.
-    grid_pos (Coord): The grid position of the enemy on the map.
-    tile (int): The current tile index in the path that the enemy is moving towards.
-    hp_display: Placeholder for the enemy's health display in the UI.
+    grid_pos (Coord): The grid position (tile) of the enemy on the map.
+    distance (float): Distance travelled along the path in pixels.
+    tile (int): The current waypoint index in the path polyline that the enemy is moving towards.
     attacked (bool): Indicates if the enemy has been attacked. Used by the UI to show that enemy has been attacked (indicated by little star).
-    attacked_count (int or None): Counter for the attacked. Lasts 10 frames by default.
+    attacked_count (int): Counter for the attacked. Lasts 15 frames by default.
     damaged_player (bool): Indicates if the enemy has damaged the player.
 
     Methods:
-    __init__(map: Map, enemy_type: str = 'test_enemy'): Initializes an enemy manager with a specified map and enemy type.
+    __init__(map: Map, enemy_type: str = 'test_enemy', hp_increase: float = 1): Initializes an enemy with a specified map and enemy type.
     __repr__() -> str: Returns a string representation of the enemy: type(name), health, and position.
     take_damage(damage): Reduces the enemy's life by the specified damage amount and sets it to attacked state if life is reduced.
-    remove_attacked(): Decreases the attacked_count if the enemy is attacked and removes the attacked state when the count reaches zero.
-    movement(): Moves the enemy along the defined path on the map based on its speed. If the enemy reaches the end of the path, it continues moving right.
-    remove_enemy(): Removes the enemy from the present list if its life reaches zero.
-    
 
     Class methods:
     reset(cls) -> None: Clears all enemies.
     endlevel():  method to clear all active enemies at the end of a level.
     update():  method to update all active enemies, checking their health, movement, and attacked state every frame.
+    leaked() -> int: Returns number of enemies that damaged the player since the last call.
+    frames_to_leak() -> int: Returns number of frames until the next enemy reaches the end of the path.
     """
 
-    present: list[Self] = []
+    pool: EnemyPool = EnemyPool()
+    present: list[Self] = pool.views
+    grid: SpatialGrid = pool.grid
     gold = 0
 
-    def __init__(self, map: Map, enemy_type: str = 'test_enemy'):
+    def __init__(self, map: Map, enemy_type: str = 'test_enemy', hp_increase: float = 1):
         """
         Initializes the EnemyManager with the specified map and enemy type.
 
         Arguments:
         map (Map): The game map on which the enemies will move.
         enemy_type (str): The type of enemy to be managed (default is 'test_enemy').
+        hp_increase (float): Multiplier of the enemy base health, used in further waves (default is 1).
         """
         self.name: str = enemy_type
         self.map: Map = map
         self.path: list = map.paths[0]
         self.enemy_type: Enemy = Enemy(enemy_type)
-        self.speed: int = self.enemy_type.speed
-        self.life: int = self.enemy_type.life
-        self.grid_pos: Coord = self.path[0]
-        self.display_pos: tuple = tuple(Coord.grid_middle_point(self.grid_pos))
-        self.pos: Coord = Coord(*self.display_pos)
-        self.tile: int = 0
         self.hp_display: int = None # Used in UI
-        self.attacked: bool = False
-        self.attacked_count: int = None
-        self.damaged_player: bool = False
-        EnemyManager.present.append(self)
+        self._pool = EnemyManager.pool
+        self._slot: int = self._pool.add(self, map.polylines[0], ceil(self.enemy_type.life*hp_increase), self.enemy_type.speed)
+
+    def _detach(self, snapshot) -> None:
+        """Called by the pool when the enemy is removed, makes the view read its last state from snapshot."""
+        self._pool = snapshot
+        self._slot = 0
 
     def __repr__(self) -> str:
         """
@@ -119,86 +129,80 @@ class EnemyManager:
         """
 
         return(f"{self.name} enemy with {self.life} hp and {self.pos} position")
-    
-    def take_damage(self, damage):
-        """
-        Reduces the enemy's life by the specified damage amount and sets it to attacked state.
 
-        Arguments:
-        damage (int): The amount of damage to expose the enemy.
-        """
+    @property
+    def speed(self) -> int:
+        return self._pool.speed.item(self._slot)
 
-        self.life -= damage
-        if self.life < 0:
-            self.life = 0
-        self.attacked = True
-        self.attacked_count = 15
+    @property
+    def life(self) -> int:
+        return self._pool.life.item(self._slot)
 
-    def remove_attacked(self):
-        """
-        Decreaseas the attacked_count if the enemy is attacked and removes the attacked state
-        when the count reaches zero.
-        """
+    @property
+    def pos(self) -> Coord:
+        return Coord(self._pool.x.item(self._slot), self._pool.y.item(self._slot))
+
+    @property
+    def display_pos(self) -> tuple:
+        return (self._pool.x.item(self._slot) - 30, self._pool.y.item(self._slot) - 30)
 
-        if self.attacked_count:
-            self.attacked_count -= 1
-        else:
-            self.attacked = False
+    @property
+    def grid_pos(self) -> Coord:
+        return Coord(self._pool.cell_x.item(self._slot), self._pool.cell_y.item(self._slot))
 
-    def movement(self):
+    @property
+    def distance(self) -> float:
+        return self._pool.distance.item(self._slot)
+
+    @property
+    def tile(self) -> int:
+        return self._pool.tile.item(self._slot)
+
+    @property
+    def attacked(self) -> bool:
+        return bool(self._pool.flags[self._slot] & EnemyPool.ATTACKED)
+
+    @property
+    def attacked_count(self) -> int:
+        return self._pool.attacked_count.item(self._slot)
+
+    @property
+    def damaged_player(self) -> bool:
+        return bool(self._pool.flags[self._slot] & EnemyPool.DAMAGED_PLAYER)
+
+    def take_damage(self, damage):
         """
-        Moves the enemy along the defined path on the map based on its speed. 
-        If the enemy reaches the end of the path, it continues moving right.
+        Reduces the enemy's life by the specified damage amount and sets it to attacked state.
+
+        Arguments:
+        damage (int): The amount of damage to expose the enemy.
         """
+        EnemyPool.damage(self._pool, self._slot, damage)
 
-        if self.tile < len(self.path):
-            destination: Coord = self.path[self.tile] 
-            direction: Coord = destination - self.grid_pos
-            self.pos += Coord(self.speed*direction.x,self.speed*direction.y)
-            self.display_pos: tuple = (self.pos.x - 30,self.pos.y - 30)
-            # Determines if enemy should start moving towards next tile
-            if (
-                destination.grid_middle_point().x - self.speed < self.pos.x < destination.grid_middle_point().x + self.speed
-            ) and (
-                destination.grid_middle_point().y - self.speed < self.pos.y < destination.grid_middle_point().y + self.speed
-            ):
-                self.tile += 1
-                self.grid_pos = Coord(self.pos.x//120,self.pos.y//120)
-        else:
-            # Enemies move to the right after completion of path
-            self.pos += Coord(self.speed,0)
-            self.display_pos: tuple = (self.pos.x - 30,self.pos.y - 30)
-            # Deal damage after completing path
-            if self.pos.x >= 1980 and not self.damaged_player:
-                self.damaged_player = True
-            # Ready to despawn - handled by Level class
-            if self.damaged_player == "done" or self.pos.x >= 2100:
-                EnemyManager.present.remove(self)
-    
     @classmethod
     def reset(cls) -> None:
         """Clear all enemies, when new game starts."""
-        cls.present = [] # clearing list
-                
-    def remove_enemy(self): 
-        """Remove the enemy and add gold from the present list if its life reaches zero."""
-        if self.life == 0:
-            EnemyManager.present.remove(self)
-            EnemyManager.gold += 1
-
+        cls.pool.clear()
 
     @classmethod
     def endlevel(cls):
         """Clear all active enemies at the end of a level."""
-        cls.present = []
+        cls.pool.clear()
 
     @classmethod
     def update(cls : Type[Self]) -> None: 
         """
         Class method to update all active enemies, checking their health, movement, 
-        and attacked state every frame.
+        and attacked state every frame. Runs as one vectorized step over the pool.
         """
-        for enemy in cls.present:
-            enemy.remove_enemy()
-            enemy.movement()
-            enemy.remove_attacked()
+        cls.gold += cls.pool.update()
+
+    @classmethod
+    def leaked(cls) -> int:
+        """Returns number of enemies that damaged the player since the last call (each one is counted once)."""
+        return cls.pool.collect_leaks()
+
+    @classmethod
+    def frames_to_leak(cls) -> int:
+        """Returns number of frames until the next enemy reaches the end of the path (None if there are no enemies)."""
+        return cls.pool.frames_to_leak()
@@ -0,0 +1,291 @@
+import numpy as np
+from math import ceil
+from types import SimpleNamespace
+from .Spatial_Grid import SpatialGrid
+from .Progress_Index import ProgressIndex
+
+
+class EnemyPool:
+    """
+    Struct-of-arrays store of enemies state kept in preallocated NumPy arrays.
+
+    Every active enemy occupies one slot (index) of the arrays. Slots [0, count) are active
+    and kept in spawn order. Position of an enemy is described by a single distance travelled
+    along its path (polyline with arc length precomputed by Map), pixel positions are interpolated from it. Enemies that died or left the map are compacted out in bulk
+    at the end of update(), so the whole population is advanced by a handful of vectorized operations.
+
+    Class Attributes:
+        ATTACKED (int): Flag set while the enemy shows that it has been attacked.
+        DAMAGED_PLAYER (int): Flag set when the enemy reached the end of the map and damaged the player.
+        DONE (int): Flag set when the damage dealt by the enemy has been collected by the level.
+        ARRAYS (tuple[str]): Names of per-enemy arrays.
+
+    Instance Attributes:
+        capacity (int): Number of preallocated slots (doubled when exceeded).
+        count (int): Number of active enemies.
+        x, y (np.ndarray[float]): Screen position of enemies in pixels (interpolated from distance).
+        distance (np.ndarray[float]): Distance travelled along the path in pixels.
+        cell_x, cell_y (np.ndarray[int]): Tile the enemy currently stands on (its bucket in the spatial grid).
+        life (np.ndarray[int]): Current health of enemies.
+        speed (np.ndarray[int]): Number of pixels travelled per frame.
+        tile (np.ndarray[int]): Index of the waypoint in the path that the enemy is moving towards.
+        path_id (np.ndarray[int]): Index of the path (in paths table) the enemy walks along.
+        way_x, way_y, way_length (np.ndarray[float]): Paths table - waypoints of all registered polylines concatenated,
+                                                      with arc length shifted by path_base of every path.
+        path_base, path_total (np.ndarray[float]): Offset in way_length and total length of every registered path.
+        path_first (np.ndarray[int]): Index of the first waypoint of every registered path.
+        attacked_count (np.ndarray[int]): Remaining frames of attacked state.
+        flags (np.ndarray[uint8]): Status flags (ATTACKED, DAMAGED_PLAYER, DONE).
+        leak_frame (np.ndarray[int]): Frame in which the enemy reaches the end of its path.
+        frame (int): Number of updates since the pool was cleared.
+        views (list): Objects representing active enemies (EnemyManager instances), in slot order.
+        grid (SpatialGrid): Spatial hash of enemies keyed by tiles.
+        progress_index (ProgressIndex): Enemies sorted by progress along their paths.
+
+    Methods:
+        __init__(capacity: int = 256) -> None: Preallocates arrays for capacity enemies.
+        add(view, path: Polyline, life: int, speed: int) -> int: Adds an enemy and returns its slot.
+        damage(slot: int, damage: int) -> None: Deals damage to the enemy in the given slot.
+        update() -> int: Advances all enemies by one frame, returns number of killed enemies.
+        progress() -> np.ndarray: Returns distance travelled by every active enemy along its path.
+        frames_to_leak() -> int: Returns number of frames until the next enemy reaches the end of its path.
+        collect_leaks() -> int: Returns number of enemies that damaged the player since the last call.
+        clear() -> None: Removes all enemies.
+    """
+
+    ATTACKED: int = 1
+    DAMAGED_PLAYER: int = 2
+    DONE: int = 4
+    ARRAYS: tuple[str] = ("x", "y", "distance", "cell_x", "cell_y", "life", "speed", "tile", "path_id", "attacked_count", "flags", "leak_frame")
+
+    def __init__(self, capacity: int = 256) -> None:
+        """
+        Preallocates arrays for the given number of enemies.
+
+        Arguments:
+            capacity (int): Initial number of slots (defaults to 256).
+        """
+        self.capacity: int = capacity
+        self.count: int = 0
+        self.x: np.ndarray = np.zeros(capacity, np.float64)
+        self.y: np.ndarray = np.zeros(capacity, np.float64)
+        self.distance: np.ndarray = np.zeros(capacity, np.float64)
+        self.cell_x: np.ndarray = np.zeros(capacity, np.int64)
+        self.cell_y: np.ndarray = np.zeros(capacity, np.int64)
+        self.life: np.ndarray = np.zeros(capacity, np.int64)
+        self.speed: np.ndarray = np.zeros(capacity, np.int64)
+        self.tile: np.ndarray = np.zeros(capacity, np.int64)
+        self.path_id: np.ndarray = np.zeros(capacity, np.int64)
+        self.attacked_count: np.ndarray = np.zeros(capacity, np.int64)
+        self.flags: np.ndarray = np.zeros(capacity, np.uint8)
+        self.leak_frame: np.ndarray = np.zeros(capacity, np.int64)
+        self.frame: int = 0
+        self.views: list = []
+        self.grid: SpatialGrid = SpatialGrid(self)
+        self.progress_index: ProgressIndex = ProgressIndex(self)
+
+        self._reset_paths()
+
+    def _reset_paths(self) -> None:
+        """Empties the paths table."""
+        # Paths table - waypoints of all polylines concatenated, arc length of every path shifted by its base
+        # (bases are separated by a gap, so a single interpolation serves enemies on all paths)
+        self._paths: dict = {}
+        self.way_x: np.ndarray = np.zeros(0, np.float64)
+        self.way_y: np.ndarray = np.zeros(0, np.float64)
+        self.way_length: np.ndarray = np.zeros(0, np.float64)
+        self.path_base: np.ndarray = np.zeros(0, np.float64)
+        self.path_total: np.ndarray = np.zeros(0, np.float64)
+        self.path_first: np.ndarray = np.zeros(0, np.int64)
+
+    def _grow(self) -> None:
+        """Doubles the capacity of all arrays."""
+        self.capacity *= 2
+        for name in EnemyPool.ARRAYS:
+            old = getattr(self, name)
+            new = np.zeros(self.capacity, old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def _path_index(self, path) -> int:
+        """Returns index of the path (Polyline) in the paths table, registering it if needed."""
+        if path not in self._paths:
+            self._paths[path] = len(self._paths)
+            base = self.way_length[-1] + 1 if self.way_length.size else 0.0
+            self.path_base = np.append(self.path_base, base)
+            self.path_total = np.append(self.path_total, path.total_length)
+            self.path_first = np.append(self.path_first, self.way_x.size)
+            self.way_x = np.append(self.way_x, path.x)
+            self.way_y = np.append(self.way_y, path.y)
+            self.way_length = np.append(self.way_length, path.length + base)
+        return self._paths[path]
+
+    def add(self, view, path, life: int, speed: int) -> int:
+        """
+        Adds an enemy at the beginning of the path.
+
+        Arguments:
+            view: Object representing the enemy (kept in views list).
+            path (Polyline): Path the enemy walks along.
+            life (int): Initial health.
+            speed (int): Number of pixels travelled per frame.
+
+        Returns:
+            int: Slot of the added enemy.
+        """
+        if self.count == self.capacity:
+            self._grow()
+        slot = self.count
+        self.count += 1
+        self.x[slot] = path.x[0]
+        self.y[slot] = path.y[0]
+        self.distance[slot] = 0
+        self.cell_x[slot] = path.x[0] // 120
+        self.cell_y[slot] = path.y[0] // 120
+        self.life[slot] = life
+        self.speed[slot] = speed
+        self.tile[slot] = 1
+        self.path_id[slot] = self._path_index(path)
+        self.attacked_count[slot] = 0
+        self.flags[slot] = 0
+        self.leak_frame[slot] = self.frame + ceil(path.total_length / speed)
+        self.views.append(view)
+        self.grid.insert(view, (int(self.cell_x[slot]), int(self.cell_y[slot])))
+        self.progress_index.add(slot, int(self.leak_frame[slot]))
+        return slot
+
+    def damage(self, slot: int, damage: int) -> None:
+        """
+        Reduces life of the enemy in the given slot (not below zero) and sets it to attacked state.
+
+        Arguments:
+            slot (int): Slot of the enemy.
+            damage (int): The amount of damage dealt.
+        """
+        self.life[slot] = max(self.life[slot] - damage, 0)
+        self.flags[slot] |= EnemyPool.ATTACKED
+        self.attacked_count[slot] = 15
+
+    def update(self) -> int:
+        """
+        Advances all enemies by one frame in a single vectorized step.
+
+        Enemies with no life left are removed, the rest moves along their paths
+        (one addition to the distance travelled, positions are interpolated for all enemies at once)
+        and attacked state is counted down.
+
+        Returns:
+            int: Number of enemies killed (removed with no life left).
+        """
+        self.frame += 1
+        n = self.count
+        if not n:
+            return 0
+        flags = self.flags[:n]
+        killed = self.life[:n] == 0
+
+        # Move enemies along their paths
+        distance = self.distance[:n]
+        distance += self.speed[:n]
+        total = self.path_total[self.path_id[:n]]
+        x, y = self._locate(n)
+
+        # Deal damage after completing path
+        hit = (distance >= total) & (flags & EnemyPool.DAMAGED_PLAYER == 0)
+        flags[hit] |= EnemyPool.DAMAGED_PLAYER
+        # Ready to despawn after damage has been collected (or a tile after the end of the path)
+        despawn = (flags & EnemyPool.DONE != 0) | (distance >= total + 120)
+
+        # Move enemies that crossed tile boundaries between buckets of the spatial grid
+        cell_x, cell_y = x // 120, y // 120
+        for slot in np.nonzero((cell_x != self.cell_x[:n]) | (cell_y != self.cell_y[:n]))[0]:
+            new = (int(cell_x[slot]), int(cell_y[slot]))
+            self.grid.move(self.views[slot], (int(self.cell_x[slot]), int(self.cell_y[slot])), new)
+            self.cell_x[slot], self.cell_y[slot] = new
+
+        # Count down attacked state
+        attacked_count = self.attacked_count[:n]
+        counting = attacked_count > 0
+        attacked_count[counting] -= 1
+        flags[~counting] &= ~np.uint8(EnemyPool.ATTACKED)
+
+        self._compact(killed | despawn)
+        self.progress_index.update(self._along(self.count))
+        return int(np.count_nonzero(killed))
+
+    def _compact(self, removed: np.ndarray) -> None:
+        """
+        Removes enemies marked in removed mask keeping order of the remaining ones.
+
+        Removed views are detached - they keep a copy of their last state.
+        """
+        if not removed.any():
+            return
+        n = self.count
+        for slot in np.nonzero(removed)[0]:
+            self.grid.remove(self.views[slot], (int(self.cell_x[slot]), int(self.cell_y[slot])))
+            self.views[slot]._detach(self._snapshot(slot))
+        keep = np.nonzero(~removed)[0]
+        k = keep.size
+        self.progress_index.compact(keep, self.leak_frame[:n][removed])
+        for name in EnemyPool.ARRAYS:
+            array = getattr(self, name)
+            array[:k] = array[:n][keep]
+        self.views[:] = [self.views[slot] for slot in keep]
+        for slot, view in enumerate(self.views):
+            view._slot = slot
+        self.count = k
+
+    def _snapshot(self, slot: int) -> SimpleNamespace:
+        """Returns single-slot copy of the enemy state, readable the same way as the pool."""
+        return SimpleNamespace(**{name: getattr(self, name)[slot:slot + 1].copy() for name in EnemyPool.ARRAYS})
+
+    def _locate(self, n: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Interpolates pixel positions (and waypoints enemies move towards) of the first n enemies
+        from their distances travelled, in one indexed interpolation over the paths table.
+        """
+        path_id = self.path_id[:n]
+        along = self._along(n)
+        x, y = self.x[:n], self.y[:n]
+        x[:] = np.interp(along, self.way_length, self.way_x)
+        y[:] = np.interp(along, self.way_length, self.way_y)
+        self.tile[:n] = np.searchsorted(self.way_length, along, 'right') - self.path_first[path_id]
+        return x, y
+
+    def _along(self, n: int) -> np.ndarray:
+        """Returns position of the first n enemies in the paths table (path base + distance clamped to the path length)."""
+        path_id = self.path_id[:n]
+        return self.path_base[path_id] + np.minimum(self.distance[:n], self.path_total[path_id])
+
+    def progress(self) -> np.ndarray:
+        """
+        Returns distance travelled along the path (in pixels) by every active enemy.
+        """
+        return self.distance[:self.count]
+
+    def frames_to_leak(self) -> int:
+        """Returns number of frames until the next enemy reaches the end of its path (None if there are no enemies)."""
+        return self.progress_index.frames_to_leak()
+
+    def collect_leaks(self) -> int:
+        """
+        Returns number of enemies that damaged the player since the last call
+        and marks their damage as done (they despawn in the next update).
+        """
+        flags = self.flags[:self.count]
+        leaked = (flags & (EnemyPool.DAMAGED_PLAYER | EnemyPool.DONE)) == EnemyPool.DAMAGED_PLAYER
+        flags[leaked] |= EnemyPool.DONE
+        return int(np.count_nonzero(leaked))
+
+    def clear(self) -> None:
+        """Removes all enemies."""
+        for slot, view in enumerate(self.views):
+            view._detach(self._snapshot(slot))
+        self.views.clear()
+        self.grid.clear()
+        self.progress_index.clear()
+        self.count = 0
+        self.frame = 0
+        # Forget paths of previous maps
+        self._reset_paths()
@@ -0,0 +1,167 @@
+import numpy as np
+from bisect import bisect_left, insort
+from ..Utilities import Coord
+
+
+class ProgressIndex:
+    """
+    Index of enemies sorted by progress along their path, re-sorted by EnemyPool every frame.
+
+    Enemies are kept sorted by distance travelled along the path. The index is re-sorted every frame:
+    the order of the previous frame is sorted again by the new distances with a stable (timsort) sort,
+    which is close to linear for the nearly sorted order (only overtakes and spawns are out of place).
+    Moving only the enemies out of order was measured slower than the re-sort for up to 1000 enemies.
+    Frames in which enemies reach the end of the path never change (enemies move with constant speed),
+    so they are kept in a sorted list updated only on spawn and removal.
+
+    Range of a tower is converted into intervals of arc length (Polyline.intervals_within, cached per tower),
+    so "first/last enemy in range" is a binary search per interval and "time until the next leak" is a lookup.
+    Distances along different paths are not comparable, so the index covers enemies of a single path
+    (range queries raise ValueError if the pool has enemies of several paths - EnemyManager spawns all enemies on paths[0] of the map).
+
+    Instance Attributes:
+        pool (EnemyPool): Pool the index is built on.
+        order (np.ndarray[int]): Slots of active enemies sorted by progress (ascending).
+        keys (np.ndarray[float]): Sorted progress keys corresponding to order.
+        leak_frames (list[int]): Sorted frames (pool.frame) in which active enemies reach the end of the path.
+
+    Methods:
+        __init__(pool) -> None: Creates an empty index.
+        add(slot: int, leak_frame: int) -> None: Registers spawned enemy.
+        compact(keep: np.ndarray, removed_leak_frames: np.ndarray) -> None: Follows compaction of the pool.
+        update(keys: np.ndarray) -> None: Re-sorts enemies by their new progress keys.
+        clear() -> None: Removes all enemies and cached intervals.
+        first_in_range(center: Coord, r: float): Returns enemy in range that is the closest to the end of the path.
+        last_in_range(center: Coord, r: float): Returns enemy in range that is the farthest from the end of the path.
+        frames_to_leak() -> int: Returns number of frames until the next enemy reaches the end of the path.
+    """
+
+    def __init__(self, pool) -> None:
+        """
+        Creates an empty index.
+
+        Arguments:
+            pool (EnemyPool): Pool the index is built on.
+        """
+        self.pool = pool
+        self.order: np.ndarray = np.zeros(0, np.int64)
+        self.keys: np.ndarray = np.zeros(0, np.float64)
+        self.leak_frames: list[int] = []
+        self._new: list[int] = []
+        self._intervals: dict[tuple[float, float, float], np.ndarray] = {}
+
+    def add(self, slot: int, leak_frame: int) -> None:
+        """Registers spawned enemy (it is sorted in with the next update or query)."""
+        self._new.append(slot)
+        insort(self.leak_frames, leak_frame)
+
+    def compact(self, keep: np.ndarray, removed_leak_frames: np.ndarray) -> None:
+        """
+        Follows compaction of the pool - drops removed enemies and renumbers slots of the kept ones.
+
+        Arguments:
+            keep (np.ndarray[int]): Old slots of kept enemies (their new slots are their positions in keep).
+            removed_leak_frames (np.ndarray[int]): Leak frames of removed enemies.
+        """
+        for leak_frame in removed_leak_frames:
+            del self.leak_frames[bisect_left(self.leak_frames, leak_frame)]
+        new_slot = np.full(self.pool.capacity, -1, np.int64)
+        new_slot[keep] = np.arange(keep.size)
+        order = new_slot[self.order]
+        self.order = order[order >= 0]
+        self._new = [int(new_slot[slot]) for slot in self._new if new_slot[slot] >= 0]
+
+    def update(self, keys: np.ndarray) -> None:
+        """
+        Re-sorts enemies by their new progress keys (stable sort of the order carried over from the previous frame).
+
+        Arguments:
+            keys (np.ndarray[float]): Progress keys of active enemies (indexed by slot).
+        """
+        if self._new:
+            # Spawned enemies start at the beginning of the path
+            self.order = np.concatenate((np.array(self._new, np.int64), self.order))
+            self._new.clear()
+        self.order = self.order[np.argsort(keys[self.order], kind='stable')]
+        self.keys = keys[self.order]
+
+    def clear(self) -> None:
+        """Removes all enemies and cached intervals."""
+        self.order = np.zeros(0, np.int64)
+        self.keys = np.zeros(0, np.float64)
+        self.leak_frames.clear()
+        self._new.clear()
+        self._intervals.clear()
+
+    def _sync(self) -> None:
+        """Sorts in enemies spawned since the last update."""
+        if self._new:
+            self.update(self.pool._along(self.pool.count))
+
+    def _range_intervals(self, center: Coord, r: float) -> np.ndarray:
+        """Returns (cached until clear() - the path doesn't change before) intervals of progress keys lying within the circle."""
+        if len(self.pool._paths) > 1:
+            raise ValueError("Progress index compares distances along a single path, enemies of the pool walk several paths")
+        key = (center.x, center.y, r)
+        if key not in self._intervals:
+            # The only path of the pool (its base is 0)
+            path = next(iter(self.pool._paths), None)
+            intervals = path.intervals_within(center, r) if path is not None else []
+            self._intervals[key] = np.array(sorted(intervals), np.float64).reshape(-1, 2)
+        return self._intervals[key]
+
+    def first_in_range(self, center: Coord, r: float):
+        """
+        Returns enemy within distance r from center that is the closest to the end of the path.
+
+        Arguments:
+            center (Coord): Center of the range in pixels.
+            r (float): Radius of the range in pixels.
+
+        Returns:
+            EnemyManager: Found enemy or None if there are no enemies in range.
+
+        Raises:
+            ValueError: If enemies of the pool walk several paths.
+        """
+        self._sync()
+        intervals = self._range_intervals(center, r)
+        if not self.keys.size or not intervals.size:
+            return None
+        # Last enemy not further than the end of every interval
+        found = np.searchsorted(self.keys, intervals[:, 1], 'right') - 1
+        valid = (found >= 0) & (self.keys[np.maximum(found, 0)] >= intervals[:, 0])
+        if not valid.any():
+            return None
+        return self.pool.views[self.order[found[valid][-1]]]
+
+    def last_in_range(self, center: Coord, r: float):
+        """
+        Returns enemy within distance r from center that is the farthest from the end of the path.
+
+        Arguments:
+            center (Coord): Center of the range in pixels.
+            r (float): Radius of the range in pixels.
+
+        Returns:
+            EnemyManager: Found enemy or None if there are no enemies in range.
+
+        Raises:
+            ValueError: If enemies of the pool walk several paths.
+        """
+        self._sync()
+        intervals = self._range_intervals(center, r)
+        if not self.keys.size or not intervals.size:
+            return None
+        # First enemy not before the start of every interval
+        found = np.searchsorted(self.keys, intervals[:, 0], 'left')
+        valid = (found < self.keys.size) & (self.keys[np.minimum(found, self.keys.size - 1)] <= intervals[:, 1])
+        if not valid.any():
+            return None
+        return self.pool.views[self.order[found[valid][0]]]
+
+    def frames_to_leak(self) -> int:
+        """Returns number of frames until the next enemy reaches the end of the path (None if there are no enemies)."""
+        if not self.leak_frames:
+            return None
+        return max(self.leak_frames[0] - self.pool.frame, 0)
@@ -0,0 +1,169 @@
+import numpy as np
+from math import inf
+from ..Utilities import Coord
+
+
+class SpatialGrid:
+    """
+    Uniform-grid spatial hash of enemies with one bucket per tile
+    (the same grid that Coord.res2tile uses, 120px by default).
+
+    Buckets are updated incrementally by EnemyPool - only enemies that crossed
+    a tile boundary are moved between buckets. Positions of enemies are read
+    from the pool, so queries cost time in proportion to the number of enemies
+    in the neighbouring tiles rather than the total enemy count.
+
+    Instance Attributes:
+        pool (EnemyPool): Pool the enemies positions are read from.
+        tile_size (int): Size of a single bucket (tile) in pixels.
+        buckets (dict[tuple[int, int], dict]): Enemies (views) in every non-empty tile, in order of entering it.
+
+    Methods:
+        __init__(pool, tile_size: int = 120) -> None: Creates empty grid.
+        insert(view, cell: tuple[int, int]) -> None: Adds enemy to the bucket of the cell.
+        remove(view, cell: tuple[int, int]) -> None: Removes enemy from the bucket of the cell.
+        move(view, old: tuple[int, int], new: tuple[int, int]) -> None: Moves enemy between buckets.
+        clear() -> None: Removes all enemies.
+        query_radius(center: Coord, r: float) -> list: Returns enemies within distance r from center.
+        k_nearest(center: Coord, k: int, exclude = (), max_distance: float = inf) -> list: Returns k enemies nearest to center.
+        cells_mask(centers_x: np.ndarray, centers_y: np.ndarray, radii: np.ndarray) -> np.ndarray:
+            Marks enemies standing in tiles that overlap any of the given circles.
+    """
+
+    def __init__(self, pool, tile_size: int = 120) -> None:
+        """
+        Creates an empty grid.
+
+        Arguments:
+            pool (EnemyPool): Pool the enemies positions are read from.
+            tile_size (int): Size of a single bucket in pixels (default 120).
+        """
+        self.pool = pool
+        self.tile_size: int = tile_size
+        self.buckets: dict[tuple[int, int], dict] = {}
+
+    def insert(self, view, cell: tuple[int, int]) -> None:
+        """Adds enemy to the bucket of the cell."""
+        self.buckets.setdefault(cell, {})[view] = None
+
+    def remove(self, view, cell: tuple[int, int]) -> None:
+        """Removes enemy from the bucket of the cell."""
+        bucket = self.buckets[cell]
+        del bucket[view]
+        if not bucket:
+            del self.buckets[cell]
+
+    def move(self, view, old: tuple[int, int], new: tuple[int, int]) -> None:
+        """Moves enemy from the bucket of the old cell to the bucket of the new one."""
+        self.remove(view, old)
+        self.insert(view, new)
+
+    def clear(self) -> None:
+        """Removes all enemies."""
+        self.buckets.clear()
+
+    def _cells_around(self, center: Coord, r: float):
+        """Yields buckets of all cells overlapping the square bounding the circle."""
+        size = self.tile_size
+        for cell_x in range(int((center.x - r) // size), int((center.x + r) // size) + 1):
+            for cell_y in range(int((center.y - r) // size), int((center.y + r) // size) + 1):
+                bucket = self.buckets.get((cell_x, cell_y))
+                if bucket:
+                    yield bucket
+
+    def _distances(self, center: Coord, views: list) -> tuple[np.ndarray, np.ndarray]:
+        """Returns slots of views and their distances from center."""
+        slots = np.fromiter((view._slot for view in views), np.int64, len(views))
+        return slots, np.hypot(self.pool.x[slots] - center.x, self.pool.y[slots] - center.y)
+
+    def query_radius(self, center: Coord, r: float) -> list:
+        """
+        Returns enemies within distance r (inclusive) from center.
+
+        Arguments:
+            center (Coord): Center of the circle in pixels.
+            r (float): Radius of the circle in pixels.
+
+        Returns:
+            list[EnemyManager]: Enemies within the circle in spawn order.
+        """
+        views = [view for bucket in self._cells_around(center, r) for view in bucket]
+        if not views:
+            return []
+        slots, distances = self._distances(center, views)
+        slots = np.sort(slots[distances <= r])
+        return [self.pool.views[slot] for slot in slots]
+
+    def k_nearest(self, center: Coord, k: int, exclude = (), max_distance: float = inf) -> list:
+        """
+        Returns up to k enemies nearest to center.
+
+        Searches rings of cells around the center cell and stops when no enemy
+        outside the searched rings can be nearer than the k-th found one.
+
+        Arguments:
+            center (Coord): Point in pixels.
+            k (int): Number of enemies to return.
+            exclude (Iterable[EnemyManager]): Enemies to skip (eg. already attacked ones).
+            max_distance (float): Enemies farther away than that are skipped (default no limit).
+
+        Returns:
+            list[EnemyManager]: Enemies sorted by distance (ties in spawn order).
+        """
+        if not self.buckets or k <= 0:
+            return []
+        size = self.tile_size
+        center_x, center_y = int(center.x // size), int(center.y // size)
+        # Distance from center to the border of its own cell - lower bound of distance to cells outside a ring
+        margin = min(center.x - center_x*size, (center_x + 1)*size - center.x,
+                     center.y - center_y*size, (center_y + 1)*size - center.y)
+        last_ring = max(max(abs(x - center_x), abs(y - center_y)) for x, y in self.buckets)
+        exclude = set(exclude)
+
+        found = []
+        for ring in range(last_ring + 1):
+            lower_bound = (ring - 1)*size + margin if ring else 0
+            if lower_bound > max_distance:
+                break
+            for x in range(center_x - ring, center_x + ring + 1):
+                for y in range(center_y - ring, center_y + ring + 1):
+                    if max(abs(x - center_x), abs(y - center_y)) != ring:
+                        continue
+                    bucket = self.buckets.get((x, y))
+                    if bucket:
+                        found.extend(view for view in bucket if view not in exclude)
+            # Stop when enemies in further rings can't be closer than k-th found one
+            if len(found) >= k:
+                slots, distances = self._distances(center, found)
+                if np.partition(distances, k - 1)[k - 1] <= ring*size + margin:
+                    break
+
+        if not found:
+            return []
+        slots, distances = self._distances(center, found)
+        order = np.lexsort((slots, distances))
+        order = order[distances[order] <= max_distance][:k]
+        return [self.pool.views[slot] for slot in slots[order]]
+
+    def cells_mask(self, centers_x: np.ndarray, centers_y: np.ndarray, radii: np.ndarray) -> np.ndarray:
+        """
+        Marks active enemies standing in tiles that overlap squares bounding any of the given circles.
+        Used to narrow down candidates before exact (vectorized) distance checks.
+
+        Arguments:
+            centers_x, centers_y (np.ndarray): Centers of circles in pixels.
+            radii (np.ndarray): Radii of circles in pixels.
+
+        Returns:
+            np.ndarray[bool]: Mask over active enemies (slots [0, pool.count)).
+        """
+        n = self.pool.count
+        cell_x, cell_y = self.pool.cell_x[:n], self.pool.cell_y[:n]
+        width, height = int(cell_x.max()) + 1, int(cell_y.max()) + 1
+        covered = np.zeros((height, width), bool)
+        size = self.tile_size
+        for x, y, r in zip(centers_x, centers_y, radii):
+            left, right = max(int((x - r) // size), 0), int((x + r) // size) + 1
+            top, bottom = max(int((y - r) // size), 0), int((y + r) // size) + 1
+            covered[top:bottom, left:right] = True
+        return covered[cell_y, cell_x]
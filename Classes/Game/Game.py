@@ -1,27 +1,43 @@
+import os, re
+from time import perf_counter, strftime
 from ..UI import UI
-from ..Level import Test_Level
 from ..Player.Player import Player
-from ..Tower.Tower_Classes import Tower_Manager, Tower
 from ..Enemy.Enemy import Enemy
+from ..Level.Test_Level import Level
+from ..Simulation.Simulation import Simulation
+from ..Profiling.Frame_Profiler import FrameProfiler
 
 class Game():
     """
     Manages the entire game instance including UI, player, and level interactions.
 
+    Class Attributes:
+        MAX_FRAME_TIME (float): Upper bound (in seconds) on real time simulated in one displayed frame, so the game
+                                slows down instead of piling up frames to catch up with when the computer can't keep up.
+        LEVELS (dict[str, str]): Levels offered in the main menu - level names by options returned by UI.main_menu.
+
     Attributes:
         ui (UI): An instance of the UI class for managing the user interface.
         player (Player): An instance of the Player class representing the player.
+        simulation (Simulation): Headless simulation advancing the game world.
         level (Level): An instance of the Level class representing the game level, including map class instance.
         root_directory (str): Directory in which the main script was called for easy relative path operations.
+        replay_directory (str): Directory replays of played levels are saved to (None for not saving them).
 
     Methods:
         __init__(display_intro: bool = True): Initializes the Game instance, sets up UI, displays intro, shows main menu, loads level, and starts the main gameplay loop.
+        preload_levels() -> None: Starts decoding graphics of the levels offered in the main menu.
         main_menu(): Displays the main menu.
         load_level(player_name: str): Loads the game level and initializes player.
         gameplay(): Manages the main gameplay loop, updates game state, and handles wave progression.
+        save_replay() -> str: Saves player actions recorded in the current level.
+        simulate(elapsed: float, accumulator: float) -> float: Advances the simulation by the real time elapsed since the last displayed frame.
     """
 
-    def __init__(self, root_directory: str, display_intro: bool = True, display_outro: bool = True) -> None:
+    MAX_FRAME_TIME: float = 0.25
+    LEVELS: dict[str, str] = {"demo": "TEST", "truancy": "TRUANCY"}
+
+    def __init__(self, root_directory: str, display_intro: bool = True, display_outro: bool = True, save_replays: bool = True) -> None:
         """
         Initializes the Game instance.
 
@@ -29,11 +45,14 @@ class Game():
             root_directory (str): Path to the main calogue f the repository for relative path operations.
             display_intro (bool): Whether to display the intro screen. Defaults to True.
             display_outro (bool): Whether to display the outro screen. Defaults to True.
+            save_replays (bool): Whether to save replays of played levels (in Replays directory). Defaults to True.
         """
         
         self.player = Player("Guest", 0, 0)
         self.root_directory = root_directory
+        self.replay_directory = os.path.join(root_directory, "Replays") if save_replays else None
         self.ui = UI.UI(self.root_directory)
+        self.preload_levels()
 
         if display_intro:
             self.ui.intro()
@@ -57,6 +76,15 @@ class Game():
         if display_outro:
             self.ui.outro()
 
+    def preload_levels(self) -> None:
+        """
+        Starts decoding graphics of the levels offered in the main menu (after menu and HUD graphics),
+        so they are ready by the time a level is chosen.
+        """
+        for level in self.LEVELS.values():
+            map_name = Level.read_level_data(level, self.root_directory)["map"]
+            self.ui.preload_level_gfx(map_name, enemies_names={name: name + ".png" for name in Enemy.enemy_types})
+
     def main_menu(self) -> bool:
         """
         Displays the main menu.
@@ -69,11 +97,8 @@ class Game():
         """
         choosen_option = self.ui.main_menu(self.player)
 
-        if choosen_option == "demo":
-            return "TEST"
-        
-        elif choosen_option == "truancy":
-            return "TRUANCY"
+        if choosen_option in self.LEVELS:
+            return self.LEVELS[choosen_option]
 
         elif choosen_option == "quit":
             return False
@@ -88,21 +113,15 @@ class Game():
         Initializes the game level, updates the UI with level information,
         and player atributes with initial game parameters.
         """
-        # Reset towers
-        Tower_Manager.reset()
-        # Initialize level
-        Test_Level.Level.reset()
-        self.level = Test_Level.Level(level, self.root_directory)
+        # Initialize level (simulation resets towers, enemies and sets player atributes)
+        self.simulation = Simulation(level, self.root_directory, self.player)
+        self.level = self.simulation.level
 
         # Load level data to UI
         self.ui.reset_state()
         self.ui.load_lvl(self.player.name, self.level.waves_num, 
                          self.level.current_wave, self.level.map.name, 
                          enemies_names={name: name + ".png" for name in Enemy.enemy_types})
-        
-        # Update player atributes based on level data
-        self.player.gold = self.level.gold
-        self.player.lives = self.level.lives
 
     def gameplay(self) -> None:
         """
@@ -111,45 +130,112 @@ class Game():
         Continuously updates the game state by processing user input,
         updating the UI, and advancing the game level and other game elements. 
         Handles wave progression and tower management within the game loop.
+        Game world is advanced with a fixed timestep (see simulate), while rendering happens once per displayed frame.
+        Time spent in subsystems is recorded by FrameProfiler (when enabled with F3).
         """
-        # Main update loop (iterates over frames)
+        # Simulated time not yet consumed by ticks (in frames)
+        accumulator = 0.0
+        last_time = perf_counter()
+        speed = self.ui.simulation_speed()
+
+        # Main update loop (iterates over displayed frames)
         running = True
         while running:
+            now = perf_counter()
+            elapsed, last_time = now - last_time, now
+
             # Check for player death
-            if self.player.lives == 0:
+            if self.simulation.game_over:
                 self.ui.gameover()
 
             # Process user input
-            if self.ui.process_input(self.level.map, self.player):
+            input_start = perf_counter()
+            exit_requested = self.ui.process_input(self.level.map, self.player, self.simulation)
+            FrameProfiler.add("input", perf_counter() - input_start)
+            if exit_requested:
                 running = False
             
             # Check if wave is running
             elif self.ui.state["wave"] and not self.ui.state["pause"]:
+                # Record speed changes
+                if self.ui.simulation_speed() != speed:
+                    speed = self.ui.simulation_speed()
+                    self.simulation.set_speed(speed)
+
                 # Update game elements
-                self.level.update()
-                Tower_Manager.update()
-                self.player.gold += self.level.gold_update()
-                #print(Test_Level.Level.damage)
-                #print(self.player.lives)
-                if Test_Level.Level.damage:
-                    for hit in range(Test_Level.Level.damage):
-                        self.player.deduct_lives()
-                    Test_Level.Level.DamageDone()
-
-                # Check if wafe ended
-                if not self.level.remaining_enemies and not self.level.enemies:
+                self.simulation.start_wave()
+                accumulator = self.simulate(elapsed, accumulator)
+
+                # Check if wave ended
+                if not self.simulation.wave_running and not self.simulation.game_over:
                     self.ui.state["wave"] = False
                     self.ui.current_wave += 1
-                    
-                    # Check if level is not ended
-                    if self.level.current_wave < self.level.waves_num - 1:
-                        self.level.new_wave()
+                    accumulator = 0.0
 
                     # Level ended (temporary solution)
-                    else:
+                    if self.simulation.finished:
                         running = False
             
             self.ui.update(self.player.gold, self.player.lives, self.level.enemies, self.level.map)
+            FrameProfiler.end_frame()
+
+        self.save_replay()
+
+    def save_replay(self) -> str:
+        """
+        Saves player actions recorded in the current level (see Simulation.play_replay for playing them back).
+
+        Player name is reduced to characters safe in file names (on every system) - it can contain anything typed in.
+        A replay that can't be written is skipped (reported on the console), so it never ends the session.
+
+        Returns:
+            str: Path of the saved replay (None if replays are not saved or saving failed).
+        """
+        if self.replay_directory is None:
+            return None
+        player_name = re.sub(r"[^\w-]", "_", self.player.name, flags=re.ASCII)
+        path = os.path.join(self.replay_directory, f"{self.simulation.replay.level_name}_{player_name}_{strftime('%Y%m%d_%H%M%S')}.sdr")
+        try:
+            os.makedirs(self.replay_directory, exist_ok=True)
+            self.simulation.replay.save(path)
+        except OSError as error:
+            print(f"Replay could not be saved: {error}")
+            return None
+        return path
+
+    def simulate(self, elapsed: float, accumulator: float) -> float:
+        """
+        Advances the simulation by the real time elapsed since the last displayed frame (fixed timestep).
+
+        Every tick simulates 1/FPS of a second of game time. At speed N, elapsed time is scaled N times and
+        whole ticks are run, the fraction left is carried over in the accumulator. In "max speed" state ticks are run
+        until one displayed frame time (1/FPS) of real time is used up, so the speed up scales with CPU headroom.
+        Ticks stop early when the wave ends. Simulation subsystems are timed (through Simulation.timer) only while FrameProfiler is enabled.
+
+        Arguments:
+            elapsed (float): Real time in seconds since the last displayed frame.
+            accumulator (float): Simulated time not yet consumed by ticks (in frames).
+
+        Returns:
+            float: Updated accumulator.
+        """
+        speed = self.ui.simulation_speed()
+        # Subsystems are timed only while the profiler is enabled
+        self.simulation.timer = FrameProfiler.add if FrameProfiler.enabled else None
+
+        # As fast as possible
+        if speed is None:
+            deadline = perf_counter() + 1 / self.ui.FPS
+            while self.simulation.step() and perf_counter() < deadline:
+                pass
+            return 0.0
+
+        accumulator += min(elapsed, self.MAX_FRAME_TIME) * self.ui.FPS * speed
+        ticks = int(accumulator)
+        if self.simulation.step(ticks) < ticks:
+            # Wave ended - drop the remaining time
+            return 0.0
+        return accumulator - ticks
 
 # For testing
 if __name__ == "__main__":
@@ -1,7 +1,7 @@
 from ..Enemy.Enemy import EnemyManager
 import os
 from ..Map import Map_Class
-from math import ceil
+from .Wave_Schedule import WaveSchedule
 
 class Level:
     """
@@ -15,18 +15,19 @@ class Level:
         gold (int): The initial gold amount for the player in that level.
         lives (int): The number of lives the player starts with.
         waves_num (int): The number of waves in the level.
-        waves (list[dict[str, int]]): The list of enemy waves, each wave represented by a dictionary of enemy types and their quantities.
+        waves (tuple[tuple[tuple[str, int], ...], ...]): The enemy waves, each wave represented by ordered batches of enemy type and quantity.
+        schedule (WaveSchedule): Spawn timeline of the waves - (frame offset, enemy type, health multiplier) of every enemy.
         map (Map_Class.Map): The map object instance representing and menaging map data of the current level.
         current_wave (int): The index of the current wave.
-        base_spawn_cooldown (int): The base cooldown period between enemy spawns.
-        spawn_cooldown (int): The cooldown period between enemy spawns.
-        current_wave_def (dict[str, int]): The current wave definition.
-        current_enemy (str): The type of the current enemy being spawned.
+        wave_frame (int): Number of frames of the current wave processed by spawn_enemy.
+        spawn_index (int): Index of the next enemy to spawn in the current wave of the schedule (cursor).
         remaining_enemies (int): The total number of remaining enemies in the current wave.
 
     Methods:
         __init__(level_name : str, root_directory: str): Loads level data from file and initializes level attributes.
-        spawn_enemy(): Spawns enemies based on the wave definitions and spawn cooldown.
+        read_level_data(level_name: str, root_directory: str) -> dict: Reads and parses the level data file (static).
+        parse_level_data(level_data: list[str]) -> dict: Parses lines of a level data file (static).
+        spawn_enemy(): Spawns enemies of the current wave which are due according to the schedule.
         update(): Updates the level state by spawning enemies and managing enemy behavior.
         new_wave(): Advances to the next wave and updates wave-related attributes.
         reset(cls) -> None: Clears all enemies.
@@ -45,82 +46,103 @@ class Level:
             level_number (int): The number of the level to load.
             root_directory (str): The root directory of the repository for relative path operations.
         """
-        # Open data file and read it
+        level_data = Level.read_level_data(level_name, root_directory)
+
+        # Set atributes (parse_level_data sets defaults of missing data)
+        self.gold: int = level_data["gold"]
+        self.lives: int = level_data["lives"]
+        self.waves: tuple[tuple[tuple[str, int], ...], ...] = level_data["waves"]
+        self.schedule: WaveSchedule = WaveSchedule.compile(self.waves)
+        self.map = None
+        self.current_wave: int = 0
+        self.damage: bool = False
+
+        # Map
+        if level_data["map"] is not None:
+            self.map = Map_Class.Map(root_directory, level_data["map"])
+        # Available_towers
+        if level_data["available_towers"] is not None:
+            self.available_towers: list[str] = level_data["available_towers"]
+
+        # Set number of waves
+        self.waves_num: int = len(self.waves)
+        # Start of the first wave (cursor in the schedule)
+        self.wave_frame: int = 0
+        self.spawn_index: int = 0
+        # Number of enemies to spawn
+        self.remaining_enemies: int = self.schedule.count(self.current_wave)
+
+    @staticmethod
+    def read_level_data(level_name: str, root_directory: str) -> dict:
+        """
+        Reads and parses the level data file (without building the level, eg. to find its map).
+
+        Arguments:
+            level_name (str): Name of the level (eg. "TEST" for lvl_TEST.dat).
+            root_directory (str): The root directory of the repository for relative path operations.
+
+        Returns:
+            dict: Parsed data (see parse_level_data).
+        """
+        # Open data file and parse it
         path = os.path.join(root_directory, "Assets", "lvl_data", f"lvl_{level_name}.dat")
         try:
             with open(path, 'r') as level_data:
-                level_data = level_data.readlines()
+                return Level.parse_level_data(level_data.readlines())
         except FileNotFoundError:
             print(f"Level data file not found: {path}")
+            raise
 
-        # Set default atibutes
-        self.gold: int = 0
-        self.lives: int = 1
-        self.waves_num: int = 1
-        self.waves: list[dict[str, int]]= ({"test_enemy" : 1})
-        temp_waves: list[dict[str, int]] = []
-        self.map = None
-        self.current_wave: int = 0
-        self.base_spawn_cooldown: int = 40
-        self.spawn_cooldown: int = 40
-        self.damage: bool = False
-        self.hp_increase = 1
+    @staticmethod
+    def parse_level_data(level_data: list[str]) -> dict:
+        """
+        Parses lines of a level data file.
 
-        # Parse level data to set atributes
+        Arguments:
+            level_data (list[str]): Lines of the file.
+
+        Returns:
+            dict: "gold" (int), "lives" (int), "waves" (tuple[tuple[tuple[str, int], ...], ...]), "map" (str)
+                  and "available_towers" (list[str]) (map and available towers are None if not given).
+        """
+        parsed = {"gold": 0, "lives": 1, "waves": [], "map": None, "available_towers": None}
         for line in level_data:
             line.strip()
             # Gold
             if line.startswith("Gold"):
-                self.gold = int(line.split("Gold:", 1)[1].strip())
+                parsed["gold"] = int(line.split("Gold:", 1)[1].strip())
             # Lives
             elif line.startswith("Lives"):
-                self.lives = int(line.split("Lives:", 1)[1].strip())
+                parsed["lives"] = int(line.split("Lives:", 1)[1].strip())
             # Waves
             elif line.startswith("Wave"):
                 wave: list[tuple[str, str]] = [enemies.split('-') for enemies in line.split(':', 1)[1].split(',')]
-                temp_waves.append({key.strip(): int(element.strip()) for element, key in wave})
+                # Batches are kept in order (the same enemy type can appear more than once)
+                parsed["waves"].append(tuple((key.strip(), int(element.strip())) for element, key in wave))
             # Map
             elif line.startswith("Map"):
-                map_name = line.split("Map:", 1)[1].strip()
-                self.map = Map_Class.Map(root_directory, map_name)
+                parsed["map"] = line.split("Map:", 1)[1].strip()
             # Available_towers
             elif line.startswith("Available_towers:"):
-                self.available_towers: list[str] = \
-                    [tower.strip() for tower in line.split("Available_towers: ")[1].split(',')]
-                
-        # Set new waves if waves data found in file
-        if temp_waves:
-            self.waves = tuple(temp_waves)
+                parsed["available_towers"] = [tower.strip() for tower in line.split("Available_towers: ")[1].split(',')]
 
-        # Set number of waves
-        self.waves_num = len(self.waves)
-        # Determine what current wave will contain
-        self.current_wave_def : dict[EnemyManager : int] = self.waves[self.current_wave]
-        self.current_enemy : EnemyManager = list(self.current_wave_def.keys())[0]
-        # Number of enemies to spawn
-        self.remaining_enemies : int = sum(self.current_wave_def.values())
+        # Default wave if no waves data found in file
+        parsed["waves"] = tuple(parsed["waves"]) or ((("test_enemy", 1),),)
+        return parsed
 
     def spawn_enemy(self) -> None:
-        """Spawn enemies based on the wave definitions and spawn cooldown."""
+        """Spawns enemies of the current wave which are due according to the schedule (advancing the cursor)."""
         if not self.remaining_enemies:
-            pass
-        # Cooldown passed
-        elif self.spawn_cooldown == 0:
+            return
+        spawns = self.schedule.waves[self.current_wave]
+        while self.spawn_index < len(spawns) and spawns[self.spawn_index][0] <= self.wave_frame:
+            _, enemy_type, hp_increase = spawns[self.spawn_index]
             # Despite not being further utilised, spawned_enemy is followed by EnemyManager.present class attribute
-            spawned_enemy = EnemyManager(self.map, self.current_enemy) 
-            # Increased diffculty in further levels
-            spawned_enemy.life = ceil(spawned_enemy.life*self.hp_increase)
-            self.current_wave_def[self.current_enemy] -= 1
-            self.spawn_cooldown = self.base_spawn_cooldown
-            self.remaining_enemies = sum(self.current_wave_def.values())
-            # Moving on to next enemies in wave if current "batch" has been spawned
-            if self.current_wave_def[self.current_enemy] == 0:
-                del self.waves[self.current_wave][self.current_enemy]
-                if self.current_wave_def:
-                    self.current_enemy = list(self.current_wave_def.keys())[0]
-        else:
-            # Process cooldown between enemies spawned
-            self.spawn_cooldown -= 1
+            # Increased diffculty in further waves (hp_increase)
+            spawned_enemy = EnemyManager(self.map, enemy_type, hp_increase)
+            self.spawn_index += 1
+        self.remaining_enemies = len(spawns) - self.spawn_index
+        self.wave_frame += 1
 
     def update(self):
         """
@@ -131,10 +153,7 @@ class Level:
         """
         self.spawn_enemy()
         EnemyManager.update()
-        for enemy in self.enemies:
-            if enemy.damaged_player:
-                Level.damage += 1
-                enemy.damaged_player = "done"
+        Level.damage += EnemyManager.leaked()
 
     def gold_update(self) -> int:
         """
@@ -153,21 +172,18 @@ class Level:
         """
         Advances to the next wave and updates wave-related attributes.
 
-        This method increments the current wave index, sets the new wave definition,
-        and resets the enemy-related attributes for the new wave.
+        This method increments the current wave index and moves the cursor
+        to the beginning of the new wave in the schedule.
         """
         self.current_wave += 1
-        self.current_wave_def = self.waves[self.current_wave]
-        self.current_enemy = list(self.current_wave_def.keys())[0]
-        self.remaining_enemies = sum(self.current_wave_def.values())
-        # Increased diffculty in further levels
-        self.base_spawn_cooldown = ceil(40*0.9**self.current_wave)
-        self.hp_increase = self.hp_increase*1.1**(self.current_wave**1/4)
+        self.wave_frame = 0
+        self.spawn_index = 0
+        self.remaining_enemies = self.schedule.count(self.current_wave)
 
     @classmethod
     def reset(cls) -> None:
         """Clear all enemies"""
-        cls.enemies.clear()
+        EnemyManager.reset()
     
     @classmethod
     def DamageDone(cls) -> None:
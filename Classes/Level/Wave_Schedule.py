@@ -0,0 +1,70 @@
+from dataclasses import dataclass
+from math import ceil
+
+
+@dataclass(frozen=True)
+class WaveSchedule:
+    """
+    Immutable spawn timeline of a level, compiled up front from wave definitions.
+
+    Every wave is an ordered tuple of spawns (frame offset from the start of the wave, enemy type, health multiplier),
+    so Level spawns enemies by advancing a cursor and restarting a level doesn't need parsing or copying of wave data.
+    Batches of the same enemy type repeated in a wave (eg. "10-Mati, 10-Marta, 10-Mati") are kept in order.
+
+    Timing follows the spawn cooldown of the game: the first enemy of the level spawns after FIRST_COOLDOWN frames,
+    next enemies of wave w every ceil(BASE_COOLDOWN * COOLDOWN_DECAY**w) + 1 frames, and the first enemy of a wave
+    after the cooldown left from the previous wave. Health multiplier grows every wave by 1.1**(w/4).
+
+    Class Attributes:
+        FIRST_COOLDOWN (int): Frames before the first enemy of the level.
+        BASE_COOLDOWN (int): Cooldown between enemies in the first wave.
+        COOLDOWN_DECAY (float): Cooldown multiplier of every next wave.
+
+    Attributes:
+        waves (tuple[tuple[tuple[int, str, float], ...], ...]): Spawns of every wave - (frame offset, enemy type, health multiplier).
+
+    Methods:
+        compile(waves: list[list[tuple[str, int]]]) -> WaveSchedule: Compiles wave definitions into the timeline (class method).
+        count(wave: int) -> int: Returns number of enemies in the wave.
+    """
+    FIRST_COOLDOWN = 40
+    BASE_COOLDOWN = 40
+    COOLDOWN_DECAY = 0.9
+
+    waves: tuple
+
+    @classmethod
+    def compile(cls, waves: list[list[tuple[str, int]]]) -> 'WaveSchedule':
+        """
+        Compiles wave definitions into the spawn timeline.
+
+        Arguments:
+            waves (list[list[tuple[str, int]]]): Batches of every wave - (enemy type, number of enemies), in order.
+
+        Returns:
+            WaveSchedule: The timeline.
+        """
+        timeline = []
+        cooldown = cls.FIRST_COOLDOWN
+        hp_increase = 1
+        for number, wave in enumerate(waves):
+            # Increased diffculty in further waves
+            if number:
+                hp_increase = hp_increase*1.1**(number**1/4)
+            base_cooldown = ceil(cls.BASE_COOLDOWN*cls.COOLDOWN_DECAY**number)
+
+            # Spawns of the wave (first one after the cooldown left from the previous wave)
+            spawns = []
+            frame = cooldown
+            for enemy_type, count in wave:
+                for _ in range(count):
+                    spawns.append((frame, enemy_type, hp_increase))
+                    frame += base_cooldown + 1
+            if spawns:
+                cooldown = base_cooldown
+            timeline.append(tuple(spawns))
+        return cls(tuple(timeline))
+
+    def count(self, wave: int) -> int:
+        """Returns number of enemies in the wave."""
+        return len(self.waves[wave])
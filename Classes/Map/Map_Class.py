@@ -1,6 +1,94 @@
 from ..Utilities import Coord
+import numpy as np
 import os
 
+
+class Polyline:
+    """
+    Path converted into a polyline of pixel waypoints (middle points of path tiles) with cumulative arc length,
+    so position along the path can be described by a single distance travelled.
+
+    After the last tile of the path the polyline continues to the right up to EXIT_X
+    (just outside of the screen), where enemies damage the player.
+
+    Class Attributes:
+        EXIT_X (int): X coordinate (pixels) of the end of every polyline.
+
+    Attributes:
+        x (np.ndarray[float]): X coordinates of waypoints in pixels.
+        y (np.ndarray[float]): Y coordinates of waypoints in pixels.
+        length (np.ndarray[float]): Arc length from the beginning of the path to every waypoint.
+        total_length (float): Length of the whole polyline.
+        tiles_count (int): Number of tiles in the path.
+
+    Methods:
+        __init__(tiles: tuple[Coord], tile_size: int = 120) -> None: Builds polyline from path tiles.
+        intervals_within(center: Coord, r: float) -> list[tuple[float, float]]: Returns parts of the path within the circle.
+    """
+
+    EXIT_X: int = 1980
+
+    def __init__(self, tiles: tuple[Coord], tile_size: int = 120) -> None:
+        """
+        Builds polyline from path tiles.
+
+        Arguments:
+            tiles (tuple[Coord]): Tiles of the path in grid coordinates.
+            tile_size (int): Size of a single tile in pixels (default 120).
+        """
+        points = []
+        for tile in tiles:
+            point = Coord.grid_middle_point(tile, tile_size)
+            # Skip repeated tiles (zero length segments)
+            if not points or points[-1] != point:
+                points.append(point)
+        # Exit segment to the right
+        if points[-1].x < Polyline.EXIT_X:
+            points.append(Coord(Polyline.EXIT_X, points[-1].y))
+
+        self.x: np.ndarray = np.array([point.x for point in points], np.float64)
+        self.y: np.ndarray = np.array([point.y for point in points], np.float64)
+        self.length: np.ndarray = np.concatenate(([0.0], np.cumsum(np.hypot(np.diff(self.x), np.diff(self.y)))))
+        self.total_length: float = float(self.length[-1])
+        self.tiles_count: int = len(tiles)
+
+    def intervals_within(self, center: Coord, r: float) -> list[tuple[float, float]]:
+        """
+        Returns parts of the path that lie within the circle, as intervals of arc length.
+
+        Arguments:
+            center (Coord): Center of the circle in pixels.
+            r (float): Radius of the circle in pixels.
+
+        Returns:
+            list[tuple[float, float]]: Sorted, disjoint intervals (start, end) of distance along the path.
+        """
+        intervals = []
+        for i in range(len(self.x) - 1):
+            segment = self.length[i + 1] - self.length[i]
+            if not segment:
+                continue
+            # Unit direction of the segment and offset of its start from the center
+            ux, uy = (self.x[i + 1] - self.x[i]) / segment, (self.y[i + 1] - self.y[i]) / segment
+            ox, oy = self.x[i] - center.x, self.y[i] - center.y
+            # Solve |offset + t*u|^2 <= r^2 for t in [0, segment]
+            b = ux*ox + uy*oy
+            discriminant = b*b - (ox*ox + oy*oy - r*r)
+            if discriminant < 0:
+                continue
+            root = discriminant**0.5
+            start, end = max(-b - root, 0.0), min(-b + root, segment)
+            if start > end:
+                continue
+            start, end = float(self.length[i] + start), float(self.length[i] + end)
+            # Merge with the previous interval if they touch
+            if intervals and intervals[-1][1] >= start:
+                intervals[-1] = (intervals[-1][0], max(intervals[-1][1], end))
+            else:
+                intervals.append((start, end))
+        return intervals
+
+
 class Map():
     """
     Manages and interacts with map data (loading, parsing, and representing map data).
@@ -9,6 +97,8 @@ class Map():
         name (str): The name of the map.
         paths (tuple): Immutable tuple of tuples, where each inner tuple represents a path
                        as a sequence of Coord instances indicating the path through the tile grid.
+        polylines (tuple[Polyline]): Paths precomputed as polylines of pixel waypoints with cumulative arc length
+                                     (corresponding to paths).
         grid (list): A list of lists where each sublist represents a row in the grid.
                      Each element in the sublist is a boolean indicating the tile's accessibility.
                      True-accessible False-blocked
@@ -18,8 +108,10 @@ class Map():
             Initializes a Map instance with a specified name and data directory. Loads the map data from the
             corresponding file within the provided or default directory.
         load_map_data(self, path: str):
-            Loads and parses map data from a specified file path. This method updates the map's attributes
-            based on the contents of the file including the name, grid configuration, and paths.
+            Loads map data from a specified file path. This method updates
+            the map's attributes based on the contents of the file including the name, grid configuration, and paths.
+        parse_map_data(data: list[str]) -> dict:
+            Parses lines of a map data file (static).
         tile_accessibility(self, tile: Coord) -> bool:
             Checks if given tile is blocked or accessible to place tower.
     """
@@ -51,31 +143,54 @@ class Map():
         self.name: str = name
         self.paths: tuple = ()
         self.grid: list = []
+        self.polylines: tuple[Polyline] = ()
 
         self.load_map_data(file_path)
 
     def load_map_data(self, path: str) -> None:
         """
-        Loads and parses the map data from a file.
+        Loads the map data from a file.
 
         Arguments:
             path (str): The file path from which to load the map data.
         
-        This method parses the map data file, updating the attributes of the map object
-        based on the contents of the file. It reads the map's name, grid configuration, and enemies paths.
+        This method updates the attributes of the map object based on the contents of the file:
+        the map's name, grid configuration, enemies paths and their polylines.
         """
         try:
             with open(path, 'r') as file:
-                data = file.readlines()
+                data = Map.parse_map_data(file.readlines())
         except FileNotFoundError:
             print(f"Map data file not found: {path}")
+            return
 
+        if data["name"] is not None:
+            self.name = data["name"]
+        self.grid = data["grid"]
+        self.paths = tuple(tuple(Coord(x, y) for x, y in path) for path in data["paths"])
+        self.polylines = tuple(Polyline(path) for path in self.paths)
+
+    @staticmethod
+    def parse_map_data(data: list[str]) -> dict:
+        """
+        Parses lines of a map data file.
+
+        Arguments:
+            data (list[str]): Lines of the file.
+
+        Returns:
+            dict: Plain data - "name" (str, None if not given), "grid" (list[list[bool]])
+                  and "paths" (tuple[tuple[tuple[int, int]]] - tiles of every path as x, y pairs).
+        """
+        name = None
+        grid = []
+        paths = ()
         for i, line in enumerate(data):
             line = line.strip()
 
             # Get name
             if line.startswith("Name:"):
-                self.name = line.split("Name:", 1)[1].strip()
+                name = line.split("Name:", 1)[1].strip()
 
             # Get grid accesibility (whaether a tile is taken or accessible)
             elif line.startswith("Grid:"):
@@ -93,7 +208,7 @@ class Map():
                         # Append True if the row is not taken
                         row.append(character == ' ')
                     # Append read row 
-                    self.grid.append(row)
+                    grid.append(row)
 
             # Get enemies paths
             elif line.startswith("Paths:"):
@@ -107,11 +222,13 @@ class Map():
                         # Append coordinates of each tile to the temp_path list
                         for element in line:
                             x, y = element.split(", ")
-                            temp_path.append(Coord(int(x), int(y)))
+                            temp_path.append((int(x), int(y)))
                         # Append temp_path into temp_paths and convert it into inmutable type (tuple)
                         temp_paths.append(tuple(temp_path))
                 # Convert list of paths into inmutable type (tuple)
-                self.paths = tuple(temp_paths)
+                paths = tuple(temp_paths)
+
+        return {"name": name, "grid": grid, "paths": paths}
 
     def tile_accessibility(self, tile: Coord) -> bool:
         """
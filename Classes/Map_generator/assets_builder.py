@@ -1,12 +1,17 @@
 """Utility functions used to preapre assets for map generator and whole project"""
 
-from PIL import Image, UnidentifiedImageError
-import os, sys, pygame
+# PIL and pygame are imported by the functions using them, so importing the module (eg. for pack_shelves) stays cheap
+import os, sys, json
 
 # Base directory where the script resides for easier relative file searching
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Graphics of the game and sprites packed into atlas sheets (sheet name: directories relative to GFX_DIR)
+GFX_DIR = os.path.join(os.path.dirname(os.path.dirname(BASE_DIR)), "Assets", "gfx")
+ATLASES = {"sprites": ["Towers", "enemies", "bullets"],
+           "hud": ["HUD", os.path.join("HUD", "HUD_L")]}
 
 def browse_graphic():
+    import pygame
     # Initialize Pygame
     pygame.init()
 
@@ -68,6 +73,7 @@ def browse_graphic():
     pygame.quit()
 
 def slice_image(size : int = 120):
+    from PIL import Image
 
     image_path = os.path.join(BASE_DIR, "tiles\\tiles.png")
     tile_width = 32  # Set your tile width
@@ -104,7 +110,8 @@ def slice_image(size : int = 120):
 
     print(f"Sliced image into {tiles_x * tiles_y} tiles.")
 
-def overlay_images(input_paths : list[str], output_path : str, display : bool = False) -> Image.Image:
+def overlay_images(input_paths : list[str], output_path : str, display : bool = False) -> 'Image.Image':
+    from PIL import Image, UnidentifiedImageError
     # Add current directory to paths
     input_paths = [os.path.join(BASE_DIR, path) for path in input_paths]
     output_path = os.path.join(BASE_DIR, output_path)
@@ -221,5 +228,162 @@ def prepare_graphics():
     
     print("Graphics preparation complete.")
 
-browse_graphic()
-prepare_graphics()
\ No newline at end of file
+def pack_shelves(sizes : dict[str, tuple[int, int]], max_size : int = 2048, padding : int = 1) -> list[dict[str, tuple[int, int]]]:
+    """
+    Packs rectangles into sheets row by row (tallest first), starting a new sheet when one is full.
+
+    Arguments:
+        sizes (dict[str, tuple[int, int]]): Width and height of every rectangle by its name.
+        max_size (int): Maximal width and height of a sheet (defaults to 2048).
+        padding (int): Empty pixels between rectangles (defaults to 1).
+
+    Returns:
+        list[dict[str, tuple[int, int]]]: Position of every rectangle on its sheet, one dictionary per sheet.
+    """
+    sheets = [{}]
+    x = y = row_height = 0
+    for name, (width, height) in sorted(sizes.items(), key=lambda item: (-item[1][1], item[0])):
+        if width > max_size or height > max_size:
+            raise ValueError(f"{name} ({width}x{height}) does not fit in a {max_size}x{max_size} sheet")
+        # Next row
+        if x + width > max_size:
+            x, y, row_height = 0, y + row_height + padding, 0
+        # Next sheet
+        if y + height > max_size:
+            sheets.append({})
+            x = y = row_height = 0
+        sheets[-1][name] = (x, y)
+        x += width + padding
+        row_height = max(row_height, height)
+    return sheets
+
+def build_atlases(gfx_dir : str = GFX_DIR, atlases : dict[str, list[str]] = ATLASES, max_size : int = 2048, output_dir : str = None) -> dict:
+    """
+    Packs sprites into atlas sheets saved in gfx_dir/Atlases with an index (index.json)
+    of sheet and rectangle of every sprite, used by the game to slice sprites from the sheets
+    instead of loading separate files (see Classes/UI/Asset_Loader.py).
+    Sheets are build artifacts (not kept in the repository). The index records size and modification time
+    of every source file, so sprites changed after the sheets were built are loaded from their files until this is run again.
+
+    Arguments:
+        gfx_dir (str): Path to the graphics directory (defaults to Assets/gfx).
+        atlases (dict[str, list[str]]): Directories (relative to gfx_dir) packed into sheets by name of the atlas.
+        max_size (int): Maximal width and height of a sheet (defaults to 2048).
+        output_dir (str): Directory the sheets and the index are saved to (defaults to gfx_dir/Atlases).
+
+    Returns:
+        dict: The index - {"version": 2, "sprites": {sprite path relative to gfx_dir: 
+                                                     [sheet file, x, y, width, height, source size, source modification time (ns)]}}.
+    """
+    from PIL import Image
+    if output_dir is None:
+        output_dir = os.path.join(gfx_dir, "Atlases")
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    index = {"version": 2, "sprites": {}}
+    for atlas, directories in atlases.items():
+        # Open sprites
+        images = {}
+        for directory in directories:
+            for filename in sorted(os.listdir(os.path.join(gfx_dir, directory))):
+                if filename.lower().endswith(".png"):
+                    path = os.path.join(directory, filename)
+                    images[path.replace(os.sep, "/")] = Image.open(os.path.join(gfx_dir, path)).convert("RGBA")
+
+        # Pack and save sheets
+        for number, positions in enumerate(pack_shelves({name: image.size for name, image in images.items()}, max_size)):
+            width = max(x + images[name].width for name, (x, _) in positions.items())
+            height = max(y + images[name].height for name, (_, y) in positions.items())
+            sheet = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+            sheet_name = f"{atlas}_{number}.png"
+            for name, (x, y) in positions.items():
+                sheet.paste(images[name], (x, y))
+                source = os.stat(os.path.join(gfx_dir, *name.split("/")))
+                index["sprites"][name] = [sheet_name, x, y, images[name].width, images[name].height, source.st_size, source.st_mtime_ns]
+            sheet.save(os.path.join(output_dir, sheet_name), optimize=True)
+
+    with open(os.path.join(output_dir, "index.json"), "w") as file:
+        json.dump(index, file, sort_keys=True)
+
+    print(f"Packed {len(index['sprites'])} sprites into {len(set(entry[0] for entry in index['sprites'].values()))} atlas sheets.")
+    return index
+
+def validate_data(root_dir : str = os.path.dirname(os.path.dirname(BASE_DIR))) -> list[str]:
+    """
+    Validates every level and map data file: levels have waves of known enemies, known towers and an existing map,
+    map grids are rectangular and paths stay within them (up to their exit tile).
+
+    Arguments:
+        root_dir (str): The root directory of the repository (defaults to the one containing this script).
+
+    Returns:
+        list[str]: Problems found (empty if all files are valid).
+    """
+    from ..Level.Test_Level import Level
+    from ..Map.Map_Class import Map
+    from ..Enemy.Enemy import Enemy
+    from ..Tower.Tower_Classes import Tower
+
+    problems = []
+    maps_dir = os.path.join(root_dir, "Assets", "gfx", "maps")
+    levels_dir = os.path.join(root_dir, "Assets", "lvl_data")
+
+    # Maps
+    for filename in sorted(os.listdir(maps_dir)):
+        if not filename.endswith(".dat"):
+            continue
+        try:
+            with open(os.path.join(maps_dir, filename)) as file:
+                data = Map.parse_map_data(file.readlines())
+        except (ValueError, IndexError) as error:
+            problems.append(f"{filename}: {error!r}")
+            continue
+        widths = set(len(row) for row in data["grid"])
+        if len(widths) != 1:
+            problems.append(f"{filename}: grid rows have different lengths {sorted(widths)}")
+        if not data["paths"]:
+            problems.append(f"{filename}: no paths")
+        for number, path in enumerate(data["paths"]):
+            # Last tile of a path is the exit (may be just outside of the grid)
+            if any(not (0 <= y < len(data["grid"]) and 0 <= x < len(data["grid"][y])) for x, y in path[:-1]):
+                problems.append(f"{filename}: path {number} leaves the grid")
+
+    # Levels
+    for filename in sorted(os.listdir(levels_dir)):
+        if not filename.endswith(".dat"):
+            continue
+        try:
+            with open(os.path.join(levels_dir, filename)) as file:
+                data = Level.parse_level_data(file.readlines())
+        except (ValueError, IndexError) as error:
+            problems.append(f"{filename}: {error!r}")
+            continue
+        if data["map"] is None or not os.path.exists(os.path.join(maps_dir, f"{data['map']}.dat")):
+            problems.append(f"{filename}: map {data['map']} not found")
+        if not data["waves"]:
+            problems.append(f"{filename}: no waves")
+        for number, wave in enumerate(data["waves"], 1):
+            for enemy, _ in wave:
+                if enemy not in Enemy.enemy_types:
+                    problems.append(f"{filename}: unknown enemy {enemy} in wave {number}")
+        for tower in data["available_towers"] or ():
+            if tower not in Tower.tower_types:
+                problems.append(f"{filename}: unknown tower {tower}")
+    return problems
+
+if __name__ == "__main__":
+    # python assets_builder.py atlas - pack sprites into atlases
+    # python -m Classes.Map_generator.assets_builder data - validate level and map data
+    # otherwise prepare map generator graphics
+    if "atlas" in sys.argv[1:]:
+        build_atlases()
+    elif "data" in sys.argv[1:]:
+        problems = validate_data()
+        print(f"Validated level and map data{': ' + str(len(problems)) + ' problems' if problems else ''}.")
+        for problem in problems:
+            print(problem)
+        sys.exit(1 if problems else 0)
+    else:
+        browse_graphic()
+        prepare_graphics()
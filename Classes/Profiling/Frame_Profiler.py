@@ -0,0 +1,89 @@
+import numpy as np
+from time import perf_counter
+
+
+class FrameProfiler:
+    """
+    Per-frame timing of the game subsystems, kept in a ring buffer of the last frames (toggled in game with F3).
+
+    Subsystems add time spent in them with add() (several ticks simulated in one displayed frame add up),
+    end_frame() stores the frame in the ring buffer. Percentiles of the stored frames show whether
+    stutters come from the simulation (enemies, towers, projectiles) or from rendering (render, hud, present).
+    When disabled, add() and end_frame() only check a flag.
+
+    Class Attributes:
+        SECTIONS (tuple[str]): Timed subsystems ("frame" is the whole displayed frame, including waiting for the frame cap).
+        enabled (bool): Whether timings are recorded (and the overlay displayed).
+        capacity (int): Number of frames kept in the ring buffer.
+        samples (np.ndarray[float]): Ring buffer of frame timings in seconds (frame x section).
+        count (int): Number of frames stored (up to capacity).
+        index (int): Row of the ring buffer the next frame is stored in.
+
+    Methods:
+        toggle() -> bool: Enables or disables the profiler (clearing stored frames), returns new state.
+        add(section: str, seconds: float) -> None: Adds time spent in a subsystem in the current frame.
+        end_frame() -> None: Stores the current frame in the ring buffer.
+        percentiles(q: tuple = (50, 95, 99)) -> dict[str, tuple[float, ...]]: Returns percentiles of section times in milliseconds.
+        report() -> list[str]: Returns lines of the overlay table.
+    """
+    SECTIONS: tuple[str] = ("input", "enemies", "towers", "projectiles", "render", "hud", "present", "frame")
+    _COLUMNS: dict[str, int] = {section: column for column, section in enumerate(SECTIONS)}
+
+    enabled: bool = False
+    capacity: int = 600
+    samples: np.ndarray = np.zeros((capacity, len(SECTIONS)))
+    count: int = 0
+    index: int = 0
+    _current: list[float] = [0.0] * len(SECTIONS)
+    _frame_start: float = 0.0
+
+    @classmethod
+    def toggle(cls) -> bool:
+        """Enables or disables the profiler (stored frames are cleared), returns whether it is enabled."""
+        cls.enabled = not cls.enabled
+        cls.count = cls.index = 0
+        cls._current = [0.0] * len(cls.SECTIONS)
+        cls._frame_start = perf_counter()
+        return cls.enabled
+
+    @classmethod
+    def add(cls, section: str, seconds: float) -> None:
+        """Adds time spent in the subsystem (one of SECTIONS) in the current frame."""
+        if cls.enabled:
+            cls._current[cls._COLUMNS[section]] += seconds
+
+    @classmethod
+    def end_frame(cls) -> None:
+        """Stores the current frame (with time since the previous end_frame as the frame time) in the ring buffer."""
+        if not cls.enabled:
+            return
+        now = perf_counter()
+        cls._current[-1] = now - cls._frame_start
+        cls._frame_start = now
+        cls.samples[cls.index] = cls._current
+        cls.index = (cls.index + 1) % cls.capacity
+        cls.count = min(cls.count + 1, cls.capacity)
+        cls._current = [0.0] * len(cls.SECTIONS)
+
+    @classmethod
+    def percentiles(cls, q: tuple = (50, 95, 99)) -> dict[str, tuple[float, ...]]:
+        """
+        Returns percentiles of time spent in every section over the stored frames.
+
+        Arguments:
+            q (tuple): Percentiles to compute (defaults to p50, p95 and p99).
+
+        Returns:
+            dict[str, tuple[float, ...]]: Percentiles in milliseconds by section (empty if no frames are stored).
+        """
+        if not cls.count:
+            return {}
+        values = np.percentile(cls.samples[:cls.count], q, axis=0) * 1000
+        return {section: tuple(values[:, column]) for column, section in enumerate(cls.SECTIONS)}
+
+    @classmethod
+    def report(cls) -> list[str]:
+        """Returns lines of the overlay table (p50, p95 and p99 of every section in milliseconds)."""
+        lines = [f"{cls.count:>4} frames   p50   p95   p99"]
+        lines.extend(f"{section:<11}{p50:>6.2f}{p95:>6.2f}{p99:>6.2f}" for section, (p50, p95, p99) in cls.percentiles().items())
+        return lines
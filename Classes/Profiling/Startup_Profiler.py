@@ -0,0 +1,98 @@
+import sys
+from time import perf_counter
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    """
+    Startup-time instrumentation (enabled with: python main.py --profile-startup).
+
+    Records how long imports, pygame initialisation, font loading and asset decoding take
+    (grouped in categories) and prints a report when the main menu is displayed for the first time.
+    When disabled, measure() and record() only check a flag, so instrumentation can stay in place.
+    Asset decodes done on the preloading thread are recorded too (they overlap with the main thread).
+
+    Class Attributes:
+        enabled (bool): Whether timings are recorded.
+        origin (float): perf_counter() time startup is measured from.
+        timings (list[tuple[str, str, float]]): Recorded (category, name, duration in seconds).
+        milestones (list[tuple[str, float]]): Recorded (name, time since origin in seconds), eg. first menu frame.
+        reported (bool): Whether the report has been printed.
+
+    Methods:
+        enable(origin: float = None) -> None: Starts recording timings.
+        measure(category: str, name: str) -> ContextManager: Records duration of the with block.
+        record(category: str, name: str, duration: float) -> None: Records a duration measured elsewhere.
+        mark(milestone: str) -> None: Records time since origin (eg. first intro frame).
+        finish(milestone: str) -> None: Records the milestone and prints the report (once).
+        report() -> str: Returns the report (totals by category, the slowest entries and milestones).
+    """
+    enabled: bool = False
+    origin: float = 0.0
+    timings: list[tuple[str, str, float]] = []
+    milestones: list[tuple[str, float]] = []
+    reported: bool = False
+
+    @classmethod
+    def enable(cls, origin: float = None) -> None:
+        """Starts recording timings (measured from origin, defaults to now)."""
+        cls.enabled = True
+        cls.origin = perf_counter() if origin is None else origin
+        cls.timings, cls.milestones, cls.reported = [], [], False
+
+    @classmethod
+    @contextmanager
+    def measure(cls, category: str, name: str):
+        """Records duration of the with block as (category, name)."""
+        if not cls.enabled:
+            yield
+            return
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            cls.timings.append((category, name, perf_counter() - start))
+
+    @classmethod
+    def record(cls, category: str, name: str, duration: float) -> None:
+        """Records a duration measured elsewhere (eg. on another thread)."""
+        if cls.enabled:
+            cls.timings.append((category, name, duration))
+
+    @classmethod
+    def mark(cls, milestone: str) -> None:
+        """Records time since origin as the milestone."""
+        if cls.enabled:
+            cls.milestones.append((milestone, perf_counter() - cls.origin))
+
+    @classmethod
+    def finish(cls, milestone: str) -> None:
+        """Records the milestone (time since origin) and prints the report if it hasn't been printed yet."""
+        if cls.enabled and not cls.reported:
+            cls.mark(milestone)
+            cls.reported = True
+            print(cls.report(), file=sys.stderr)
+
+    @classmethod
+    def report(cls, slowest: int = 10) -> str:
+        """
+        Returns the report of recorded timings.
+
+        Arguments:
+            slowest (int): Number of the slowest entries listed (defaults to 10).
+
+        Returns:
+            str: Totals by category, the slowest entries and milestones (in milliseconds).
+        """
+        totals: dict[str, list] = {}
+        for category, _, duration in cls.timings:
+            total = totals.setdefault(category, [0, 0.0])
+            total[0] += 1
+            total[1] += duration
+        lines = ["STARTUP PROFILE", "category        count   total [ms]"]
+        lines.extend(f"{category:<15} {count:>5} {total*1000:>12.1f}" for category, (count, total) in totals.items())
+        lines.append("slowest:")
+        lines.extend(f"  {category:<13} {duration*1000:>8.1f}  {name}"
+                     for category, name, duration in sorted(cls.timings, key=lambda timing: -timing[2])[:slowest])
+        lines.extend(f"{name}: {time*1000:.1f} ms after start" for name, time in cls.milestones)
+        return "\n".join(lines)
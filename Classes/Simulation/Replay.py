@@ -0,0 +1,125 @@
+import struct
+from ..Utilities import Coord
+
+
+class Replay:
+    """
+    Compact log of player actions (with frame numbers in which they happened) that can be played back headlessly.
+    Logs are recorded by Simulation (every Simulation keeps one) and played back with Simulation.play_replay.
+
+    Binary format (little-endian):
+        header: magic b"SDRP", version (uint8), level name and tower names table (uint8 count of names,
+                every name as uint8 length followed by UTF-8 bytes; level name goes first)
+        records: 8 bytes each - frame (uint32), action (uint8), tile x (uint8), tile y (uint8), value (uint8),
+                 where value is index in the tower names table (PLACE, UPGRADE) or speed (SPEED, 0 for max speed).
+
+    Class Attributes:
+        PLACE, UPGRADE, WAVE, SPEED (int): Action codes - tower placed, tower upgraded, wave started, speed changed.
+        MAGIC (bytes): File signature.
+        VERSION (int): Format version.
+
+    Instance Attributes:
+        level_name (str): Name of the level the actions were recorded on.
+        actions (list[tuple[int, int, Coord, object]]): Recorded actions - frame, action code, tile,
+                                                         tower name (PLACE, UPGRADE) or speed (SPEED, None for max speed).
+
+    Methods:
+        __init__(level_name: str) -> None: Creates an empty log.
+        record(frame: int, action: int, tile: Coord = None, value = None) -> None: Appends an action.
+        to_bytes() -> bytes: Encodes the log.
+        from_bytes(data: bytes) -> Replay: Decodes the log (class method).
+        save(path: str) -> None: Saves the log to a file.
+        load(path: str) -> Replay: Loads the log from a file (class method).
+    """
+
+    PLACE: int = 0
+    UPGRADE: int = 1
+    WAVE: int = 2
+    SPEED: int = 3
+    MAGIC: bytes = b"SDRP"
+    VERSION: int = 1
+    _RECORD: struct.Struct = struct.Struct("<IBBBB")
+
+    def __init__(self, level_name: str) -> None:
+        """
+        Creates an empty log.
+
+        Arguments:
+            level_name (str): Name of the level (eg. "TEST" for lvl_TEST.dat).
+        """
+        self.level_name: str = level_name
+        self.actions: list[tuple[int, int, Coord, object]] = []
+
+    def record(self, frame: int, action: int, tile: Coord = None, value = None) -> None:
+        """
+        Appends an action to the log.
+
+        Arguments:
+            frame (int): Simulation frame in which the action happened.
+            action (int): Action code (Replay.PLACE, UPGRADE, WAVE or SPEED).
+            tile (Coord): Tile of the placed/upgraded tower (defaults to Coord(0, 0) - actions without a tile).
+            value: Tower name (PLACE, UPGRADE) or speed (SPEED, None for max speed).
+        """
+        if tile is None:
+            tile = Coord(0, 0)
+        self.actions.append((frame, action, tile, value))
+
+    def to_bytes(self) -> bytes:
+        """Encodes the log in the binary format."""
+        names = [self.level_name]
+        for frame, action, tile, value in self.actions:
+            if action in (Replay.PLACE, Replay.UPGRADE) and value not in names:
+                names.append(value)
+
+        data = bytearray(Replay.MAGIC)
+        data += struct.pack("<BB", Replay.VERSION, len(names))
+        for name in names:
+            encoded = name.encode()
+            data += struct.pack("<B", len(encoded)) + encoded
+        for frame, action, tile, value in self.actions:
+            if action in (Replay.PLACE, Replay.UPGRADE):
+                value = names.index(value)
+            elif action == Replay.SPEED:
+                value = value or 0
+            else:
+                value = 0
+            data += Replay._RECORD.pack(frame, action, tile.x, tile.y, value)
+        return bytes(data)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Replay':
+        """
+        Decodes the log from the binary format.
+
+        Raises:
+            ValueError: If data is not a replay of supported version.
+        """
+        if data[:4] != Replay.MAGIC or data[4] != Replay.VERSION:
+            raise ValueError("Data is not a Students Defense replay of supported version")
+        offset, names = 6, []
+        for i in range(data[5]):
+            length = data[offset]
+            names.append(data[offset + 1:offset + 1 + length].decode())
+            offset += 1 + length
+
+        replay = cls(names[0])
+        for frame, action, x, y, value in Replay._RECORD.iter_unpack(data[offset:]):
+            if action in (Replay.PLACE, Replay.UPGRADE):
+                value = names[value]
+            elif action == Replay.SPEED:
+                value = value or None
+            else:
+                value = None
+            replay.record(frame, action, Coord(x, y), value)
+        return replay
+
+    def save(self, path: str) -> None:
+        """Saves the log to a file."""
+        with open(path, "wb") as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'Replay':
+        """Loads the log from a file."""
+        with open(path, "rb") as file:
+            return cls.from_bytes(file.read())
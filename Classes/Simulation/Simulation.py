@@ -0,0 +1,345 @@
+import hashlib
+import numpy as np
+from math import inf
+from ..Level.Test_Level import Level
+from ..Enemy.Enemy import EnemyManager
+from ..Tower.Tower_Classes import Tower_Manager, Tower, Projectiles
+from ..Player.Player import Player
+from ..Utilities import Coord
+from .Replay import Replay
+from time import perf_counter
+from typing import Callable
+
+
+class Simulation:
+    """
+    Headless game world. Owns a level with its enemies and towers and advances it
+    frame by frame without any display, event pump or frame cap.
+
+    Used by Game for the actual gameplay and on its own for CI, balancing and server-side validation.
+
+    Simulation is deterministic - it has no random elements, enemies are updated in spawn order
+    and towers in slot order of Tower_Manager.towers (placement order until a tower is removed - eg. by an upgrade;
+    next placed towers reuse released slots, lowest first), and projectiles positions are computed from whole numbers of steps.
+    Runs can be compared frame by frame with state_hash() and golden traces (record_trace, compare_traces).
+
+    Instance Attributes:
+        level (Level): The level being simulated (includes map instance).
+        player (Player): The player whose gold and lives are updated by the simulation.
+        frame (int): Number of frames simulated so far.
+        wave_running (bool): Whether the current wave is marching.
+        finished (bool): Whether the level ended (all waves cleared or player lost).
+        auto_start_waves (bool): Whether step() should start next waves on its own.
+        replay (Replay): Log of player actions (towers placed and upgraded, waves started) with their frames.
+        timer (Callable[[str, float], None]): Optional hook receiving time spent in subsystems every tick
+                                              ("enemies", "towers", "projectiles" - in seconds), None (default) disables timing.
+
+    Methods:
+        __init__(level_name: str, root_directory: str, player: Player = None, auto_start_waves: bool = False) -> None:
+            Resets game state and loads the level.
+        start_wave() -> bool: Starts the current wave.
+        place_tower(tower_name: str, tile: Coord) -> bool: Places a tower on the given tile.
+        upgrade_tower(tile: Coord, tower_name: str) -> bool: Upgrades a tower standing on the given tile.
+        tick() -> bool: Advances the world by a single frame.
+        step(n_frames: int = 1) -> int: Advances the world by up to n_frames frames.
+        run(max_frames: int = None) -> int: Runs the level until it is finished.
+        state_hash() -> str: Returns hash of the current state of the game world.
+        record_trace(interval: int = 60, max_frames: int = None) -> list[tuple[int, str]]: Runs the level recording state hashes.
+        set_speed(speed: int) -> None: Records change of the game speed (it only affects display).
+
+    Class methods:
+        play_replay(replay: Replay, root_directory: str, max_frames: int = None) -> Simulation: Plays player actions back headlessly.
+
+    Static methods:
+        save_trace(path: str, trace: list[tuple[int, str]]) -> None: Saves trace to a text file.
+        load_trace(path: str) -> list[tuple[int, str]]: Loads trace saved by save_trace.
+        compare_traces(expected: list[tuple[int, str]], actual: list[tuple[int, str]]) -> int: Returns first frame in which traces differ.
+
+    Properties:
+        game_over (bool): True if the player has no lives left.
+    """
+
+    def __init__(self, level_name: str, root_directory: str, player: Player = None, auto_start_waves: bool = False) -> None:
+        """
+        Resets the game state shared by classes and loads the level.
+
+        Arguments:
+            level_name (str): Name of the level to load (eg. "TEST" for lvl_TEST.dat).
+            root_directory (str): The root directory of the repository for relative path operations.
+            player (Player): Player to be updated by the simulation. Defaults to a new "Guest" player.
+            auto_start_waves (bool): Whether step() should start waves without waiting for start_wave(). Defaults to False.
+        """
+        # Clear state left by previous levels
+        Tower_Manager.reset()
+        Tower_Manager.explosions.clear()
+        Projectiles.clear()
+        Level.reset()
+        Level.DamageDone()
+        EnemyManager.gold = 0
+
+        # Load level
+        self.level: Level = Level(level_name, root_directory)
+
+        # Set player atributes based on level data
+        self.player: Player = player if player is not None else Player("Guest", 0, 0)
+        self.player.gold = self.level.gold
+        self.player.lives = self.level.lives
+
+        self.frame: int = 0
+        self.wave_running: bool = False
+        self.finished: bool = False
+        self.auto_start_waves: bool = auto_start_waves
+        self.replay: Replay = Replay(level_name)
+        self.timer: Callable[[str, float], None] = None
+
+    @property
+    def game_over(self) -> bool:
+        """True if the player has no lives left."""
+        return self.player.lives <= 0
+
+    def start_wave(self) -> bool:
+        """
+        Starts the current wave.
+
+        Returns:
+            bool: True if the wave has been started, False if it was already running or the level is finished.
+        """
+        if self.wave_running or self.finished:
+            return False
+        self.wave_running = True
+        self.replay.record(self.frame, Replay.WAVE)
+        return True
+
+    def place_tower(self, tower_name: str, tile: Coord) -> bool:
+        """
+        Places a tower on the given tile if it is accessible and the player can afford it.
+
+        Arguments:
+            tower_name (str): Name of the tower (key of Tower.tower_types).
+            tile (Coord): Grid coordinates of the tile.
+
+        Returns:
+            bool: True if the tower has been placed.
+        """
+        if not self.level.map.tile_accessibility(tile):
+            return False
+        if tower_name not in self.player.affordable_towers():
+            return False
+        self.level.map.grid[tile.y][tile.x] = False
+        Tower_Manager(tower_name, Coord(tile.x*120, tile.y*120))
+        self.player.gold -= Tower.tower_types[tower_name][7]
+        self.replay.record(self.frame, Replay.PLACE, tile, tower_name)
+        return True
+
+    def upgrade_tower(self, tile: Coord, tower_name: str) -> bool:
+        """
+        Upgrades the tower standing on the given tile into tower_name
+        if it is a higher tier of the tower's upgrade tree and the player can afford it.
+
+        Arguments:
+            tile (Coord): Grid coordinates of the tower to be upgraded.
+            tower_name (str): Name of the tower after the upgrade.
+
+        Returns:
+            bool: True if the tower has been upgraded.
+        """
+        for tower in Tower_Manager.towers:
+            if Coord.res2tile(tuple(tower.pos)) == tile:
+                if tower_name not in Tower.upgrades(tower.tower_type.tower_name):
+                    return False
+                if tower_name not in self.player.affordable_towers():
+                    return False
+                tower.upgrade(tower_name)
+                self.player.gold -= Tower.tower_types[tower_name][7]
+                self.replay.record(self.frame, Replay.UPGRADE, tile, tower_name)
+                return True
+        return False
+
+    def tick(self) -> bool:
+        """
+        Advances the world by a single frame of the running wave.
+
+        Updates enemies, towers and projectiles, collects gold, deducts lives
+        and handles wave progression.
+
+        Returns:
+            bool: True if the wave ended in this frame.
+        """
+        # Update game elements
+        if self.timer is None:
+            self.level.update()
+        else:
+            start = perf_counter()
+            self.level.update()
+            self.timer("enemies", perf_counter() - start)
+        Tower_Manager.update(self.timer)
+        self.player.gold += self.level.gold_update()
+        if Level.damage:
+            for hit in range(Level.damage):
+                self.player.deduct_lives()
+            Level.DamageDone()
+        self.frame += 1
+
+        # Check if player lost
+        if self.game_over:
+            self.wave_running = False
+            self.finished = True
+            return True
+
+        # Check if wave ended
+        if not self.level.remaining_enemies and not self.level.enemies:
+            self.wave_running = False
+            # Check if level is not ended
+            if self.level.current_wave < self.level.waves_num - 1:
+                self.level.new_wave()
+            else:
+                self.finished = True
+            return True
+
+        return False
+
+    def step(self, n_frames: int = 1) -> int:
+        """
+        Advances the world by up to n_frames frames.
+
+        Stops early if the level is finished or the wave ended and waves are not started automatically.
+
+        Arguments:
+            n_frames (int): Number of frames to simulate. Defaults to 1.
+
+        Returns:
+            int: Number of frames actually simulated.
+        """
+        simulated = 0
+        while simulated < n_frames and not self.finished:
+            if not self.wave_running:
+                if not self.auto_start_waves:
+                    break
+                self.start_wave()
+            self.tick()
+            simulated += 1
+        return simulated
+
+    def run(self, max_frames: int = None) -> int:
+        """
+        Runs the level starting all waves until it is finished.
+
+        Arguments:
+            max_frames (int): Upper bound on simulated frames (None for no bound).
+
+        Returns:
+            int: Number of frames simulated.
+        """
+        simulated = 0
+        while not self.finished and (max_frames is None or simulated < max_frames):
+            self.start_wave()
+            self.tick()
+            simulated += 1
+        return simulated
+
+    def state_hash(self) -> str:
+        """
+        Returns hash of the current state of the game world: health and position of every enemy,
+        cooldown of every tower, positions of projectiles, player gold and lives.
+
+        Returns:
+            str: Hexadecimal digest (16 characters).
+        """
+        pool = EnemyManager.pool
+        n = pool.count
+        state = hashlib.blake2b(digest_size=8)
+        state.update(np.array([self.frame, self.player.gold, self.player.lives, n], np.int64).tobytes())
+        for array in (pool.life, pool.x, pool.y):
+            state.update(array[:n].tobytes())
+        state.update(np.array([tower.tower_type.atk for tower in Tower_Manager.towers], np.int64).tobytes())
+        state.update(np.array(sorted(zip(*Projectiles.pool.positions())), np.float64).tobytes())
+        return state.hexdigest()
+
+    def record_trace(self, interval: int = 60, max_frames: int = None) -> list[tuple[int, str]]:
+        """
+        Runs the level starting all waves until it is finished, recording state hash every interval frames
+        (and after the last frame).
+
+        Arguments:
+            interval (int): Number of frames between recorded hashes. Defaults to 60 (a second of game time).
+            max_frames (int): Upper bound on simulated frames (None for no bound).
+
+        Returns:
+            list[tuple[int, str]]: Trace - pairs of frame number and state hash.
+        """
+        trace = []
+        while not self.finished and (max_frames is None or self.frame < max_frames):
+            self.start_wave()
+            self.tick()
+            if self.frame % interval == 0:
+                trace.append((self.frame, self.state_hash()))
+        if not trace or trace[-1][0] != self.frame:
+            trace.append((self.frame, self.state_hash()))
+        return trace
+
+    def set_speed(self, speed: int) -> None:
+        """
+        Records change of the game speed. Speed only affects how many frames are simulated per displayed frame,
+        so it is kept in the replay for reference and skipped on playback.
+
+        Arguments:
+            speed (int): Number of simulated frames per displayed frame (None for as fast as possible).
+        """
+        self.replay.record(self.frame, Replay.SPEED, value=speed)
+
+    @classmethod
+    def play_replay(cls, replay: Replay, root_directory: str, max_frames: int = None) -> 'Simulation':
+        """
+        Plays player actions back headlessly at maximum speed - advances the world up to the frame of every action,
+        applies it, and lets the last started wave finish.
+
+        Arguments:
+            replay (Replay): Recorded actions.
+            root_directory (str): The root directory of the repository for relative path operations.
+            max_frames (int): Upper bound on simulated frames (None for no bound).
+
+        Returns:
+            Simulation: The simulation in its final state.
+        """
+        simulation = cls(replay.level_name, root_directory)
+        end = inf if max_frames is None else max_frames
+        for frame, action, tile, value in replay.actions:
+            simulation.step(min(frame, end) - simulation.frame)
+            if simulation.frame >= end:
+                break
+            if action == Replay.PLACE:
+                simulation.place_tower(value, tile)
+            elif action == Replay.UPGRADE:
+                simulation.upgrade_tower(tile, value)
+            elif action == Replay.WAVE:
+                simulation.start_wave()
+        simulation.step(end - simulation.frame)
+        return simulation
+
+    @staticmethod
+    def save_trace(path: str, trace: list[tuple[int, str]]) -> None:
+        """Saves trace to a text file (one "frame hash" pair per line)."""
+        with open(path, "w") as file:
+            file.writelines(f"{frame} {state}\n" for frame, state in trace)
+
+    @staticmethod
+    def load_trace(path: str) -> list[tuple[int, str]]:
+        """Loads trace saved by save_trace."""
+        with open(path) as file:
+            return [(int(frame), state) for frame, state in (line.split() for line in file if line.strip())]
+
+    @staticmethod
+    def compare_traces(expected: list[tuple[int, str]], actual: list[tuple[int, str]]) -> int:
+        """
+        Compares two traces.
+
+        Returns:
+            int: First frame in which traces differ (None if they are identical).
+        """
+        for (expected_frame, expected_state), (actual_frame, actual_state) in zip(expected, actual):
+            if expected_frame != actual_frame or expected_state != actual_state:
+                return min(expected_frame, actual_frame)
+        if len(expected) != len(actual):
+            shorter = expected if len(expected) < len(actual) else actual
+            return shorter[-1][0] if shorter else 0
+        return None
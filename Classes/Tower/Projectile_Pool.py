@@ -0,0 +1,142 @@
+import numpy as np
+
+
+class ProjectilePool:
+    """
+    Fixed-capacity store of projectiles kept in preallocated NumPy arrays.
+
+    Every projectile occupies one slot of the arrays. Free slots are kept on a free list (stack)
+    and reused by next shots, displayed projectiles are listed in the dense active array.
+    update() moves all of them with a handful of vectorized operations and deletes the ones
+    that reached their destination in bulk, compacting active (the rest keep their order)
+    and returning their slots to the free list. Shots fired when the pool is full are not
+    displayed (projectiles are only visual, damage is dealt on shot).
+
+    Position of a projectile is computed from its start and the whole number of steps made,
+    so it doesn't drift.
+
+    Instance Attributes:
+        capacity (int): Maximal number of displayed projectiles.
+        count (int): Number of displayed projectiles.
+        x, y (np.ndarray[float]): Current position of projectiles in pixels.
+        start_x, start_y (np.ndarray[float]): Position the projectile was fired from.
+        step_x, step_y (np.ndarray[float]): Movement per frame (vector of length equal to speed).
+        steps (np.ndarray[int]): Number of frames the projectile has moved.
+        travelled (np.ndarray[int]): Distance travelled in pixels.
+        length (np.ndarray[float]): Distance from start to destination in pixels.
+        speed (np.ndarray[int]): Number of pixels travelled per frame.
+        asset (np.ndarray[int]): Index of the projectile graphic in assets.
+        assets (list[str]): Names of projectile graphics used so far.
+        free (list[int]): Free slots (the most recently freed on top).
+        active (np.ndarray[int]): Slots of displayed projectiles (first count entries).
+
+    Methods:
+        __init__(capacity: int = 512) -> None: Preallocates arrays for capacity projectiles.
+        fire(start: Coord, finish: Coord, asset: str, speed: int = 60) -> int: Adds a projectile, returns its slot.
+        update() -> None: Moves all projectiles by one frame (vectorized), deleting the ones that reached their destination.
+        clear() -> None: Deletes all projectiles.
+        displayed() -> Iterator[tuple[str, tuple[float, float]]]: Yields graphic and screen position of displayed projectiles.
+        positions() -> tuple[np.ndarray, np.ndarray]: Returns positions of displayed projectiles.
+    """
+
+    def __init__(self, capacity: int = 512) -> None:
+        """
+        Preallocates arrays for the given number of projectiles.
+
+        Arguments:
+            capacity (int): Maximal number of displayed projectiles (defaults to 512).
+        """
+        self.capacity: int = capacity
+        self.count: int = 0
+        self.x: np.ndarray = np.zeros(capacity, np.float64)
+        self.y: np.ndarray = np.zeros(capacity, np.float64)
+        self.start_x: np.ndarray = np.zeros(capacity, np.float64)
+        self.start_y: np.ndarray = np.zeros(capacity, np.float64)
+        self.step_x: np.ndarray = np.zeros(capacity, np.float64)
+        self.step_y: np.ndarray = np.zeros(capacity, np.float64)
+        self.steps: np.ndarray = np.zeros(capacity, np.int64)
+        self.travelled: np.ndarray = np.zeros(capacity, np.int64)
+        self.length: np.ndarray = np.zeros(capacity, np.float64)
+        self.speed: np.ndarray = np.zeros(capacity, np.int64)
+        self.asset: np.ndarray = np.zeros(capacity, np.int64)
+        self.assets: list[str] = []
+        self._asset_ids: dict[str, int] = {}
+        # Lowest slots on top, so they are used first
+        self.free: list[int] = list(range(capacity - 1, -1, -1))
+        self.active: np.ndarray = np.zeros(capacity, np.int64)
+
+    def fire(self, start, finish, asset: str, speed: int = 60) -> int:
+        """
+        Adds a projectile flying from start to finish.
+
+        Arguments:
+            start (Coord): Position the projectile is fired from in pixels.
+            finish (Coord): Destination of the projectile in pixels.
+            asset (str): Name of the projectile graphic.
+            speed (int): Number of pixels travelled per frame (defaults to 60).
+
+        Returns:
+            int: Slot of the projectile (-1 if the pool is full and the projectile is not displayed).
+        """
+        if not self.free:
+            return -1
+        slot = self.free.pop()
+        base_x, base_y = finish.x - start.x, finish.y - start.y
+        length = (base_x**2 + base_y**2)**0.5
+        self.x[slot], self.y[slot] = start.x, start.y
+        self.start_x[slot], self.start_y[slot] = start.x, start.y
+        # Vector of length equal to speed (none if the projectile is fired at its start)
+        self.step_x[slot] = base_x/length*speed if length else 0.0
+        self.step_y[slot] = base_y/length*speed if length else 0.0
+        self.steps[slot] = 0
+        self.travelled[slot] = 0
+        self.length[slot] = length
+        self.speed[slot] = speed
+        if asset not in self._asset_ids:
+            self._asset_ids[asset] = len(self.assets)
+            self.assets.append(asset)
+        self.asset[slot] = self._asset_ids[asset]
+        self.active[self.count] = slot
+        self.count += 1
+        return slot
+
+    def update(self) -> None:
+        """
+        Moves all projectiles by one frame in a single vectorized step.
+        Projectiles that reached their destination are deleted in bulk (keeping order of the rest in active).
+        """
+        n = self.count
+        if not n:
+            return
+        slots = self.active[:n]
+        expired = self.travelled[slots] > self.length[slots]
+
+        # Move projectiles (from the start, by whole number of steps)
+        moving = slots[~expired]
+        steps = self.steps[moving] + 1
+        self.steps[moving] = steps
+        self.x[moving] = np.ceil(self.start_x[moving] + self.step_x[moving]*steps)
+        self.y[moving] = np.ceil(self.start_y[moving] + self.step_y[moving]*steps)
+        self.travelled[moving] += self.speed[moving]
+
+        # Delete expired projectiles
+        if moving.size < n:
+            self.free.extend(slots[expired][::-1].tolist())
+            k = moving.size
+            self.active[:k] = moving
+            self.count = k
+
+    def clear(self) -> None:
+        """Deletes all projectiles."""
+        self.free.extend(self.active[:self.count][::-1].tolist())
+        self.count = 0
+
+    def displayed(self):
+        """Yields graphic name and screen position (top left corner) of every displayed projectile."""
+        for slot in self.active[:self.count]:
+            yield self.assets[self.asset[slot]], (self.x[slot] - 25, self.y[slot] - 25)
+
+    def positions(self) -> tuple[np.ndarray, np.ndarray]:
+        """Returns positions of displayed projectiles (in order of active)."""
+        slots = self.active[:self.count]
+        return self.x[slots], self.y[slots]
@@ -1,13 +1,17 @@
-from ..Utilities import Coord
-from ..Enemy.Enemy import Enemy, EnemyManager
+from ..Utilities import Coord, EntityList
+from ..Enemy.Enemy import EnemyManager
+from .Projectile_Pool import ProjectilePool
 from ..Level.Test_Level import Level
 from math import ceil
+from time import perf_counter
+import numpy as np
 
 class Tower: 
     """Defining properties of towers.
         
         Class Attibutes:
         tower_types (dict): A class-level dictionary defining different types of towers and their properties.
+        tower_upgrades (tuple[tuple[str, str, str]]): Upgrade trees - towers of every tree ordered by tier.
 
         Instance Attributes:
         range (int): The tower's attack range in pixels.
@@ -28,6 +32,9 @@ class Tower:
         
         setbasecooldown():
             Resets the attack cooldown to the base cooldown value
+
+        upgrades(tower_name: str) -> tuple[str]:
+            Returns towers the tower can be upgraded into (class method).
         """
 ######################################################## dmg #no of shots## bounce #### cost #######aoe range######################################projectile asset
 ################################################### range ## cd #### target #### no of b.##### aoe ############# tower asset ######################################
@@ -85,6 +92,14 @@ class Tower:
         self.base_cooldown = Tower.tower_types[tower_type][2]
         self.tower_name = tower_type
 
+    @classmethod
+    def upgrades(cls, tower_name: str) -> tuple[str]:
+        """Returns towers the tower can be upgraded into (higher tiers of its upgrade tree, empty if there are none)."""
+        for tree in cls.tower_upgrades:
+            if tower_name in tree:
+                return tree[tree.index(tower_name) + 1:]
+        return ()
+
     def cooldown(self):
         """Decreases the attack cooldown by one frame."""
         self.atk -= 1
@@ -95,90 +110,71 @@ class Tower:
 
 class Projectiles:
     """
-    Manages projectiles fired by towers
-    Takes start : Coord and finish : Coord arguments relating to position of
-    their spawn and position where they should despawn.
-    Asset : str argument defines graphic to be displayed
-    Speed : int argument defines number of pixels travelled per frame
+    Manages projectiles fired by towers (purely visual - damage is dealt when the tower fires).
+    Projectiles fly from their spawn position to the position where they despawn,
+    state of all of them is kept in a fixed-capacity ProjectilePool.
+
     Class attributes:
-    displayed: list['Projectiles'] follows all existing projectiles
+    pool (ProjectilePool): Array-backed store of all displayed projectiles.
+
+    Class methods:
+    fire(start: Coord, finish: Coord, asset: str, speed: int = 60) -> None: Fires a projectile (asset defines graphic to be displayed,
+                                                                            speed - number of pixels travelled per frame).
+    update() -> None: Animates all projectiles.
+    clear() -> None: Removes all projectiles.
+    displayed(): Yields graphic name and screen position of every displayed projectile.
     """
-    displayed: list['Projectiles']= []
-    def __init__(self,start: Coord, finish: Coord, asset: str, speed: int = 60):
-        self.asset = asset
-        self.start = start
-        # Self.start is constant, self.pos will be changed
-        self.pos: Coord = start
-        self.destination = finish
-        self.speed = speed
-        # Position on screen
-        self.display_pos = ((self.pos - 25).x, (self.pos - 25).y)
-        # Travelled distance
-        self.travelled = 0
-        # For clarity in init, these will be defined in separate method
-        self.mov_vector = None
-        self.vector_len = None
-        Projectiles.displayed.append(self)
-    def display_update(self):
-        """Makes sure screen position stays bounded to actual position"""
-        self.display_pos = ((self.pos - 25).x, (self.pos - 25).y)
-    def create_vector(self):
-        """Defines mov_vector and vector_len attributes"""
-        base_vector = self.destination - self.start
-        self.vector_len = (base_vector.x**2 + base_vector.y**2)**0.5
-        # Vector of length 1
-        normalized_vector = Coord(base_vector.x/self.vector_len,base_vector.y/self.vector_len)
-        # Vector of length equal to speed
-        self.mov_vector = Coord(normalized_vector.x*self.speed,normalized_vector.y*self.speed)
-    def animation (self):
-        """
-        Takes care of proper initialization, removing and movement of projectiles
-        """
-        if not self.mov_vector:
-            self.create_vector()
-        if self.travelled > self.vector_len:
-            self.remove()
-        else:
-            # Move projectile
-            self.pos += self.mov_vector
-            self.pos.ceiling()
-            # Update travelled distance
-            self.travelled += self.speed
-            # Update position on screen
-            self.display_update()
-    def remove(self):
-        """Deletes projectile"""
-        Projectiles.displayed.remove(self)
+    pool: ProjectilePool = ProjectilePool()
+
+    @classmethod
+    def fire(cls, start: Coord, finish: Coord, asset: str, speed: int = 60) -> None:
+        """Fires a projectile from start to finish"""
+        cls.pool.fire(start, finish, asset, speed)
+
     @classmethod
     def update(cls):
         """Animates all projectiles"""
-        for projectile in cls.displayed:
-            projectile.animation()
+        cls.pool.update()
         if not EnemyManager.present:
-            cls.displayed = []
+            cls.pool.clear()
+
+    @classmethod
+    def clear(cls):
+        """Removes all projectiles"""
+        cls.pool.clear()
+
+    @classmethod
+    def displayed(cls):
+        """Yields graphic name and screen position of every displayed projectile"""
+        return cls.pool.displayed()
 
 class Tower_Manager:
     """
     Manages tower instances, handling their placement, attacks, and interactions with enemies.
 
     Class Attributes:
-    towers (list['Tower_Manager']): Attribute storing all currently placed towers.
+    towers (EntityList): Attribute storing all currently placed towers (in slot order).
     enemies (list['Enemy']): Attribute referencing the list of active enemies from the EnemyManager class.
-    explosions (list[list[tuple, int, int]]) : List of ongoing explosions.
+    target_criterias (dict[str, tuple[bool, int]]): Supported target criteria ('low_hp', 'high_hp', 'front', 'back').
+    explosions (EntityList) : Ongoing explosions.
+    layout_version (int): Counter increased whenever towers are placed, upgraded or reset (used by UI to rebuild its static layer).
     
     Attributes:
     tower_type (Tower): The tower instance being managed.
     pos (Coord): The position of the tower on the map.
+    handle (tuple[int, int]): Handle of the tower in towers.
     display_pos (tuple): The display position of the tower for UI purposes.
 
     Methods:
     __init__(tower_type_str: str = "test_tower", pos: Coord = Coord(0, 0)) -> None:
         Initializes a tower at the specified position with the specified type.
-    attack():
-        Manages the tower's attacks, targeting the weakest enemy within range if the tower is ready to fire.
+    attack(target: EnemyManager = None):
+        Manages the tower's attacks, firing at the target chosen by the targeting pass if the tower is ready to fire.
     
     Class methods:
-    update():
+    acquire_targets(cls) -> list[EnemyManager]:
+        Chooses targets of all ready towers in one batched pass.
+    update(timer: Callable[[str, float], None] = None):
         Updates all active towers, managing their attacks every frame.
     reset():
         Clears all towers, typically used when starting a new game.
@@ -186,10 +182,16 @@ class Tower_Manager:
         Returns all towers currently on the map as dict keyed by their positions and valued with corresponding tower names.
     """
 
-    towers: list['Tower_Manager'] = []
+    towers: EntityList = EntityList()
+    layout_version: int = 0
     enemies: list['EnemyManager'] = EnemyManager.present
-    # list[list[tuple: explosion display position, int - aoe_range, int - remaining frames of displaying - 10 at the start]] - not implemented
-    explosions: list[list[tuple, int, int]] = [] 
+    # Target criteria: (whether compared value is progress along the path (else hp), 1 for minimum / -1 for maximum)
+    target_criterias: dict[str, tuple[bool, int]] = {'low_hp': (False, 1),
+                                                     'high_hp': (False, -1),
+                                                     'front': (True, -1),
+                                                     'back': (True, 1)}
+    # list[tuple: explosion display position, int - aoe_range, int - remaining frames of displaying - 10 at the start] - not implemented
+    explosions: EntityList = EntityList()
 
     def __init__(self,
                  tower_type_str: str = "test_tower", 
@@ -206,146 +208,187 @@ class Tower_Manager:
         self.tower_type = Tower(tower_type_str)
         self.pos = Coord((pos.x//120)*120,(pos.y//120)*120) + 60
         self.display_pos = (self.pos.x - 60,self.pos.y-60)
-        self.own_projectiles: list[Projectiles] = []
-        # Criteria for choosing attack target. Currently only attacks the weakest.
+        # Criteria for choosing attack target (one of Tower_Manager.target_criterias). Defaults to the weakest.
         self.target_criteria = 'low_hp'
         # As bouncing attacks take multiple frames, they need more attributes
         if self.tower_type.bouncing:
             self.remaining_bounces = self.tower_type.bouncing_count
-            # List following enemies and nearby targets for next bounce
-            self.distance: list[(int,EnemyManager)] = []
+            # List following already attacked enemies (excluded from next bounces)
             self.already_attacked: list[EnemyManager] = []
             self.next_target: EnemyManager = None
-        Tower_Manager.towers.append(self)
+        self.handle: tuple[int, int] = Tower_Manager.towers.add(self)
+        Tower_Manager.layout_version += 1
 
     def untargetted_attack(self):
         """Manages untargetted attacks"""
 
-    def attack(self):
-        """Manages attacks, targeting the weakest enemy within range if the tower is ready to fire."""
-        criteria = self.target_criteria
-        for projectile in self.own_projectiles:
-            if projectile not in Projectiles.displayed: #Removing unnecessary reference
-                self.own_projectiles.remove(projectile)
+    def attack(self, target: EnemyManager = None):
+        """
+        Manages attacks, firing at the target if the tower is ready to fire.
+
+        Arguments:
+        target (EnemyManager): Enemy chosen for this tower by the targeting pass, None if there is no enemy in range.
+        """
         #Passing time between attacks
         if self.tower_type.atk !=0:
             self.tower_type.cooldown()
             # Processes bouncing attacks - they take more then one frame to be completed
             if self.tower_type.bouncing:
-                if self.remaining_bounces and (self.distance or self.already_attacked):
-                    for possible_target in self.distance:
-                        # Finds non-attacked enemies within bounce range
-                        if possible_target[0] <= 300 and possible_target[1] not in self.already_attacked:
-                            previous: EnemyManager = self.next_target
-                            # Mark enemy as attacked
-                            self.already_attacked.append(possible_target[1])
-                            self.next_target: EnemyManager  = possible_target[1]
-                            self.next_target.take_damage(self.tower_type.dmg)
-                            self.remaining_bounces -= 1
-                            # Create projectile
-                            self.own_projectiles.append(Projectiles(previous.pos,self.next_target.pos,self.tower_type.projectile_asset))
-                            # Clear list of nearby enemies
-                            self.distance = []
-                            # Create new one
-                            for victim in self.enemies:
-                                area = ((victim.pos.x - self.next_target.pos.x)**2 + (victim.pos.y - self.next_target.pos.y)**2)**0.5
-                                self.distance.append((area, victim))
-                            self.distance.sort(key = lambda victim: victim[0])
-                            break
+                if self.remaining_bounces and self.already_attacked:
+                    # Finds the nearest non-attacked enemy within bounce range
+                    nearby = EnemyManager.grid.k_nearest(self.next_target.pos, 1, self.already_attacked, 300)
+                    if nearby:
+                        previous: EnemyManager = self.next_target
+                        # Mark enemy as attacked
+                        self.next_target: EnemyManager = nearby[0]
+                        self.already_attacked.append(self.next_target)
+                        self.next_target.take_damage(self.tower_type.dmg)
+                        self.remaining_bounces -= 1
+                        # Create projectile
+                        Projectiles.fire(previous.pos, self.next_target.pos, self.tower_type.projectile_asset)
                 else:
-                    self.distance.clear()
                     self.already_attacked.clear()
-        #if tower is ready to fire, it will look for enemies in range
+        # If tower is ready to fire, it attacks target chosen by the targeting pass (Tower_Manager.acquire_targets)
         else:
             if self.tower_type.bouncing:
                 # Restore base bounces
                 self.remaining_bounces = self.tower_type.bouncing_count
-            inrange: dict[EnemyManager, Enemy.life]= {}#this dict will contain enemies in range as keys and their hp as values
-            for enemy in Tower_Manager.enemies:
-                distance = ((enemy.pos.x - self.pos.x)**2 + (enemy.pos.y - self.pos.y)**2)**0.5#calculates distance between tower and enemy
-                if distance <= self.tower_type.range: #lists enemies within range (idea: we could use non-carthesian spaces)$$ #############coord class required###########
-                    inrange[enemy] = (enemy.life)
-            if not len(inrange):# returns when list length is 0
+            if target is None:
                 return
-            # Find enemies matching criteria - currently only lowest hp
-            for enemy in inrange.keys():
-                if criteria == 'low_hp':
-                    value = inrange[enemy]
-                    condition = min(inrange.values())
-                # Not implemented
-                #elif criteria == 'high_hp':
-                #    value = inrange[enemy]
-                #    condition = max(inrange.values())
-                #elif criteria == 'front':
-                #    value = inrange[enemy][1]
-                #    condition = max(inrange.values()[1])
-                #elif criteria == 'back':
-                #    value = inrange[enemy][1]
-                #    condition = min(inrange.values()[1])
-                if value == condition:
-                    target = enemy
-                    # Determine attack type
-                    if self.tower_type.aoe: 
-                        for victims in self.enemies:
-                            # Determine distance between first and surrounding targets
-                            area = ((victims.pos.x - target.pos.x)**2 + (victims.pos.y - target.pos.y)**2)**0.5
-                            if area <= self.tower_type.aoe_range:
-                                victims.take_damage(self.tower_type.dmg)
-                        # Create projectiles
-                        self.own_projectiles.append(Projectiles(self.pos, enemy.pos, self.tower_type.projectile_asset))
-                        # Explosion animation - not implemented
-                        Tower_Manager.explosions.append([(enemy.pos.x - self.tower_type.aoe_range,enemy.pos.y - self.tower_type.aoe_range),self.tower_type.aoe_range,10])
-                        # Restore cooldown
-                        self.tower_type.setbasecooldown()
-                        break
-                    elif self.tower_type.bouncing:
-                        self.next_target = target
-                        enemy.take_damage(self.tower_type.dmg)
-                        self.own_projectiles.append(Projectiles(self.pos,self.next_target.pos,self.tower_type.projectile_asset))
-                        self.already_attacked = [self.next_target]
-                        #for bounce in range(self.tower_type.bouncing_count):
-                        self.distance = []
-                        # Explained in first if in Attack()
-                        for victim in self.enemies:
-                            area = ((victim.pos.x - self.next_target.pos.x)**2 + (victim.pos.y - self.next_target.pos.y)**2)**0.5
-                            self.distance.append((area, victim))
-                        self.distance.sort(key = lambda victim: victim[0])
-                        self.tower_type.setbasecooldown()
-                        break
-                    else:
-                        enemy.take_damage(self.tower_type.dmg)
-                        self.tower_type.setbasecooldown()
-                        self.own_projectiles.append(Projectiles(self.pos,enemy.pos,self.tower_type.projectile_asset))
-                        break
+            # Determine attack type
+            if self.tower_type.aoe: 
+                # Damage enemies surrounding the target (including it)
+                for victims in EnemyManager.grid.query_radius(target.pos, self.tower_type.aoe_range):
+                    victims.take_damage(self.tower_type.dmg)
+                # Create projectiles
+                Projectiles.fire(self.pos, target.pos, self.tower_type.projectile_asset)
+                # Explosion animation - not implemented
+                Tower_Manager.explosions.add([(target.pos.x - self.tower_type.aoe_range,target.pos.y - self.tower_type.aoe_range),self.tower_type.aoe_range,10])
+            elif self.tower_type.bouncing:
+                self.next_target = target
+                target.take_damage(self.tower_type.dmg)
+                Projectiles.fire(self.pos, self.next_target.pos, self.tower_type.projectile_asset)
+                # Further bounces are processed in following frames (explained in first if in attack())
+                self.already_attacked = [self.next_target]
+            else:
+                target.take_damage(self.tower_type.dmg)
+                Projectiles.fire(self.pos, target.pos, self.tower_type.projectile_asset)
+            # Restore cooldown
+            self.tower_type.setbasecooldown()
 
     def upgrade(self, tower_name : str):
         """This method upgrades a chosen tower by deleting old an placing new""" 
         pos = self.pos
         new_tower = Tower_Manager(tower_name,pos)
-        Tower_Manager.towers.remove(self)
+        Tower_Manager.towers.remove(self.handle)
+        Tower_Manager.layout_version += 1
         
 
     @classmethod
     def explosions_update(cls):
-        for explosion in cls.explosions:
+        for handle, explosion in cls.explosions.handles():
             if explosion[2] == 0:
-                cls.explosions.remove(explosion)
-        for explosion in cls.explosions:
-            explosion[2] -= 1
+                cls.explosions.remove(handle)
+            else:
+                explosion[2] -= 1
 
     @classmethod
-    def update(cls):
-        """Update all active towers, managing their attacks every frame."""
+    def acquire_targets(cls) -> list[EnemyManager]:
+        """
+        Chooses targets of all ready towers in one batched pass.
+
+        Targets of towers are chosen according to their target_criteria:
+        'front' and 'back' - enemy in range that is the closest to/farthest from the end of the path,
+        looked up in the progress index of enemies (binary search over parts of the path within range);
+        'low_hp' and 'high_hp' - weakest/strongest enemy in range. For those enemies are narrowed down
+        to the ones standing in tiles covered by ranges of ready towers (spatial grid), tower x enemy
+        squared distance matrix is computed once per frame and targets of all such towers are resolved at once
+        (ties in favour of the earliest spawned enemy).
+
+        Returns:
+            list[EnemyManager]: Target of every tower (in order of iterating cls.towers), None for towers that are
+                                not ready or have no enemy in range.
+        """
+        towers = list(cls.towers)
+        targets = [None] * len(towers)
+        pool = EnemyManager.pool
+        if not pool.count:
+            return targets
+
+        # 'front' / 'back' - lookups in the progress index
+        ready = []
+        for i, tower in enumerate(towers):
+            if tower.tower_type.atk != 0:
+                continue
+            by_progress, sign = cls.target_criterias[tower.target_criteria]
+            if not by_progress:
+                ready.append(i)
+            elif sign < 0:
+                targets[i] = pool.progress_index.first_in_range(tower.pos, tower.tower_type.range)
+            else:
+                targets[i] = pool.progress_index.last_in_range(tower.pos, tower.tower_type.range)
+        if not ready:
+            return targets
+
+        # Towers data
+        towers_x = np.array([towers[i].pos.x for i in ready], np.float64)
+        towers_y = np.array([towers[i].pos.y for i in ready], np.float64)
+        ranges = np.array([towers[i].tower_type.range for i in ready], np.float64)
+        sign = np.array([cls.target_criterias[towers[i].target_criteria][1] for i in ready], np.float64)
+
+        # Candidates - enemies standing in tiles covered by ranges of ready towers
+        candidates = np.nonzero(EnemyManager.grid.cells_mask(towers_x, towers_y, ranges))[0]
+        if not candidates.size:
+            return targets
+
+        # Squared distances between towers (rows) and candidate enemies (columns)
+        dx = towers_x[:, None] - pool.x[candidates]
+        dy = towers_y[:, None] - pool.y[candidates]
+        in_range = dx*dx + dy*dy <= (ranges*ranges)[:, None]
+
+        # Value minimised by each tower (sign flips minimum into maximum)
+        values = pool.life[candidates][None, :] * sign[:, None]
+        choice = np.where(in_range, values, np.inf).argmin(axis=1)
+        has_target = in_range.any(axis=1)
+
+        for row, i in enumerate(ready):
+            if has_target[row]:
+                targets[i] = pool.views[candidates[choice[row]]]
+        return targets
+
+    @classmethod
+    def update(cls, timer = None):
+        """
+        Update all active towers, managing their attacks every frame.
+
+        Arguments:
+            timer (Callable[[str, float], None]): Optional hook receiving time spent in "towers" and "projectiles" (in seconds),
+                                                  nothing is timed if it's None (default).
+        """
+        start = perf_counter() if timer is not None else 0.0
         cls.enemies = EnemyManager.present #update enemy list
-        for tower in cls.towers:
-            tower.attack()
-        Projectiles.update()
+        targets = cls.acquire_targets()
+        for tower, target in zip(cls.towers, targets):
+            tower.attack(target)
+        if timer is None:
+            Projectiles.update()
+        else:
+            projectiles_start = perf_counter()
+            Projectiles.update()
+            projectiles_end = perf_counter()
         cls.explosions_update()
+        # Release slots of towers and explosions removed in this frame
+        cls.towers.flush()
+        cls.explosions.flush()
+        if timer is not None:
+            timer("projectiles", projectiles_end - projectiles_start)
+            timer("towers", projectiles_start - start + perf_counter() - projectiles_end)
 
     @classmethod
     def reset(cls):
         """Clearsall towers, when new game starts"""
-        cls.towers = [] # clearing list
+        cls.towers.clear()
+        cls.layout_version += 1
         
     def load_lvl():
         """Clear old data and reset towers, used when loading a new level."""
@@ -0,0 +1,251 @@
+import pygame
+import os
+import json
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
+from time import perf_counter
+from ..Profiling.Startup_Profiler import StartupProfiler
+
+
+class AssetLoader:
+    """
+    Central loader of graphics, converting every image once into the pixel format of the display.
+
+    Blitting a surface in a different pixel format than the display makes pygame convert it on every blit,
+    so images are passed through convert() (opaque images, eg. maps and menu backgrounds)
+    or convert_alpha() (sprites with transparency) right after loading.
+    Converted surfaces are kept in a process-wide cache keyed by path, so menus, levels and the outro
+    share them and a PNG file is decoded only once.
+
+    Every load() takes a reference to the surface and release() gives it back.
+    Surfaces with no references stay cached (so going back to a menu or restarting a level is instant)
+    until memory taken by all cached surfaces exceeds the budget - then the least recently used
+    unreferenced ones are evicted. Referenced surfaces are never evicted.
+    Returned surfaces are shared - a copy has to be made before drawing on one.
+
+    Sprites packed into atlas sheets (see build_atlases in Classes/Map_generator/assets_builder.py)
+    are sliced from their sheet as subsurfaces, so a single file is decoded for a whole set of sprites.
+    Sheets are built locally (they aren't kept in the repository), sprites changed since then are loaded from their files.
+    A sliced sprite holds a reference to its sheet until it is evicted.
+
+    Images that will be needed soon (eg. level graphics while the intro and the main menu are displayed)
+    can be decoded in advance by a background thread with preload(). Only decoding happens on the thread
+    (pygame releases the GIL while decoding PNG files), conversion into the display format is done by load() on the main thread.
+    Decoded images waiting for load() count against the budget too - when it's exceeded after evicting every unreferenced
+    cached surface, the most recently queued preloads (needed last) are dropped and decoded again when loaded.
+
+    Class Attributes:
+        budget (int): Memory (in bytes) cached surfaces may take before unreferenced ones are evicted.
+        surfaces (OrderedDict[tuple[str, bool], pygame.Surface]): Converted surfaces by (path, alpha), least recently used first.
+        references (dict[tuple[str, bool], int]): Number of references taken to every cached surface.
+        memory (int): Memory taken by cached surfaces in bytes (sliced sprites share memory of their sheets, preloaded images not included).
+        atlas_index (dict[str, tuple[str, pygame.Rect]]): Path of the sheet and area of every sprite packed into atlases by the sprite path.
+        pending (dict[str, Future]): Images preloaded (or being preloaded) by the background thread by path.
+
+    Methods:
+        use_atlases(atlas_directory: str, gfx_directory: str = None) -> bool: Reads index of atlas sheets, so packed sprites are sliced from them.
+        preload(*paths: str) -> None: Decodes images on a background thread, so load() doesn't have to wait for it.
+        load(*path: str, alpha: bool = True) -> pygame.Surface: Returns converted image (loaded on first use) and takes a reference to it.
+        load_all(directory: str, names: dict[str, str], alpha: bool = True) -> dict[str, pygame.Surface]: Loads a set of images.
+        release(*surfaces: pygame.Surface) -> None: Gives back references to surfaces, evicting unreferenced ones over the budget.
+        pending_memory() -> int: Returns memory taken by decoded images waiting for load().
+        clear() -> None: Empties the cache.
+    """
+    budget: int = 192 * 2**20
+    surfaces: OrderedDict = OrderedDict()
+    references: dict[tuple[str, bool], int] = {}
+    memory: int = 0
+    atlas_index: dict[str, tuple[str, pygame.Rect]] = {}
+    _keys: dict[int, tuple[str, bool]] = {}
+    pending: dict[str, Future] = {}
+    _sheets: dict[tuple[str, bool], pygame.Surface] = {}
+    _worker: ThreadPoolExecutor = None
+
+    @classmethod
+    def use_atlases(cls, atlas_directory: str, gfx_directory: str = None) -> bool:
+        """
+        Reads index.json of atlas sheets in the directory, so sprites packed into them are sliced from the sheets.
+        Sprites whose source files changed since the sheets were built (size or modification time differs)
+        are loaded from their files (with a warning to rebuild the atlases).
+
+        Arguments:
+            atlas_directory (str): Directory with the sheets and the index.
+            gfx_directory (str): Directory sprite paths are relative to (defaults to the parent of atlas_directory).
+
+        Returns:
+            bool: False if there is no (up-to-date format of the) index (sprites are loaded from separate files), True otherwise.
+        """
+        cls.atlas_index = {}
+        path = os.path.join(atlas_directory, "index.json")
+        if not os.path.exists(path):
+            return False
+        with open(path) as file:
+            index = json.load(file)
+        if index.get("version") != 2:
+            print("Atlas index has an old format, sprites are loaded from separate files "
+                  "(run python -m Classes.Map_generator.assets_builder atlas)")
+            return False
+        if gfx_directory is None:
+            gfx_directory = os.path.dirname(atlas_directory)
+        stale = []
+        for sprite, (sheet, x, y, width, height, size, modified) in index["sprites"].items():
+            sprite_path = os.path.normpath(os.path.join(gfx_directory, *sprite.split("/")))
+            try:
+                source = os.stat(sprite_path)
+            except OSError:
+                continue
+            if (source.st_size, source.st_mtime_ns) != (size, modified):
+                stale.append(sprite)
+                continue
+            cls.atlas_index[sprite_path] = (os.path.join(atlas_directory, sheet), pygame.Rect(x, y, width, height))
+        if stale:
+            print(f"Atlas sheets are out of date for {len(stale)} sprites (eg. {stale[0]}), they are loaded from separate files "
+                  "(run python -m Classes.Map_generator.assets_builder atlas)")
+        return True
+
+    @classmethod
+    def preload(cls, *paths: str) -> None:
+        """
+        Decodes images on a background thread (in the given order), so they are ready when load() is called.
+        Images packed into atlases are preloaded as their sheets, cached and already preloaded ones are skipped.
+
+        Arguments:
+            *paths (str): Paths to the image files.
+        """
+        if cls._worker is None:
+            cls._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="AssetLoader")
+        for path in paths:
+            packed = cls.atlas_index.get(os.path.normpath(path))
+            if packed is not None:
+                path = packed[0]
+            if path not in cls.pending and (path, True) not in cls.surfaces and (path, False) not in cls.surfaces:
+                cls.pending[path] = cls._worker.submit(cls._decode, path)
+        cls._evict()
+
+    @classmethod
+    def load(cls, *path: str, alpha: bool = True) -> pygame.Surface:
+        """
+        Returns image converted into the display pixel format (loaded and converted only on first use)
+        and takes a reference to it (to be given back with release()).
+
+        Arguments:
+            *path (str): Path to the image file (joined with os.path.join).
+            alpha (bool): Whether the image has transparent pixels (convert_alpha()) or is opaque (convert()). Defaults to True.
+
+        Returns:
+            pygame.Surface: Converted image (shared - must not be drawn on).
+        """
+        key = (os.path.join(*path), alpha)
+        surface = cls.surfaces.get(key)
+        if surface is None:
+            packed = cls.atlas_index.get(os.path.normpath(key[0])) if alpha else None
+            if packed is not None:
+                # Slice the sprite from its sheet (the sprite holds a reference to the sheet)
+                sheet, area = packed
+                sheet = cls._sheets[key] = cls.load(sheet)
+                surface = sheet.subsurface(area)
+            else:
+                # Take the image decoded by the background thread (waiting for it if not ready yet)
+                decoded = cls.pending.pop(key[0], None)
+                if decoded is None:
+                    surface = cls._decode(key[0])
+                else:
+                    with StartupProfiler.measure("decode wait", os.path.basename(key[0])):
+                        surface = decoded.result()
+                with StartupProfiler.measure("convert", os.path.basename(key[0])):
+                    surface = surface.convert_alpha() if alpha else surface.convert()
+                cls.memory += surface.get_pitch() * surface.get_height()
+            cls.surfaces[key] = surface
+            cls.references[key] = 0
+            cls._keys[id(surface)] = key
+        else:
+            cls.surfaces.move_to_end(key)
+        cls.references[key] += 1
+        cls._evict()
+        return surface
+
+    @staticmethod
+    def _decode(path: str) -> pygame.Surface:
+        """Decodes the image file (recording the time taken for StartupProfiler)."""
+        start = perf_counter()
+        surface = pygame.image.load(path)
+        StartupProfiler.record("decode", os.path.basename(path), perf_counter() - start)
+        return surface
+
+    @classmethod
+    def load_all(cls, directory: str, names: dict[str, str], alpha: bool = True) -> dict[str, pygame.Surface]:
+        """
+        Loads a set of images from one directory (taking a reference to each of them).
+
+        Arguments:
+            directory (str): Path to the directory with the images.
+            names (dict[str, str]): File names by keys of the returned dictionary.
+            alpha (bool): Whether the images have transparent pixels (defaults to True).
+
+        Returns:
+            dict[str, pygame.Surface]: Converted images by the same keys.
+        """
+        return {key: cls.load(directory, file, alpha=alpha) for key, file in names.items()}
+
+    @classmethod
+    def release(cls, *surfaces: pygame.Surface) -> None:
+        """
+        Gives back references to surfaces returned by load().
+        Surfaces left without references stay cached unless the cache is over the budget.
+        """
+        for surface in surfaces:
+            key = cls._keys.get(id(surface))
+            if key is not None and cls.references[key] > 0:
+                cls.references[key] -= 1
+        cls._evict()
+
+    @classmethod
+    def pending_memory(cls) -> int:
+        """Returns memory (in bytes) taken by images decoded by the background thread and not loaded yet."""
+        return sum(cls._size(future) for future in cls.pending.values())
+
+    @staticmethod
+    def _size(future: Future) -> int:
+        """Returns memory taken by the decoded image (0 if it is not decoded yet or decoding failed)."""
+        if not future.done() or future.cancelled() or future.exception() is not None:
+            return 0
+        surface = future.result()
+        return surface.get_pitch() * surface.get_height()
+
+    @classmethod
+    def _evict(cls) -> None:
+        """
+        Evicts least recently used unreferenced surfaces until the cache (with preloaded images) fits in the budget,
+        then drops preloaded images, most recently queued first.
+        """
+        pending = cls.pending_memory()
+        while cls.memory + pending > cls.budget:
+            key = next((key for key in cls.surfaces if not cls.references[key]), None)
+            if key is None:
+                break
+            surface = cls.surfaces.pop(key)
+            del cls.references[key], cls._keys[id(surface)]
+            if key in cls._sheets:
+                # Sliced sprite - give back its reference to the sheet (which may be evicted next)
+                sheet = cls._sheets.pop(key)
+                cls.references[cls._keys[id(sheet)]] -= 1
+            else:
+                cls.memory -= surface.get_pitch() * surface.get_height()
+        # Decoded images not loaded yet (images still being decoded are counted once they are ready)
+        for path in reversed(list(cls.pending)):
+            if cls.memory + pending <= cls.budget:
+                break
+            size = cls._size(cls.pending[path])
+            if size:
+                del cls.pending[path]
+                pending -= size
+
+    @classmethod
+    def clear(cls) -> None:
+        """Empties the cache (eg. after the display mode has changed)."""
+        cls.surfaces.clear()
+        cls.references.clear()
+        cls._keys.clear()
+        cls._sheets.clear()
+        cls.pending.clear()
+        cls.memory = 0
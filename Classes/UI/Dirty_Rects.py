@@ -0,0 +1,88 @@
+import pygame
+
+
+class DirtyRects:
+    """
+    Dirty-rectangle renderer of a screen drawn as a static background with sprites on top.
+
+    Instead of blitting the whole background and flipping the whole display every frame,
+    only the regions covered by sprites in the previous frame are restored from the background,
+    and only the regions changed in this frame (restored and newly drawn) are passed to pygame.display.update.
+    After the background changes set_background() makes the next frame a full redraw, after anything is drawn on the screen
+    outside the renderer (eg. menus of the UI) invalidate() has to be called for the same.
+
+    Class Attributes:
+        MAX_RECTS (int): Above that number of changed regions the whole display is updated at once.
+
+    Instance Attributes:
+        screen (pygame.Surface): The display surface.
+        background (pygame.Surface): Cached background of the screen (eg. the map).
+
+    Methods:
+        __init__(screen: pygame.Surface) -> None: Creates a renderer drawing on the screen.
+        set_background(background: pygame.Surface) -> None: Sets new background (next frame is a full redraw).
+        invalidate() -> None: Makes the next frame a full redraw.
+        begin() -> None: Starts a frame - restores background under sprites drawn in the previous frame.
+        blit(surface: pygame.Surface, position, area: pygame.Rect = None) -> pygame.Rect: Draws a sprite and marks its region as changed.
+        end() -> list[pygame.Rect]: Ends a frame - updates changed regions of the display.
+    """
+
+    MAX_RECTS: int = 400
+
+    def __init__(self, screen: pygame.Surface) -> None:
+        """
+        Creates a renderer drawing on the screen.
+
+        Arguments:
+            screen (pygame.Surface): The display surface.
+        """
+        self.screen: pygame.Surface = screen
+        self.background: pygame.Surface = None
+        self._previous: list[pygame.Rect] = []
+        self._current: list[pygame.Rect] = []
+        self._full: bool = True
+
+    def set_background(self, background: pygame.Surface) -> None:
+        """Sets new background (next frame is a full redraw)."""
+        self.background = background
+        self._full = True
+
+    def invalidate(self) -> None:
+        """Makes the next frame a full redraw (eg. after a menu has been drawn over the screen)."""
+        self._full = True
+
+    def begin(self) -> None:
+        """Starts a frame - restores background under sprites drawn in the previous frame (or whole background)."""
+        if self._full:
+            self.screen.blit(self.background, (0, 0))
+        else:
+            for rect in self._previous:
+                self.screen.blit(self.background, rect, rect)
+
+    def blit(self, surface: pygame.Surface, position, area: pygame.Rect = None) -> pygame.Rect:
+        """
+        Draws a sprite on the screen and marks its region as changed.
+
+        Returns:
+            pygame.Rect: Region of the screen affected.
+        """
+        rect = self.screen.blit(surface, position, area)
+        self._current.append(rect)
+        return rect
+
+    def end(self) -> list[pygame.Rect]:
+        """
+        Ends a frame - updates regions of the display that changed since the previous frame.
+
+        Returns:
+            list[pygame.Rect]: Updated regions (whole screen for full redraws).
+        """
+        if self._full or len(self._previous) + len(self._current) > DirtyRects.MAX_RECTS:
+            pygame.display.flip()
+            updated = [self.screen.get_rect()]
+            self._full = False
+        else:
+            updated = self._previous + self._current
+            pygame.display.update(updated)
+        self._previous, self._current = self._current, []
+        return updated
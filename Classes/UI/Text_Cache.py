@@ -0,0 +1,115 @@
+import pygame
+from collections import OrderedDict
+
+
+class TextCache:
+    """
+    Bounded LRU cache of rendered text surfaces keyed by (font, text, colour, antialias).
+
+    Used for texts that repeat between frames (enemy hp labels, player name),
+    so each distinct text is rasterised once instead of every frame.
+
+    Instance Attributes:
+        capacity (int): Maximal number of cached surfaces (the least recently used one is evicted).
+        hits, misses (int): Number of renders served from the cache and rasterised.
+
+    Methods:
+        __init__(capacity: int = 512) -> None: Creates an empty cache.
+        render(font: pygame.font.Font, text: str, color: tuple, antialias: bool = False) -> pygame.Surface: Returns rendered text.
+        clear() -> None: Empties the cache.
+        __len__() -> int: Returns number of cached surfaces.
+    """
+
+    def __init__(self, capacity: int = 512) -> None:
+        """
+        Creates an empty cache.
+
+        Arguments:
+            capacity (int): Maximal number of cached surfaces (defaults to 512).
+        """
+        self.capacity: int = capacity
+        self.hits: int = 0
+        self.misses: int = 0
+        self._surfaces: OrderedDict = OrderedDict()
+
+    def render(self, font: pygame.font.Font, text: str, color: tuple, antialias: bool = False) -> pygame.Surface:
+        """
+        Returns text rendered with the font (from the cache if it has been rendered recently).
+
+        Arguments:
+            font (pygame.font.Font): Font to render with.
+            text (str): Text to render.
+            color (tuple): Colour of the text.
+            antialias (bool): Whether to antialias the text (defaults to False, as everywhere in the game).
+
+        Returns:
+            pygame.Surface: Rendered text (shared - must not be drawn on).
+        """
+        key = (font, text, color, antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        surface = self._surfaces[key] = font.render(text, antialias, color)
+        if len(self._surfaces) > self.capacity:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self) -> None:
+        """Empties the cache."""
+        self._surfaces.clear()
+
+    def __len__(self) -> int:
+        """Returns number of cached surfaces."""
+        return len(self._surfaces)
+
+
+class DigitAtlas:
+    """
+    Glyphs of digits (and a few separators) rendered once with a font, composited into numbers when drawn.
+
+    Used for counters that change often (gold, lives, wave), where caching whole texts wouldn't help.
+
+    Instance Attributes:
+        glyphs (dict[str, pygame.Surface]): Rendered characters.
+        advances (dict[str, int]): Horizontal advance of every character in pixels.
+
+    Methods:
+        __init__(font: pygame.font.Font, color: tuple, characters: str = "0123456789-/") -> None: Renders the glyphs.
+        size(text: str) -> tuple[int, int]: Returns size of the text drawn with the atlas.
+        draw(blit, text, position: tuple[int, int]) -> None: Draws text glyph by glyph with the given blit function.
+    """
+
+    def __init__(self, font: pygame.font.Font, color: tuple, characters: str = "0123456789-/") -> None:
+        """
+        Renders the glyphs.
+
+        Arguments:
+            font (pygame.font.Font): Font to render with.
+            color (tuple): Colour of the glyphs.
+            characters (str): Characters available in the atlas (defaults to digits, minus and slash).
+        """
+        self.glyphs: dict[str, pygame.Surface] = {char: font.render(char, False, color) for char in characters}
+        self.advances: dict[str, int] = {char: metrics[4] for char, metrics in zip(characters, font.metrics(characters))}
+        self._height: int = font.get_height()
+
+    def size(self, text: str) -> tuple[int, int]:
+        """Returns size (width, height) of the text drawn with the atlas."""
+        return sum(self.advances[char] for char in text), self._height
+
+    def draw(self, blit, text, position: tuple[int, int]) -> None:
+        """
+        Draws text (eg. a number) glyph by glyph.
+
+        Arguments:
+            blit (Callable[[pygame.Surface, tuple[int, int]], object]): Function drawing a surface at a position
+                                                                         (eg. screen.blit or DirtyRects.blit).
+            text (str | int): Text to draw, made of characters of the atlas.
+            position (tuple[int, int]): Top left corner of the text.
+        """
+        x, y = position
+        for char in str(text):
+            blit(self.glyphs[char], (x, y))
+            x += self.advances[char]
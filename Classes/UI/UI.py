@@ -2,6 +2,7 @@
 import pygame
 import os
 import sys
+from time import perf_counter
 
 import pygame.locals
 from ..Tower.Tower_Classes import Tower_Manager, Tower, Projectiles
@@ -9,6 +10,12 @@ from ..Utilities import Coord, InputBox, load_high_scores, read_credits
 from ..Player.Player import Player
 from ..Map.Map_Class import Map as mp
 from ..Enemy.Enemy import EnemyManager
+from ..Simulation.Simulation import Simulation
+from .Dirty_Rects import DirtyRects
+from .Text_Cache import TextCache, DigitAtlas
+from .Asset_Loader import AssetLoader
+from ..Profiling.Startup_Profiler import StartupProfiler
+from ..Profiling.Frame_Profiler import FrameProfiler
 
 class UI():
     """
@@ -17,19 +24,29 @@ class UI():
     Class Attributes:
         state (dict[str, bool]): Dictionary to hold current information about UI states such as "wave", "buy tower", "speed up" and "pause".
         FPS (int): The frame rate of the game.
+        SPEEDS (dict[str, int]): Number of simulated frames per displayed frame in speed up states (None for as fast as possible).
         RESOLUTION (tuple[int, int]): The resolution of the game window.
+        BUTTONS_FILES (dict[str, str]): File names of button graphics (in HUD and HUD/HUD_L directories).
+        ICONS_FILES (dict[str, str]): File names of interface icons (in HUD directory).
 
     Instance Attributes:
         screen (pygame.Surface): The main game display surface.
         clock (pygame.time.Clock): Manages the game's frame rate.
+        renderer (DirtyRects): Draws gameplay frames updating only the changed regions of the display.
         mouse_click (bool): Tracks the state of mouse clicks.
         pos (tuple[int, int]): Tracks urrent mouse position.
         gfx_path (str): Path to the graphics assets.
+        gfx_loaded (bool): Whether HUD graphics have been loaded (with the first level).
+        overlay_gfx (pygame.Surface): Rendered table of FrameProfiler timings (None if not rendered yet).
         font (pygame.font.Font): Font used for HUD elements.
         hp_font (pygame.font.Font): Font used for enemy health points.
+        text_cache (TextCache): LRU cache of rendered texts (enemy health points, player name).
+        digits (DigitAtlas): Pre-rendered digits of the HUD font composing gold, lives and wave counters.
         player_name_gfx (pygame.Surface): Rendered graphic for the player's name.
         buttons (dict[str, pygame.Surface]): Dictionary of button images for UI. (Keys include: "exit", "ff_NA", "ff_off", "ff", "ff_2", "pause", "play")
         map_gfx (pygame.Surface): Graphic for the game map.
+        static_layer (pygame.Surface): Map with placed towers, rebuilt only when Tower_Manager.layout_version changes.
+        static_layer_version (int): Tower_Manager.layout_version the static layer has been built for.
         towers_gfx (dict): Graphics for the towers.
         towers_list (list): List of tower_gfx keys, ie. list of towers that player can buy in currrent level.
         towers_HUD_gfx (dict) : Graphics for towers displayed in HUD (corresponding to towers_list and towers_gfx).
@@ -38,15 +55,17 @@ class UI():
         number_of_waves (int): Total number of waves in the current level.
         current_wave (int): The current wave number.
         directory (str): Path to the root directory of the repository.
-        frame_counter (int): Current frame (not absolute) for speeding up the game by ommiting some frames.
         tower_bieing_bought (int): Index of tower currently being bought (defaults to -1).
 
     Methods:
         __init__(player_name: str) -> None: Initializes the UI instance and sets up the display and initial variables.
-        process_input(map: mp, player: Player) -> None: Processes user input from the keyboard and mouse.
+        process_input(map: mp, player: Player, simulation: Simulation) -> None: Processes user input from the keyboard and mouse.
         intro() -> None: Displays the intro sequence.
         main_menu() -> bool: Displays the main menu and handles menu interactions.
         outro() -> None: Placeholder for the outro sequence.
+        preload_gfx() -> None: Starts decoding menu and HUD graphics on a background thread.
+        preload_level_gfx(map_name: str, bullets_names: dict, enemies_names: dict) -> None: Starts decoding graphics of a level on a background thread.
+        profiler_overlay() -> None: Draws FrameProfiler timings (toggled with F3).
         update(gold: int, lives: int, enemies: list) -> None: Updates the game display each frame.
         hud(gold: int, lives: int, map : mp) -> None: Draws the HUD elements on the screen.
         load_lvl(number_of_waves: int = 3, current_wave: int = 0, map_name: str = "TEST_1", 
@@ -55,18 +74,24 @@ class UI():
                  enemies_names: dict = {"test_enemy": "enemy_placeholder.png"}) -> None: 
                  Loads level graphics and initializes level variables.
         reset_state(cls) -> None: Resets state dict keys to all False.
-        skip_frames(self, num_of_frames_2_skip: int) -> bool: Determines if the frame should be displayed or skipped based on the speed up states.
+        build_static_layer(self) -> None: Pre-renders map with placed towers as the background of gameplay frames.
+        simulation_speed(self) -> int: Returns number of simulated frames per displayed frame based on the speed up states.
         accessibility_rectangle(self, tile_size: int, map: mp) -> bool: Checks if a position on the game map, based on the current mouse position, 
                                                                         is suitable for placing a tower and visually indicates this with a colored rectangle.
     """
     # Game state for adjusting what gets displayed and how
     state: dict[str, bool] = {key: False for key in 
-                               ["wave", "buy tower", "pause", "speed up", "speed up more", 
+                               ["wave", "buy tower", "pause", "speed up", "speed up more", "max speed",
                                 "not enough gold", "towers alg", "towers ana", "towers pro", "game over", "upgrade tower"]}
     
     # Constant parameters
     FPS: int = 60 # framerate
+    SPEEDS: dict[str, int] = {"speed up": 3, "speed up more": 8, "max speed": None} # simulated frames per displayed frame
     RESOLUTION: tuple[int, int] = 1920, 1080
+    BUTTONS_FILES: dict[str, str] = {"exit": "Exit.png", "ff_NA": "Fast_forward_NA.png", 
+                                     "ff_off": "Fast_forward_Off.png", "ff": "Fast_Forward_On.png", 
+                                     "ff_2": "Fast_Forward_On_2.png", "pause": "Pause.png", "play": "Play.png"}
+    ICONS_FILES: dict[str, str] = {"heart": "Heart.png", "coin": "Coin.png", "player": "Player.png", "wave": "Wave.png"}
 
     # Constructor
     def __init__(self, root_directory: str) -> None:
@@ -78,15 +103,19 @@ class UI():
         """
         # SET UP WONDOW AND PYGAME
         # initialize Pygame
-        pygame.init()
+        with StartupProfiler.measure("init", "pygame.init"):
+            pygame.init()
         # set up the full-screen mode and resolution
-        self.screen: pygame.Surface = pygame.display.set_mode(self.RESOLUTION, pygame.FULLSCREEN)
+        with StartupProfiler.measure("init", "display mode"):
+            self.screen: pygame.Surface = pygame.display.set_mode(self.RESOLUTION, pygame.FULLSCREEN)
         # set the title of the window
         pygame.display.set_caption("STUDENTS DEFENSE")
 
         # INITIALIZE UTILITY VARIABLES
         # variable for menaging frame rate
         self.clock: pygame.time.Clock = pygame.time.Clock() 
+        # dirty-rectangle renderer of the gameplay screen
+        self.renderer: DirtyRects = DirtyRects(self.screen)
         # varibles for menaging user mouse input
         self.mouse_click: bool = False 
         self.pos: tuple = pygame.mouse.get_pos()
@@ -96,79 +125,107 @@ class UI():
         # audio path (in the future)
 
         # SET AND LOAD HUD ELEMENTS
-        self.font: pygame.font.Font = pygame.font.SysFont("Consolas", 50)
-        self.hp_font: pygame.font.Font = pygame.font.SysFont("Consolas", 20)
+        with StartupProfiler.measure("fonts", "Consolas (HUD)"):
+            self.font: pygame.font.Font = pygame.font.SysFont("Consolas", 50)
+            self.hp_font: pygame.font.Font = pygame.font.SysFont("Consolas", 20)
+            self.text_cache: TextCache = TextCache()
+            self.digits: DigitAtlas = DigitAtlas(self.font, (0, 0, 0))
 
         # Save root directory to an atribute
         self.directory: str = root_directory
 
-        # Frame counter for speeding up the displaying the game
-        self.frame_counter: int = 0
-
         # Default value for currently being bought tower
         self.tower_being_bought: str = None
         self.tower_being_bought_type: str = None
 
-        # Load graphics
-        self.load_gfx(root_directory)
+        # Decode graphics in the background while the intro and main menu are displayed
+        # (sprites packed into atlases are sliced from the sheets, HUD and level graphics are loaded with load_lvl,
+        # graphics of levels are queued with preload_level_gfx - by Game for the levels of the main menu)
+        AssetLoader.use_atlases(os.path.join(self.gfx_path, "Atlases"))
+        self.preload_gfx()
+        self.gfx_loaded: bool = False
+        self.overlay_gfx: pygame.Surface = None
+        self.map_gfx: pygame.Surface = None
+        self.tower_upgreades: tuple[tuple[str, str, str]] = Tower.tower_upgrades
 
         # Towers to be currently displayed in HUD
         self.HUD_towers_displayed: list[str] = [self.tower_upgreades[0][0], 
                                                  self.tower_upgreades[1][0],
                                                  self.tower_upgreades[2][0]]
 
+    def preload_gfx(self) -> None:
+        """Starts decoding graphics on a background thread - menu graphics first, then HUD graphics."""
+        paths = [os.path.join(self.gfx_path, "menu", "Menu_background.png"), 
+                 os.path.join(self.gfx_path, "menu", "Menu.png")]
+        towers_files = [name + ".png" for names in Tower.tower_upgrades for name in names]
+        for directory, files in [("HUD", [*self.BUTTONS_FILES.values(), *self.ICONS_FILES.values(), *towers_files]),
+                                 (os.path.join("HUD", "HUD_L"), [*self.BUTTONS_FILES.values(), *towers_files]),
+                                 ("context_windows", ["Message_window.png", "Info_box.png"])]:
+            paths.extend(os.path.join(self.gfx_path, directory, file) for file in files)
+        AssetLoader.preload(*paths)
+
+    def preload_level_gfx(self, 
+                          map_name: str, 
+                          bullets_names: dict = {"test_bullet": "bullet_placeholder.png"}, 
+                          enemies_names: dict = {"test_enemy": "enemy_placeholder.png"}) -> None:
+        """
+        Starts decoding graphics of a level on a background thread (map, enemies and bullets,
+        towers and projectiles too before the first level), eg. while the intro and the main menu are displayed.
+        Decoded images count against the budget of AssetLoader until load_lvl takes them.
+
+        Arguments:
+            map_name (str): The name of the map.
+            bullets_names (dict): Dictionary of bullet names and their corresponding file names (same as for load_lvl).
+            enemies_names (dict): Dictionary of enemy names and their corresponding file names (same as for load_lvl).
+        """
+        paths = [os.path.join(self.gfx_path, "maps", f"{map_name}.png")]
+        if not self.gfx_loaded:
+            paths.extend(os.path.join(self.gfx_path, "Towers", name + ".png") for names in self.tower_upgreades for name in names)
+            paths.extend(os.path.join(self.gfx_path, "bullets", proj[-1]) for proj in Tower.tower_types.values())
+        paths.extend(os.path.join(self.gfx_path, "bullets", file) for file in bullets_names.values())
+        paths.extend(os.path.join(self.gfx_path, "enemies", file) for file in enemies_names.values())
+        AssetLoader.preload(*paths)
+
     def load_gfx(self, root_directory: str) -> None:
         # Button graphics
-        # File names
-        file_names = ["Exit.png", "Fast_forward_NA.png", 
-                      "Fast_forward_Off.png", "Fast_forward_On.png", 
-                      "Fast_forward_On_2.png", "Pause.png", "Play.png"]
-        # Keys for buttons dictionaries
-        keys = ["exit", "ff_NA", "ff_off", "ff", "ff_2", "pause", "play"]
-        # Button images dict
-        self.buttons: dict = {key: pygame.image.load(os.path.join(self.gfx_path, "HUD", button))
-                                for key, button in zip(keys, file_names)}
-        self.buttons_L: dict = {key: pygame.image.load(os.path.join(self.gfx_path, "HUD", "HUD_L", button))
-                                    for key, button in zip(keys, file_names)}
+        self.buttons: dict = AssetLoader.load_all(os.path.join(self.gfx_path, "HUD"), self.BUTTONS_FILES)
+        self.buttons_L: dict = AssetLoader.load_all(os.path.join(self.gfx_path, "HUD", "HUD_L"), self.BUTTONS_FILES)
         """Buttons include: 'exit', 'ff_NA', 'ff_off', 'ff', 'ff_2', 'pause', 'play'"""
         # Interface icons
-        self.icons: dict = {"heart": pygame.image.load(os.path.join(self.gfx_path, "HUD", "Heart.png")),
-                             "coin": pygame.image.load(os.path.join(self.gfx_path, "HUD", "Coin.png")),
-                             "player": pygame.image.load(os.path.join(self.gfx_path, "HUD", "Player.png")),
-                             "wave": pygame.image.load(os.path.join(self.gfx_path, "HUD", "Wave.png"))}
+        self.icons: dict = AssetLoader.load_all(os.path.join(self.gfx_path, "HUD"), self.ICONS_FILES)
         
         # Towers graphics
-        self.tower_upgreades: tuple[tuple[str, str, str]] = Tower.tower_upgrades
         towers_names = []
         for tw in self.tower_upgreades:
             towers_names.extend(list(tw))
-        self.towers_gfx: dict = {name: pygame.image.load(os.path.join(self.gfx_path, "towers", name + ".png")) 
-                                    for name in towers_names}
-        self.towers_HUD_gfx: dict = {name: pygame.image.load(os.path.join(self.gfx_path, "HUD", name + ".png")) 
-                                        for name in towers_names}
-        self.towers_HUD_gfx_L: dict = {name: pygame.image.load(os.path.join(self.gfx_path, "HUD", "HUD_L", name + ".png")) 
-                                        for name in towers_names}
+        towers_files = {name: name + ".png" for name in towers_names}
+        self.towers_gfx: dict = AssetLoader.load_all(os.path.join(self.gfx_path, "Towers"), towers_files)
+        self.towers_HUD_gfx: dict = AssetLoader.load_all(os.path.join(self.gfx_path, "HUD"), towers_files)
+        self.towers_HUD_gfx_L: dict = AssetLoader.load_all(os.path.join(self.gfx_path, "HUD", "HUD_L"), towers_files)
         
         # Projectiles graphics
-        self.projectiles_gfx = dict({})
-        self.projectiles_gfx: dict = {proj[-1] : pygame.image.load(os.path.join(self.gfx_path, "bullets", proj[-1]))
-                                            for proj in Tower.tower_types.values() if proj[-1] not in self.projectiles_gfx}
+        self.projectiles_gfx: dict = AssetLoader.load_all(os.path.join(self.gfx_path, "bullets"), 
+                                                          {proj[-1]: proj[-1] for proj in Tower.tower_types.values()})
 
         # Context windows:
         self.chalk_font = pygame.font.Font(os.path.join(root_directory, "Assets", "Font", "Chalk.ttf"), 50)
 
+        # Messages are drawn on copies, the shared image is given back
+        message_window = AssetLoader.load(self.gfx_path, "context_windows", "Message_window.png")
+
         # Not enough gold
-        self.not_enough_gold_window = pygame.image.load(os.path.join(self.gfx_path, "context_windows", "Message_window.png"))
+        self.not_enough_gold_window = message_window.copy()
         message = self.chalk_font.render("NOT enough GOLD", False, (255, 255, 255))
         self.not_enough_gold_window.blit(message, (50, 115))
 
         #Game over
-        self.game_over_window = pygame.image.load(os.path.join(self.gfx_path, "context_windows", "Message_window.png"))
+        self.game_over_window = message_window.copy()
         message = self.chalk_font.render("Game Over", False, (255, 255, 255))
         self.game_over_window.blit(message, (165, 115))
+        AssetLoader.release(message_window)
 
         # Towers stats
-        stats_cloud = pygame.image.load(os.path.join(self.gfx_path, "context_windows", "info_box.png"))
+        stats_cloud = AssetLoader.load(self.gfx_path, "context_windows", "Info_box.png")
         stats_font = pygame.font.Font(os.path.join(root_directory, "Assets", "Font", "Chalk.ttf"), 12)
         self.stats = {}
         for name, stats in Tower.tower_types.items():
@@ -199,9 +256,10 @@ class UI():
                 y += 20
 
             self.stats[name] = stats_cloud_temp
+        AssetLoader.release(stats_cloud)
 
     # Input
-    def process_input(self, map: mp, player: Player) -> bool:
+    def process_input(self, map: mp, player: Player, simulation: Simulation) -> bool:
         """
         Processes user input from the keyboard and mouse.
 
@@ -212,6 +270,7 @@ class UI():
         s:
             map (mp): The current game map.
             player (Player): The player instance.
+            simulation (Simulation): The game world, towers are placed and upgraded through it (so they get into the replay).
 
         Returns:
             bool: True if the game should terminate, False otherwise.
@@ -227,13 +286,18 @@ class UI():
             # Handle key press
             elif event.type == pygame.KEYDOWN:
 
+                # Toggle frame profiler overlay
+                if event.key == pygame.K_F3:
+                    FrameProfiler.toggle()
+                    self.overlay_gfx = None
+
                 # Cancel any action (like upgrading towers)
-                if event.key == pygame.K_ESCAPE:
+                elif event.key == pygame.K_ESCAPE:
                     self.HUD_towers_displayed = [self.tower_upgreades[0][0],
                                                  self.tower_upgreades[1][0],
                                                  self.tower_upgreades[2][0]]
                     for state in UI.state.keys():
-                        if state not in ["pause", "wave", "speed up", "speed up more", "game over"]:
+                        if state not in ["pause", "wave", "speed up", "speed up more", "max speed", "game over"]:
                             UI.state[state] = False
 
             # mouse press (release)
@@ -266,6 +330,9 @@ class UI():
                         UI.state["speed up more"] = True
                     elif UI.state["speed up more"]:
                         UI.state["speed up more"] = False
+                        UI.state["max speed"] = True
+                    elif UI.state["max speed"]:
+                        UI.state["max speed"] = False
                     elif UI.state["wave"]:
                         UI.state["speed up"] = True
 
@@ -273,13 +340,13 @@ class UI():
                 if not UI.state["upgrade tower"]:
                     self.upgraded_tower = None
                 if x > 980:
-                    self.buy_tower_mode(self.HUD_towers_displayed[2], player, Coord.res2tile(self.pos), tower = self.upgraded_tower)
+                    self.buy_tower_mode(self.HUD_towers_displayed[2], player, Coord.res2tile(self.pos), tower = self.upgraded_tower, simulation = simulation)
                 elif x > 740:
-                    self.buy_tower_mode(self.HUD_towers_displayed[1], player, Coord.res2tile(self.pos), tower = self.upgraded_tower)
+                    self.buy_tower_mode(self.HUD_towers_displayed[1], player, Coord.res2tile(self.pos), tower = self.upgraded_tower, simulation = simulation)
                 elif x > 500:
                     # Avoid "upgrading" tower into itself
                     if not UI.state["upgrade tower"]:
-                        self.buy_tower_mode(self.HUD_towers_displayed[0], player, Coord.res2tile(self.pos), tower = self.upgraded_tower)
+                        self.buy_tower_mode(self.HUD_towers_displayed[0], player, Coord.res2tile(self.pos), tower = self.upgraded_tower, simulation = simulation)
 
             # Click at map
             else:
@@ -291,9 +358,7 @@ class UI():
                     if map.tile_accessibility(tile):
                         # whether enough money
                         if self.tower_being_bought in player.affordable_towers():
-                            map.grid[tile.y][tile.x] = False
-                            Tower_Manager(self.tower_being_bought, Coord(x, y))
-                            player.gold -= Tower.tower_types[self.tower_being_bought][7]
+                            simulation.place_tower(self.tower_being_bought, tile)
                         # not enough money
                         else:
                             UI.state["not enough gold"] = True
@@ -350,16 +415,25 @@ class UI():
     # Menus
     def intro(self) -> None:
         """Display the intro screen."""
-        background = pygame.image.load(os.path.join(self.gfx_path, "menu", "Menu_background.png"))
-        main_menu_graphic = pygame.image.load(os.path.join(self.gfx_path, "menu", "Menu.png")).convert_alpha()
+        background = AssetLoader.load(self.gfx_path, "menu", "Menu_background.png", alpha=False)
+        # (copy, as fading in changes alpha of the surface)
+        menu_graphic = AssetLoader.load(self.gfx_path, "menu", "Menu.png", alpha=False)
+        main_menu_graphic = menu_graphic.copy()
 
         self.screen.blit(background, (0, 0))
         for i in range(40):
             main_menu_graphic.set_alpha(i)
             self.screen.blit(main_menu_graphic, (0, 0))
             pygame.display.update()
+            if not i:
+                StartupProfiler.mark("first intro frame")
             self.clock.tick(self.FPS//5)
 
+        # Release graphics (they stay cached for the main menu)
+        AssetLoader.release(background, menu_graphic)
+        # Drawn outside the renderer - next frame of a level redraws the whole screen
+        self.renderer.invalidate()
+
     def main_menu(self, player : Player) -> str:
         """
         Displays the main menu and handles user input, 
@@ -373,83 +447,91 @@ class UI():
             str: "start" if the start button is pressed, 
                   "quit" if the quit button is pressed
         """
-        # Load background graphic
-        main_menu_graphic = pygame.image.load(os.path.join(self.gfx_path, "menu", "Menu.png"))
+        # Load background graphic and font
+        main_menu_graphic = AssetLoader.load(self.gfx_path, "menu", "Menu.png", alpha=False)
+        with StartupProfiler.measure("fonts", "Chalk (menu)"):
+            self.name_font = pygame.font.Font(os.path.join(self.directory, "Assets", "Font", "Chalk.ttf"), 20)
 
         pygame.event.clear()
         self.mouse_click = False
 
-        # Main menu loop
-        while True:
+        # Main menu loop (menu graphic is released when leaving the menu)
+        try:
+            while True:
             
-            # Display background graphic
-            self.screen.blit(main_menu_graphic, (0, 0))
-
-            # Display player name
-            self.name_font = pygame.font.Font(os.path.join(self.directory, "Assets", "Font", "Chalk.ttf"), 20)
-            name_text = self.name_font.render(player.name, False, (255, 255, 255))
-            # Center the rectangle beneth the profile picture
-            text_rect = name_text.get_rect()
-            text_rect.center = (80, 180)
-            # Blit the text
-            self.screen.blit(name_text, text_rect)
-
-            # HANDLE EVENTS (eg. key press)
-            for event in pygame.event.get():
+                # Display background graphic
+                self.screen.blit(main_menu_graphic, (0, 0))
+
+                # Display player name
+                name_text = self.name_font.render(player.name, False, (255, 255, 255))
+                # Center the rectangle beneth the profile picture
+                text_rect = name_text.get_rect()
+                text_rect.center = (80, 180)
+                # Blit the text
+                self.screen.blit(name_text, text_rect)
+
+                # HANDLE EVENTS (eg. key press)
+                for event in pygame.event.get():
                 
-                # Quit game if window is being closed
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-
-                # Mouse press (relise)
-                elif event.type == pygame.MOUSEBUTTONUP:
-                    self.mouse_click = True
-                    self.pos = pygame.mouse.get_pos()
-
-            # PROCESS INTERACTION
-            if self.mouse_click:
-                x, y = self.pos
-                # Play and quit buttons
-                if 840 < x < 1080:
-                    # Demo button pressed
-                    if 180 < y < 324:
-                        return "demo"
+                    # Quit game if window is being closed
+                    if event.type == pygame.QUIT:
+                        pygame.quit()
+                        sys.exit()
+
+                    # Mouse press (relise)
+                    elif event.type == pygame.MOUSEBUTTONUP:
+                        self.mouse_click = True
+                        self.pos = pygame.mouse.get_pos()
+
+                # PROCESS INTERACTION
+                if self.mouse_click:
+                    x, y = self.pos
+                    # Play and quit buttons
+                    if 840 < x < 1080:
+                        # Demo button pressed
+                        if 180 < y < 324:
+                            return "demo"
                     
-                    # Truancy button pressed
+                        # Truancy button pressed
 
-                    if 342 < y < 486:
-                        return "truancy"
+                        if 342 < y < 486:
+                            return "truancy"
                     
-                # Quit button pressed
-                if (880 < y < 1080) and (1640 < x < 1840):
-                    return "quit"
+                    # Quit button pressed
+                    if (880 < y < 1080) and (1640 < x < 1840):
+                        return "quit"
                 
-                # Name change
-                elif x < 170:
-                    if y < 220:
-                        player.name = self.handle_name_change(player.name, main_menu_graphic)
+                    # Name change
+                    elif x < 170:
+                        if y < 220:
+                            player.name = self.handle_name_change(player.name, main_menu_graphic)
                         
-                # High Scores
-                elif x > 1750:
-                    if y < 220:
-                        self.high_scores()
+                    # High Scores
+                    elif x > 1750:
+                        if y < 220:
+                            self.high_scores()
                 
-            self.mouse_click = False
+                self.mouse_click = False
                 
-            # Update pygame and clock every 60'th of a secound
-            pygame.display.flip()
-            self.clock.tick(self.FPS)
+                # Update pygame and clock every 60'th of a secound
+                pygame.display.flip()
+                StartupProfiler.finish("first main menu frame")
+                self.clock.tick(self.FPS)
+        finally:
+            AssetLoader.release(main_menu_graphic)
+            # Menu (name change and high scores too) is drawn outside the renderer - next frame of a level redraws the whole screen
+            self.renderer.invalidate()
+
 
     def outro(self) -> None:
         """Display the outro screen (roll credits and display end grphic)."""
         # Get background image
-        background = pygame.image.load(os.path.join(self.gfx_path, "menu", "Menu_background.png"))
+        background = AssetLoader.load(self.gfx_path, "menu", "Menu_background.png", alpha=False)
         # Get fonts
         small_font = pygame.font.Font(os.path.join(self.directory, "Assets", "Font", "Chalk.ttf"), 45)
         large_font = pygame.font.Font(os.path.join(self.directory, "Assets", "Font", "Chalk.ttf"), 100)
         # Get final screen graphic
-        final = pygame.image.load(os.path.join(self.gfx_path, "menu", "the_end.png"))
+        final = AssetLoader.load(self.gfx_path, "menu", "the_end.png", alpha=False)
 
         # Main credit loop
         rolling = True
@@ -475,6 +557,11 @@ class UI():
         pygame.display.update()
         pygame.time.delay(2000)
 
+        # Release graphics
+        AssetLoader.release(background, final)
+        # Drawn outside the renderer - next frame redraws the whole screen
+        self.renderer.invalidate()
+
     def high_scores(self) -> None:
         """
         Loads High Scores from file and displays them.
@@ -486,9 +573,9 @@ class UI():
         records_width = 45
 
         # Blit background image
-        self.screen.blit(pygame.image.load(os.path.join(self.gfx_path, 
-                                                        "menu", "high_scores_background.png")), 
-                                                            (0, 0))
+        background = AssetLoader.load(self.gfx_path, "menu", "high_scores_background.png", alpha=False)
+        self.screen.blit(background, (0, 0))
+        AssetLoader.release(background)
 
         # Blit exit instructions
         self.screen.blit(self.font.render("Press escape to exit High Scores", False, (50, 50, 50)), (570, 180))
@@ -519,47 +606,57 @@ class UI():
     def update(self, gold : int, lives : int, enemies : list, map : mp) -> None:
         """
         Updates and renders the game state(game background, towers, enemies, and HUD elements on the screen)
+        Only regions under sprites of the previous and current frame are redrawn and updated (see DirtyRects).
 
         Arguments:
             gold (int): The current amount of gold the player has.
             lives (int): The current number of lives the player has.
             enemies (list): A list of active enemies to display on the screen.
         """
-        # If speed up (speed up more) state active, ommit every three (four) out of four (five) frames
-        if UI.state["speed up"]:
-            if self.skip_frames(3):
-                return 
-        
-        elif UI.state["speed up more"]:
-            if self.skip_frames(8):
-                return
-
+        start = perf_counter()
         # DRAW ELEMENTS
-        # background
-        self.screen.blit(self.map_gfx, (0, 0))
-
-        for tower in Tower_Manager.towers:
-            self.screen.blit(self.towers_gfx[tower.tower_type.tower_asset[:-4]], tower.display_pos)
+        # background - map with towers (restored only under sprites of the previous frame)
+        if self.static_layer_version != Tower_Manager.layout_version:
+            self.build_static_layer()
+        self.renderer.begin()
 
         if UI.state["wave"]:
             self.enemies : list[EnemyManager] = enemies
             for enemy in self.enemies:
-                self.screen.blit(self.enemies_gfx[enemy.name], enemy.display_pos)
-                enemy.hp_display = self.hp_font.render(f"{enemy.life}", False, (255, 0, 0))
-                self.screen.blit(enemy.hp_display, enemy.display_pos)
+                self.renderer.blit(self.enemies_gfx[enemy.name], enemy.display_pos)
+                enemy.hp_display = self.text_cache.render(self.hp_font, f"{enemy.life}", (255, 0, 0))
+                self.renderer.blit(enemy.hp_display, enemy.display_pos)
                 if enemy.attacked:
-                    self.screen.blit(self.bullets_gfx["test_bullet"], enemy.display_pos)
+                    self.renderer.blit(self.bullets_gfx["test_bullet"], enemy.display_pos)
         # projectiles
-        for projectile in Projectiles.displayed:
-            self.screen.blit(self.projectiles_gfx[projectile.asset],projectile.display_pos)
+        for asset, display_pos in Projectiles.displayed():
+            self.renderer.blit(self.projectiles_gfx[asset], display_pos)
 
         # HUD
+        hud_start = perf_counter()
         self.hud(gold, lives, map)
-
-        # UPDATE SCREEN
-        pygame.display.flip()
+        # frame profiler overlay (toggled with F3)
+        if FrameProfiler.enabled:
+            self.profiler_overlay()
+        hud_end = perf_counter()
+
+        # UPDATE SCREEN (only changed regions)
+        self.renderer.end()
+        FrameProfiler.add("render", hud_start - start)
+        FrameProfiler.add("hud", hud_end - hud_start)
+        FrameProfiler.add("present", perf_counter() - hud_end)
         self.clock.tick(self.FPS)
 
+    def profiler_overlay(self) -> None:
+        """Draws the table of FrameProfiler percentiles in the top left corner (redrawn every half a second)."""
+        if self.overlay_gfx is None or FrameProfiler.count % (self.FPS // 2) == 0:
+            lines = [self.hp_font.render(line, False, (255, 255, 255)) for line in FrameProfiler.report()]
+            self.overlay_gfx = pygame.Surface((max(line.get_width() for line in lines) + 10, 20 * len(lines) + 10))
+            self.overlay_gfx.set_alpha(200)
+            for i, line in enumerate(lines):
+                self.overlay_gfx.blit(line, (5, 5 + 20 * i))
+        self.renderer.blit(self.overlay_gfx, (0, 0))
+
     def hud(self, gold : int, lives : int, map : mp) -> None:
         """
         Displays the HUD (heads-up display) elements on the screen.
@@ -591,24 +688,24 @@ class UI():
                 hover = "tower 0"
 
         # Player name
-        self.screen.blit(self.icons["player"],(20,845))
-        self.screen.blit(self.font.render(f"{self.player_name}", False, (0, 0, 0)), (100, 845))
+        self.renderer.blit(self.icons["player"],(20,845))
+        self.renderer.blit(self.text_cache.render(self.font, f"{self.player_name}", (0, 0, 0)), (100, 845))
         # Player money
-        self.screen.blit(self.icons["coin"],(20,905))
-        self.screen.blit(self.font.render(f"{gold}", False, (0, 0, 0)), (100, 905))
+        self.renderer.blit(self.icons["coin"],(20,905))
+        self.digits.draw(self.renderer.blit, gold, (100, 905))
         # Lives
-        self.screen.blit(self.icons["heart"],(20,965))
-        self.screen.blit(self.font.render(f"{lives}", False, (0, 0, 0)), (100, 965))
+        self.renderer.blit(self.icons["heart"],(20,965))
+        self.digits.draw(self.renderer.blit, lives, (100, 965))
         # Wave number
-        self.screen.blit(self.icons["wave"],(20,1025))
-        self.screen.blit(self.font.render(f"{self.current_wave}/{self.number_of_waves}", False, (0, 0, 0)), (100, 1030))
+        self.renderer.blit(self.icons["wave"],(20,1025))
+        self.digits.draw(self.renderer.blit, f"{self.current_wave}/{self.number_of_waves}", (100, 1030))
         
         # Buttons
         # Exit
         if hover == "exit":
-            self.screen.blit(self.buttons_L["exit"], (1700, 860))
+            self.renderer.blit(self.buttons_L["exit"], (1700, 860))
         else:
-            self.screen.blit(self.buttons["exit"], (1710, 870))
+            self.renderer.blit(self.buttons["exit"], (1710, 870))
 
         # Play / Pause
         if UI.state["wave"] and not UI.state["pause"]:
@@ -616,9 +713,9 @@ class UI():
         else:
             temp_key = "play"
         if hover == "play":
-            self.screen.blit(self.buttons_L[temp_key], (1460, 860))
+            self.renderer.blit(self.buttons_L[temp_key], (1460, 860))
         else:
-            self.screen.blit(self.buttons[temp_key], (1470, 870))
+            self.renderer.blit(self.buttons[temp_key], (1470, 870))
 
         # Speed
         but = self.buttons_L if hover == "speed up" else self.buttons
@@ -626,34 +723,34 @@ class UI():
         if UI.state["wave"]:
             if UI.state["speed up"]:
                 button_helper = but["ff"]
-            elif UI.state["speed up more"]:
+            elif UI.state["speed up more"] or UI.state["max speed"]:
                 button_helper = but["ff_2"]
             else:
                 button_helper = but["ff_off"]
         else:
             button_helper = but["ff_NA"]
         # Blit proper button
-        self.screen.blit(button_helper, position)
+        self.renderer.blit(button_helper, position)
 
         # Towers - HUD
         # Left
         if hover == "tower 0":
-            self.screen.blit(self.towers_HUD_gfx_L[self.HUD_towers_displayed[0]], (500, 860))
-            self.screen.blit(self.stats[self.HUD_towers_displayed[0]], (480, 600))
+            self.renderer.blit(self.towers_HUD_gfx_L[self.HUD_towers_displayed[0]], (500, 860))
+            self.renderer.blit(self.stats[self.HUD_towers_displayed[0]], (480, 600))
         else:
-            self.screen.blit(self.towers_HUD_gfx[self.HUD_towers_displayed[0]], (510, 870))
+            self.renderer.blit(self.towers_HUD_gfx[self.HUD_towers_displayed[0]], (510, 870))
         # Center ( PLACEHOLDER, Add new towers )
         if hover == "tower 1":
-            self.screen.blit(self.towers_HUD_gfx_L[self.HUD_towers_displayed[1]], (740, 860))
-            self.screen.blit(self.stats[self.HUD_towers_displayed[1]], (720, 600))
+            self.renderer.blit(self.towers_HUD_gfx_L[self.HUD_towers_displayed[1]], (740, 860))
+            self.renderer.blit(self.stats[self.HUD_towers_displayed[1]], (720, 600))
         else:
-            self.screen.blit(self.towers_HUD_gfx[self.HUD_towers_displayed[1]], (750, 870))
+            self.renderer.blit(self.towers_HUD_gfx[self.HUD_towers_displayed[1]], (750, 870))
         # Riht ( PLACEHOLDER, Add new towers)
         if hover == "tower 2":
-            self.screen.blit(self.towers_HUD_gfx_L[self.HUD_towers_displayed[2]], (980, 860))
-            self.screen.blit(self.stats[self.HUD_towers_displayed[2]], (960, 600))
+            self.renderer.blit(self.towers_HUD_gfx_L[self.HUD_towers_displayed[2]], (980, 860))
+            self.renderer.blit(self.stats[self.HUD_towers_displayed[2]], (960, 600))
         else:
-            self.screen.blit(self.towers_HUD_gfx[self.HUD_towers_displayed[2]], (990, 870))
+            self.renderer.blit(self.towers_HUD_gfx[self.HUD_towers_displayed[2]], (990, 870))
         
         # Placing towers
         if UI.state["buy tower"]:
@@ -661,11 +758,11 @@ class UI():
             self.accessibility_rectangle(120, map)
 
         if UI.state["not enough gold"]:
-            self.screen.blit(self.not_enough_gold_window, (644, 300))
+            self.renderer.blit(self.not_enough_gold_window, (644, 300))
 
         # Losing game
         if UI.state["game over"]:
-            self.screen.blit(self.game_over_window, (644, 300))
+            self.renderer.blit(self.game_over_window, (644, 300))
 
     # Additional methods
     def load_lvl(self, 
@@ -690,12 +787,23 @@ class UI():
             bullets_names (dict): Dictionary of bullet names and their corresponding file names. Defaults to {"test_bullet": "bullet_placeholder.png"}.
             enemies_names (dict): Dictionary of enemy names and their corresponding file names. Defaults to {"test_enemy": "enemy_placeholder.png"}.
         """
+        # Level graphics not preloaded yet are decoded in the background while HUD graphics are loaded
+        self.preload_level_gfx(map_name, bullets_names, enemies_names)
+
+        # HUD graphics (loaded with the first level, decoded while the intro and main menu are displayed)
+        if not self.gfx_loaded:
+            self.load_gfx(self.directory)
+            self.gfx_loaded = True
+
+        # Release graphics of the previous level (they stay cached for restarts of the level)
+        if self.map_gfx is not None:
+            AssetLoader.release(self.map_gfx, *self.bullets_gfx.values(), *self.enemies_gfx.values())
+
         # Load graphics
-        self.map_gfx = pygame.image.load(os.path.join(self.gfx_path, "maps", f"{map_name}.png"))
-        self.bullets_gfx: dict = {name: pygame.image.load(os.path.join(self.gfx_path, "bullets", file))
-                                    for name, file in bullets_names.items()}  
-        self.enemies_gfx : dict = {name: pygame.image.load(os.path.join(self.gfx_path, "enemies", file))
-                                    for name, file in enemies_names.items()}
+        self.map_gfx = AssetLoader.load(self.gfx_path, "maps", f"{map_name}.png", alpha=False)
+        self.build_static_layer()
+        self.bullets_gfx: dict = AssetLoader.load_all(os.path.join(self.gfx_path, "bullets"), bullets_names)
+        self.enemies_gfx: dict = AssetLoader.load_all(os.path.join(self.gfx_path, "enemies"), enemies_names)
         
         # Set remaining atributes
         self.number_of_waves = number_of_waves
@@ -703,6 +811,14 @@ class UI():
         self.player_name = player_name if len(player_name) < 20 else player_name[:17] + "..."
         self.player_name_gfx = self.font.render("Player:  " + player_name, False, (0, 0, 0))
 
+    def build_static_layer(self) -> None:
+        """Pre-renders the static layer (map with placed towers) and sets it as the background of the renderer."""
+        self.static_layer = self.map_gfx.copy()
+        for tower in Tower_Manager.towers:
+            self.static_layer.blit(self.towers_gfx[tower.tower_type.tower_asset[:-4]], tower.display_pos)
+        self.static_layer_version = Tower_Manager.layout_version
+        self.renderer.set_background(self.static_layer)
+
     def handle_name_change(self, current_player_name: str, background: pygame.image) -> str:
         """
         Displays input box for user to input new name and updates it live while user is typing.
@@ -755,30 +871,19 @@ class UI():
                                      self.tower_upgreades[1][0],
                                      self.tower_upgreades[2][0]]
 
-    def skip_frames(self, num_of_frames_2_skip: int) -> bool:
+    def simulation_speed(self) -> int:
         """
-        Increments an internal frame counter each time it is called. If the counter is less than 
-        `num_of_frames_2_skip`, the function will return True, indicating the frame should be skipped. Once the counter 
-        reaches `num_of_frames_2_skip`, it is reset to zero and the function returns False, indicating the frame 
-        should not be skipped and processing should take place.
-
-        Parametrs:
-            num_of_frames_2_skip (int): The number of frames to skip before processing a frame. This value determines
-                                    how frequently the frames are processed (e.g., if set to 3, every 4th frame 
-                                    will be processed).
+        Returns number of simulated frames per displayed frame based on the speed up states.
 
         Returns:
-            bool: Returns True if the current frame should be skipped, False if it should be processed.
+            int: 1 for normal speed, UI.SPEEDS value for speed up states (None for as fast as possible).
         """
-        self.frame_counter += 1
-        # Ommit frame three times out of four
-        if self.frame_counter < num_of_frames_2_skip:
-            return True
-        # Fourth frame, restart frame counter and execute the function
-        self.frame_counter = 0
-        return False
+        for state, speed in UI.SPEEDS.items():
+            if UI.state[state]:
+                return speed
+        return 1
     
-    def buy_tower_mode(self, tower_name: str, player: Player, tower_coord : Coord = None, tower: Tower_Manager = None) -> None:
+    def buy_tower_mode(self, tower_name: str, player: Player, tower_coord : Coord = None, tower: Tower_Manager = None, simulation: Simulation = None) -> None:
         """
         Handles interactions with the tower HUD, managing tower selection and purchasing logic.
 
@@ -786,12 +891,17 @@ class UI():
             tower_name (str): Name of the tower that was clicked.
             player (Player): Player object, to check for affordability.
             tower_coord (Coord): Tile coordinates of the tower to be upgreaded.
+            tower (Tower_Manager): Tower to be upgraded.
+            simulation (Simulation): The game world the tower is upgraded in.
         """
         # Wheter upgrading or setting base tower
         # Upgrade case
         if UI.state["upgrade tower"]:
-            tower.upgrade(tower_name)
-            player.gold -= Tower(tower_name).cost
+            # not enough money for a valid upgrade
+            if tower_name in Tower.upgrades(tower.tower_type.tower_name) and tower_name not in player.affordable_towers():
+                UI.state["not enough gold"] = True
+            else:
+                simulation.upgrade_tower(Coord.res2tile(tuple(tower.pos)), tower_name)
             UI.state["upgrade tower"] = False
             self.HUD_towers_displayed = [self.tower_upgreades[0][0],
                                          self.tower_upgreades[1][0],
@@ -850,7 +960,7 @@ class UI():
                             border_radius=int(tile_size / 5))  # Adjust border radius here
 
             # Draw the temporary surface onto the main screen at the specified position
-            self.screen.blit(temp_surface, (x + path_cut, y + path_cut))
+            self.renderer.blit(temp_surface, (x + path_cut, y + path_cut))
 
             return accessible
 
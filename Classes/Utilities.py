@@ -5,6 +5,7 @@ and helper functions to ensure consistency and reusability of code.
 
 Classes:
     Coord - Represents a point in 2D coordinate space with operations for basic arithmetic. Designed to standardize tile coordinates and screen coordinates
+    EntityList - Container of game entities with O(1) deferred removal, safe to iterate while entities are removed.
     InputBox - Represents an input box in the game, provides functionality for creating an input box that can handle user input.
 
 Functions:
@@ -17,8 +18,11 @@ Functions:
 
 #IMPORTS
 from dataclasses import dataclass
-import typing, pygame, os
+import typing, os
 from math import ceil
+# pygame is imported where it's used (InputBox), so headless modules (simulation, tools) don't load it
+if typing.TYPE_CHECKING:
+    import pygame
 
 
 # CLASSES
@@ -135,6 +139,104 @@ class Coord:
     def ceiling(self) -> 'Coord':
         return Coord(ceil(self.x),ceil(self.y))
 
+class EntityList:
+    """
+    A container of game entities (towers, explosions) that can be safely iterated while entities are removed.
+
+    Every entity occupies a slot and is referred to by a handle - a (slot, generation) pair.
+    Removal is O(1) and deferred: the entity disappears from iteration at once, but its slot is
+    released for reuse only by flush() (called by the owner once per frame, after all iteration is done).
+    Generation of a slot is increased on every removal, so stale handles of removed entities are recognized.
+
+    Attributes:
+        items (list): Entities in their slots (None for empty slots).
+        generations (list[int]): Current generation of every slot.
+
+    Methods:
+        add(item) -> tuple[int, int]: Adds an entity, returns its handle.
+        remove(handle: tuple[int, int]) -> bool: Removes the entity (if the handle is not stale).
+        get(handle: tuple[int, int]): Returns the entity referred to by the handle (None if it was removed).
+        flush() -> None: Releases slots of removed entities for reuse.
+        clear() -> None: Removes all entities.
+        handles() -> Generator[tuple[tuple[int, int], object]]: Yields handles and entities in slot order.
+        __iter__() -> Generator: Yields entities in slot order.
+        __len__() -> int: Returns number of entities.
+    """
+
+    def __init__(self) -> None:
+        """Creates an empty container."""
+        self.items: list = []
+        self.generations: list[int] = []
+        self._free: list[int] = []
+        self._removed: list[int] = []
+        self._count: int = 0
+
+    def add(self, item) -> tuple[int, int]:
+        """Adds an entity (into a released slot if there is one) and returns its handle."""
+        if self._free:
+            slot = self._free.pop()
+            self.items[slot] = item
+        else:
+            slot = len(self.items)
+            self.items.append(item)
+            self.generations.append(0)
+        self._count += 1
+        return slot, self.generations[slot]
+
+    def remove(self, handle: tuple[int, int]) -> bool:
+        """
+        Removes the entity referred to by the handle (its slot is released by the next flush()).
+
+        Returns:
+            bool: False if the handle is stale (entity has already been removed).
+        """
+        slot, generation = handle
+        if self.generations[slot] != generation or self.items[slot] is None:
+            return False
+        self.items[slot] = None
+        self.generations[slot] += 1
+        self._removed.append(slot)
+        self._count -= 1
+        return True
+
+    def get(self, handle: tuple[int, int]):
+        """Returns the entity referred to by the handle (None if it has been removed)."""
+        slot, generation = handle
+        return self.items[slot] if self.generations[slot] == generation else None
+
+    def flush(self) -> None:
+        """Releases slots of removed entities for reuse."""
+        # Lowest slots are reused first
+        self._free.extend(self._removed)
+        self._free.sort(reverse=True)
+        self._removed.clear()
+
+    def clear(self) -> None:
+        """Removes all entities (handles of all of them become stale)."""
+        for slot, item in enumerate(self.items):
+            if item is not None:
+                self.remove((slot, self.generations[slot]))
+        self.flush()
+
+    def handles(self) -> typing.Generator[tuple[tuple[int, int], object], None, None]:
+        """Yields handles and entities in slot order (entities removed during iteration are skipped)."""
+        items, generations = self.items, self.generations
+        for slot in range(len(items)):
+            if items[slot] is not None:
+                yield (slot, generations[slot]), items[slot]
+
+    def __iter__(self) -> typing.Generator:
+        """Yields entities in slot order (entities removed during iteration are skipped)."""
+        items = self.items
+        for slot in range(len(items)):
+            if items[slot] is not None:
+                yield items[slot]
+
+    def __len__(self) -> int:
+        """Returns number of entities."""
+        return self._count
+
+
 class InputBox:
     """
     A class to represent an input box in the game.
@@ -163,7 +265,7 @@ class InputBox:
                  color_active : tuple[int, int, int] = (100, 50, 0),
                  color_inactive : tuple[int, int, int] = (0, 0, 0),
                  display_box : bool = False,
-                 font : pygame.font = None,
+                 font : 'pygame.font.Font' = None,
                  activate = False) -> None:
         """
         Initialize an InputBox instance.
@@ -180,6 +282,7 @@ class InputBox:
             font (pygame.font): The font used to render the text (default is pygame.font.Font(None, 32)).
             activate (bool): Wheter the input box should be active when initialized (default is False).
         """
+        import pygame
         if font is None:
             self.font = pygame.font.Font(None, 32)
         else: 
@@ -193,7 +296,7 @@ class InputBox:
         self.txt_surface = self.font.render(text, True, self.current_color)
         self.display_box = display_box
 
-    def handle_event(self, event : pygame.event) -> None:
+    def handle_event(self, event : 'pygame.event.Event') -> None:
         """
         Handle input events for the input box.
 
@@ -203,6 +306,7 @@ class InputBox:
         Parameters:
             event (pygame.event.EventType): The event to handle.
         """
+        import pygame
         if event.type == pygame.MOUSEBUTTONDOWN:
             # If the user clicked on the input_box rect.
             if self.rect.collidepoint(event.pos):
@@ -234,7 +338,7 @@ class InputBox:
         # Change the current color of the input box.
         self.current_color = self.color_active if self.active else self.color_inactive
 
-    def draw(self, screen : pygame.Surface) -> None:
+    def draw(self, screen : 'pygame.Surface') -> None:
         """
         Draw the input box on the screen.
 
@@ -243,6 +347,7 @@ class InputBox:
         Parameters:
             screen (pygame.Surface): The surface on which to draw the input box.
         """
+        import pygame
         # Blit the text.
         screen.blit(self.txt_surface, (self.rect.x+5, self.rect.y+5))
         # Blit the rect.
@@ -0,0 +1,153 @@
+import os
+import shutil
+import tempfile
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+import unittest
+from Classes.UI.Asset_Loader import AssetLoader
+from Classes.UI.UI import UI
+from Classes.Map_generator.assets_builder import build_atlases
+from Classes.Game.Game import Game
+from Classes.Enemy.Enemy import Enemy
+from types import SimpleNamespace
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+GFX_DIRECTORY = os.path.join(ROOT_DIRECTORY, "Assets", "gfx")
+
+
+def test_images_are_converted_once():
+    pygame.display.init()
+    screen = pygame.display.set_mode((200, 100))
+    AssetLoader.clear()
+    map_gfx = AssetLoader.load(GFX_DIRECTORY, "maps", "Truancy.png", alpha=False)
+    coin = AssetLoader.load(GFX_DIRECTORY, "HUD", "Coin.png")
+    assert map_gfx.get_bitsize() == screen.get_bitsize() and not map_gfx.get_flags() & pygame.SRCALPHA
+    assert coin.get_flags() & pygame.SRCALPHA
+    assert AssetLoader.load(GFX_DIRECTORY, "maps", "Truancy.png", alpha=False) is map_gfx
+    assert len(AssetLoader.surfaces) == 2
+
+def test_ui_rebuild_reuses_assets():
+    UI(ROOT_DIRECTORY).load_lvl(map_name="Truancy", enemies_names={"Mati": "Mati.png"})
+    loaded = dict(AssetLoader.surfaces)
+    ui = UI(ROOT_DIRECTORY)
+    ui.load_lvl(map_name="Truancy", enemies_names={"Mati": "Mati.png"})
+    assert AssetLoader.surfaces == loaded
+    assert ui.enemies_gfx["Mati"] is loaded[(os.path.join(GFX_DIRECTORY, "enemies", "Mati.png"), True)]
+
+def test_copied_context_windows_are_released():
+    AssetLoader.clear()
+    UI(ROOT_DIRECTORY).load_lvl(map_name="Truancy", enemies_names={"Mati": "Mati.png"})
+    # Messages and tower stats are drawn on copies, so the shared images are not kept referenced
+    for file in ["Message_window.png", "Info_box.png"]:
+        assert AssetLoader.references[(os.path.join(GFX_DIRECTORY, "context_windows", file), True)] == 0
+
+def test_unreferenced_assets_are_evicted_over_budget():
+    pygame.display.init()
+    pygame.display.set_mode((200, 100))
+    AssetLoader.clear()
+    budget, AssetLoader.budget = AssetLoader.budget, 10 * 2**20
+    try:
+        menu = AssetLoader.load(GFX_DIRECTORY, "menu", "Menu.png", alpha=False)
+        AssetLoader.release(menu)
+        # Released but within budget - stays cached
+        assert AssetLoader.load(GFX_DIRECTORY, "menu", "Menu.png", alpha=False) is menu
+        AssetLoader.release(menu)
+        background = AssetLoader.load(GFX_DIRECTORY, "menu", "Menu_background.png", alpha=False)
+        # Over budget - the unreferenced menu is evicted, the referenced background is kept
+        assert list(AssetLoader.surfaces.values()) == [background]
+        assert AssetLoader.memory == background.get_pitch() * background.get_height()
+        final = AssetLoader.load(GFX_DIRECTORY, "menu", "the_end.png", alpha=False)
+        assert len(AssetLoader.surfaces) == 2 and AssetLoader.references[next(iter(AssetLoader.surfaces))] == 1
+        AssetLoader.release(background, final)
+        assert list(AssetLoader.surfaces.values()) == [final]
+    finally:
+        AssetLoader.budget = budget
+
+def test_sprites_are_sliced_from_atlases():
+    pygame.display.init()
+    pygame.display.set_mode((200, 100))
+    AssetLoader.clear()
+    budget, AssetLoader.budget = AssetLoader.budget, 0
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            build_atlases(GFX_DIRECTORY, output_dir=directory)
+            assert AssetLoader.use_atlases(directory, GFX_DIRECTORY)
+            # Packed sprites are identical to their source files
+            for path in AssetLoader.atlas_index:
+                sprite = AssetLoader.load(path)
+                assert sprite.get_parent() is not None
+                source = pygame.image.load(path).convert_alpha()
+                assert pygame.image.tobytes(sprite, "RGBA") == pygame.image.tobytes(source, "RGBA"), path
+                AssetLoader.release(sprite)
+        # Unreferenced sprites and then their sheets are evicted
+        assert not AssetLoader.surfaces and AssetLoader.memory == 0
+    finally:
+        AssetLoader.budget = budget
+        AssetLoader.use_atlases(os.path.join(GFX_DIRECTORY, "Atlases"))
+
+def test_changed_sprites_are_loaded_from_their_files():
+    with tempfile.TemporaryDirectory() as directory:
+        gfx_directory = os.path.join(directory, "gfx")
+        shutil.copytree(os.path.join(GFX_DIRECTORY, "bullets"), os.path.join(gfx_directory, "bullets"))
+        build_atlases(gfx_directory, {"sprites": ["bullets"]})
+        changed = os.path.join(gfx_directory, "bullets", sorted(os.listdir(os.path.join(gfx_directory, "bullets")))[0])
+        os.utime(changed, ns=(0, 0))
+        try:
+            assert AssetLoader.use_atlases(os.path.join(gfx_directory, "Atlases"))
+            assert changed not in AssetLoader.atlas_index and len(AssetLoader.atlas_index) == len(os.listdir(os.path.dirname(changed))) - 1
+        finally:
+            AssetLoader.use_atlases(os.path.join(GFX_DIRECTORY, "Atlases"))
+
+def test_preloaded_images_are_handed_to_load():
+    pygame.display.init()
+    pygame.display.set_mode((200, 100))
+    AssetLoader.clear()
+    path = os.path.join(GFX_DIRECTORY, "maps", "Truancy.png")
+    AssetLoader.preload(path, path)
+    assert list(AssetLoader.pending) == [path]
+    decoded = AssetLoader.pending[path].result()
+    map_gfx = AssetLoader.load(path, alpha=False)
+    assert not AssetLoader.pending
+    assert pygame.image.tobytes(map_gfx, "RGB") == pygame.image.tobytes(decoded, "RGB")
+    # Cached images are not preloaded again
+    AssetLoader.preload(path)
+    assert not AssetLoader.pending
+
+def test_menu_levels_are_preloaded_before_they_are_chosen():
+    AssetLoader.clear()
+    ui = UI(ROOT_DIRECTORY)
+    # Game stand-in without window - just the parts used by Game.preload_levels
+    Game.preload_levels(SimpleNamespace(LEVELS=Game.LEVELS, root_directory=ROOT_DIRECTORY, ui=ui))
+    map_path = os.path.join(GFX_DIRECTORY, "maps", "Truancy.png")
+    assert map_path in AssetLoader.pending
+    # Decoded while the menu is displayed, load_lvl only converts it
+    decoded = AssetLoader.pending[map_path].result()
+    ui.load_lvl(map_name="Truancy", enemies_names={name: name + ".png" for name in Enemy.enemy_types})
+    assert pygame.image.tobytes(ui.map_gfx, "RGB") == pygame.image.tobytes(decoded, "RGB")
+    # Graphics preloaded for the level are all taken by load_lvl (menu graphics are left for the main menu)
+    assert [os.path.dirname(path) for path in AssetLoader.pending] == [os.path.join(GFX_DIRECTORY, "menu")] * 2
+
+def test_preloaded_images_count_against_the_budget():
+    pygame.display.init()
+    pygame.display.set_mode((200, 100))
+    AssetLoader.clear()
+    budget = AssetLoader.budget
+    try:
+        coin = AssetLoader.load(GFX_DIRECTORY, "HUD", "Coin.png")
+        AssetLoader.release(coin)
+        path = os.path.join(GFX_DIRECTORY, "maps", "Truancy.png")
+        AssetLoader.preload(path)
+        decoded = AssetLoader.pending[path].result()
+        assert AssetLoader.pending_memory() == decoded.get_pitch() * decoded.get_height()
+        # Over the budget - unreferenced cached surfaces are evicted first, then preloaded images are dropped
+        AssetLoader.budget = AssetLoader.pending_memory() + AssetLoader.memory - 1
+        AssetLoader.release()
+        assert not AssetLoader.surfaces and path in AssetLoader.pending
+        AssetLoader.budget = AssetLoader.pending_memory() - 1
+        AssetLoader.release()
+        assert not AssetLoader.pending and AssetLoader.pending_memory() == 0
+    finally:
+        AssetLoader.budget = budget
+
+if __name__ == '__main__':
+    unittest.main()
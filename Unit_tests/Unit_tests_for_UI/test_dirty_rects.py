@@ -0,0 +1,69 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+import unittest
+from Classes.UI.Dirty_Rects import DirtyRects
+from Classes.UI.UI import UI
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BACKGROUND_COLOR, SPRITE_COLOR = (0, 0, 255), (255, 0, 0)
+
+
+def renderer():
+    pygame.display.init()
+    screen = pygame.display.set_mode((200, 100))
+    background = pygame.Surface((200, 100))
+    background.fill(BACKGROUND_COLOR)
+    renderer = DirtyRects(screen)
+    renderer.set_background(background)
+    return renderer
+
+def sprite():
+    surface = pygame.Surface((10, 10))
+    surface.fill(SPRITE_COLOR)
+    return surface
+
+def test_first_frame_is_full_redraw():
+    dirty = renderer()
+    dirty.begin()
+    dirty.blit(sprite(), (0, 0))
+    assert dirty.end() == [dirty.screen.get_rect()]
+
+def test_moved_sprite_region_is_restored():
+    dirty = renderer()
+    for position in ((0, 0), (50, 50)):
+        dirty.begin()
+        dirty.blit(sprite(), position)
+        updated = dirty.end()
+    assert updated == [pygame.Rect(0, 0, 10, 10), pygame.Rect(50, 50, 10, 10)]
+    assert dirty.screen.get_at((5, 5))[:3] == BACKGROUND_COLOR
+    assert dirty.screen.get_at((55, 55))[:3] == SPRITE_COLOR
+
+def test_invalidate_forces_full_redraw():
+    dirty = renderer()
+    dirty.begin()
+    dirty.end()
+    dirty.screen.fill(SPRITE_COLOR)
+    dirty.invalidate()
+    dirty.begin()
+    assert dirty.end() == [dirty.screen.get_rect()]
+    assert dirty.screen.get_at((150, 80))[:3] == BACKGROUND_COLOR
+
+def test_ui_menus_invalidate_the_renderer():
+    ui = UI(ROOT_DIRECTORY)
+    ui.FPS = 0
+    ui.load_lvl(map_name="Truancy", enemies_names={"Mati": "Mati.png"})
+    for _ in range(2):
+        ui.renderer.begin()
+        updated = ui.renderer.end()
+    assert updated == []
+    # Intro is drawn over the whole screen outside the renderer
+    ui.intro()
+    ui.renderer.begin()
+    assert ui.renderer.end() == [ui.screen.get_rect()]
+    assert ui.screen.get_at((0, 0)) == ui.static_layer.get_at((0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,19 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import unittest
+from Benchmarks.rendering_benchmark import create_ui, run_scenario, compare
+
+
+def test_frames_are_counted_offscreen():
+    ui = create_ui()
+    result = run_scenario(ui, "100 enemies, 1 tower per type", frames=10, repeat=1)
+    # sprite and hp label of every enemy
+    assert result["blits_per_frame"] >= 200
+    assert result["ms_per_frame"] > 0 and result["text_renders_per_frame"] >= 0
+    assert compare({"100": result}, {"100": result}) == []
+    more_blits = dict(result, blits_per_frame=result["blits_per_frame"] + 1)
+    assert compare({"100": result}, {"100": more_blits}) == [f"100: blits_per_frame {result['blits_per_frame']} -> {more_blits['blits_per_frame']}"]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+import unittest
+from Classes.UI.Text_Cache import TextCache, DigitAtlas
+
+pygame.font.init()
+FONT = pygame.font.SysFont("Consolas", 20)
+
+
+def test_text_cache_reuses_surfaces():
+    cache = TextCache()
+    first = cache.render(FONT, "100", (255, 0, 0))
+    assert cache.render(FONT, "100", (255, 0, 0)) is first
+    assert cache.render(FONT, "100", (0, 0, 0)) is not first
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert first.get_size() == FONT.size("100")
+
+def test_text_cache_evicts_least_recently_used():
+    cache = TextCache(capacity=2)
+    a = cache.render(FONT, "a", (0, 0, 0))
+    cache.render(FONT, "b", (0, 0, 0))
+    cache.render(FONT, "a", (0, 0, 0))
+    cache.render(FONT, "c", (0, 0, 0))
+    assert len(cache) == 2
+    assert cache.render(FONT, "a", (0, 0, 0)) is a
+    assert cache.misses == 3
+    cache.render(FONT, "b", (0, 0, 0))
+    assert cache.misses == 4
+
+def test_digit_atlas_draws_every_glyph():
+    atlas = DigitAtlas(FONT, (0, 0, 0))
+    drawn = []
+    atlas.draw(lambda surface, position: drawn.append(position), 120, (10, 5))
+    assert len(drawn) == 3
+    assert drawn[0] == (10, 5)
+    assert drawn[1] == (10 + atlas.advances["1"], 5)
+    assert drawn[2] == (10 + atlas.advances["1"] + atlas.advances["2"], 5)
+    assert atlas.size("120") == (drawn[2][0] - 10 + atlas.advances["0"], FONT.get_height())
+
+
+if __name__ == '__main__':
+    unittest.main()
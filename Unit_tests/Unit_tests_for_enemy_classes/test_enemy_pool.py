@@ -0,0 +1,63 @@
+import hypothesis.strategies as st
+from hypothesis import given
+import unittest
+import numpy as np
+from Classes.Enemy.Enemy_Pool import EnemyPool
+from Classes.Map.Map_Class import Polyline
+from Classes.Utilities import Coord
+
+PATH = Polyline((Coord(0, 1), Coord(1, 1), Coord(2, 1), Coord(2, 2), Coord(3, 2)))
+
+
+class View:
+    def _detach(self, snapshot):
+        self.snapshot = snapshot
+
+
+@given(st.lists(st.integers(min_value=0, max_value=5), min_size=1, max_size=300))
+def test_killed_enemies_are_compacted_in_order(lives):
+    pool = EnemyPool(capacity=4)
+    views = [View() for _ in lives]
+    for view, life in zip(views, lives):
+        pool.add(view, PATH, life, 5)
+    killed = pool.update()
+    assert killed == lives.count(0)
+    assert pool.views == [view for view, life in zip(views, lives) if life]
+    assert list(pool.life[:pool.count]) == [life for life in lives if life]
+    assert all(view.snapshot.life[0] == 0 for view, life in zip(views, lives) if not life)
+
+def test_damage_sets_attacked_state():
+    pool = EnemyPool()
+    pool.add(View(), PATH, 3, 5)
+    pool.damage(0, 5)
+    assert pool.life[0] == 0
+    assert pool.flags[0] & EnemyPool.ATTACKED
+
+def test_enemy_follows_path_and_leaks_once():
+    pool = EnemyPool()
+    pool.add(View(), PATH, 3, 10)
+    leaks = 0
+    for frame in range(400):
+        pool.update()
+        leaks += pool.collect_leaks()
+        if not pool.count:
+            break
+    assert leaks == 1
+    assert not pool.count
+
+@given(st.lists(st.integers(min_value=1, max_value=10), min_size=1, max_size=50), st.integers(min_value=0, max_value=300))
+def test_positions_are_interpolated_along_path(speeds, frames):
+    pool = EnemyPool()
+    for speed in speeds:
+        pool.add(View(), PATH, 1, speed)
+    for frame in range(frames):
+        pool.update()
+        pool.collect_leaks()
+    distance = pool.distance[:pool.count]
+    x, y = np.interp(distance, PATH.length, PATH.x), np.interp(distance, PATH.length, PATH.y)
+    assert (pool.x[:pool.count] == x).all()
+    assert (pool.y[:pool.count] == y).all()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import hypothesis.strategies as st
+from hypothesis import given
+import numpy as np
+import unittest
+import pytest
+from Classes.Enemy.Enemy_Pool import EnemyPool
+from Classes.Map.Map_Class import Polyline
+from Classes.Utilities import Coord
+
+PATH = Polyline((Coord(0, 1), Coord(1, 1), Coord(2, 1), Coord(2, 2), Coord(3, 2), Coord(3, 3), Coord(4, 3)))
+
+
+class View:
+    def _detach(self, snapshot):
+        self.snapshot = snapshot
+
+
+def spawn(speeds, frames):
+    """Spawns one enemy with every speed (one per frame) and advances the pool"""
+    pool = EnemyPool(capacity=4)
+    for speed in speeds:
+        pool.add(View(), PATH, 1, speed)
+        pool.update()
+    for frame in range(frames):
+        pool.update()
+        pool.collect_leaks()
+    return pool
+
+def in_range(pool, center, r):
+    n = pool.count
+    return np.hypot(pool.x[:n] - center.x, pool.y[:n] - center.y) <= r
+
+@given(st.lists(st.integers(min_value=1, max_value=10), min_size=1, max_size=40), st.integers(min_value=0, max_value=150),
+       st.integers(min_value=0, max_value=600), st.integers(min_value=0, max_value=480), st.integers(min_value=50, max_value=400))
+def test_first_and_last_in_range_match_brute_force(speeds, frames, x, y, r):
+    pool = spawn(speeds, frames)
+    center, r = Coord(x, y), r + 0.5
+    mask = in_range(pool, center, r)
+    first = pool.progress_index.first_in_range(center, r)
+    last = pool.progress_index.last_in_range(center, r)
+    if not mask.any():
+        assert first is None and last is None
+        return
+    progress = np.minimum(pool.progress(), PATH.total_length)
+    first, last = pool.views.index(first), pool.views.index(last)
+    assert mask[first] and progress[first] == progress[mask].max()
+    assert mask[last] and progress[last] == progress[mask].min()
+
+@given(st.lists(st.integers(min_value=1, max_value=10), min_size=1, max_size=20))
+def test_frames_to_leak_predicts_leak(speeds):
+    pool = spawn(speeds, 0)
+    predicted = pool.frames_to_leak()
+    frames = 0
+    while not pool.collect_leaks():
+        pool.update()
+        frames += 1
+    assert frames == predicted
+
+def test_frames_to_leak_without_enemies():
+    assert EnemyPool().frames_to_leak() is None
+
+def test_queries_on_several_paths_are_rejected():
+    pool = EnemyPool(capacity=4)
+    pool.add(View(), PATH, 1, 1)
+    assert pool.progress_index.first_in_range(Coord(0, 120), 200) is pool.views[0]
+    pool.add(View(), Polyline((Coord(0, 0), Coord(1, 0))), 1, 1)
+    with pytest.raises(ValueError):
+        pool.progress_index.first_in_range(Coord(0, 120), 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
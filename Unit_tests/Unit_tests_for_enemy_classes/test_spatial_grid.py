@@ -0,0 +1,61 @@
+import hypothesis.strategies as st
+from hypothesis import given
+import unittest
+from Classes.Enemy.Enemy_Pool import EnemyPool
+from Classes.Map.Map_Class import Polyline
+from Classes.Utilities import Coord
+
+tiles = st.lists(st.tuples(st.integers(min_value=0, max_value=15), st.integers(min_value=0, max_value=8)), max_size=60)
+points = st.builds(Coord, st.integers(min_value=-200, max_value=2100), st.integers(min_value=-200, max_value=1200))
+
+
+class View:
+    def __init__(self, pool):
+        self._pool = pool
+
+    def _detach(self, snapshot):
+        pass
+
+
+def fill(enemy_tiles):
+    """Creates pool with enemies standing in the middle of given tiles."""
+    pool = EnemyPool()
+    for x, y in enemy_tiles:
+        view = View(pool)
+        view._slot = pool.add(view, Polyline((Coord(x, y),)), 1, 1)
+    return pool
+
+def distance(pool, view, center):
+    return ((pool.x[view._slot] - center.x)**2 + (pool.y[view._slot] - center.y)**2)**0.5
+
+@given(tiles, points, st.integers(min_value=0, max_value=800))
+def test_query_radius_matches_brute_force(enemy_tiles, center, r):
+    pool = fill(enemy_tiles)
+    expected = [view for view in pool.views if distance(pool, view, center) <= r]
+    assert pool.grid.query_radius(center, r) == expected
+
+@given(tiles, points, st.integers(min_value=1, max_value=10))
+def test_k_nearest_matches_brute_force(enemy_tiles, center, k):
+    pool = fill(enemy_tiles)
+    expected = sorted(pool.views, key=lambda view: (distance(pool, view, center), view._slot))[:k]
+    assert pool.grid.k_nearest(center, k) == expected
+
+@given(tiles, points)
+def test_k_nearest_skips_excluded_and_far_enemies(enemy_tiles, center):
+    pool = fill(enemy_tiles)
+    excluded = pool.views[::2]
+    expected = [view for view in pool.views[1::2] if distance(pool, view, center) <= 300]
+    expected = sorted(expected, key=lambda view: (distance(pool, view, center), view._slot))[:1]
+    assert pool.grid.k_nearest(center, 1, excluded, 300) == expected
+
+def test_grid_follows_moving_enemies():
+    pool = EnemyPool()
+    view = View(pool)
+    view._slot = pool.add(view, Polyline((Coord(0, 1), Coord(1, 1), Coord(2, 1))), 1, 10)
+    for frame in range(30):
+        pool.update()
+    assert list(pool.grid.buckets) == [(int(pool.x[0] // 120), 1)]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import os
+import unittest
+from Classes.Level.Test_Level import Level
+from Classes.Level.Wave_Schedule import WaveSchedule
+from Classes.Enemy.Enemy import EnemyManager
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def test_repeated_batches_are_kept_in_order():
+    waves = Level.parse_level_data(["Wave 1: 2-Mati, 1-Marta, 1-Mati\n", "Wave 2: 1-Olaf\n"])["waves"]
+    assert waves == ((("Mati", 2), ("Marta", 1), ("Mati", 1)), (("Olaf", 1),))
+    schedule = WaveSchedule.compile(waves)
+    assert [enemy for _, enemy, _ in schedule.waves[0]] == ["Mati", "Mati", "Marta", "Mati"]
+    # 40 frames before the first enemy, then every 41 frames, next wave starts with the cooldown left (40)
+    assert [frame for frame, _, _ in schedule.waves[0]] == [40, 81, 122, 163]
+    assert schedule.waves[1] == ((40, "Olaf", 1.1**0.25),)
+
+def test_level_spawns_by_schedule():
+    Level.reset()
+    level = Level("TRUANCY", ROOT_DIRECTORY)
+    level.current_wave = 4
+    level.remaining_enemies = level.schedule.count(4)
+    assert level.remaining_enemies == 45
+    while level.remaining_enemies:
+        level.spawn_enemy()
+    assert [enemy.name for enemy in EnemyManager.present] == ["Mati"]*10 + ["Marta"]*10 + ["Mati"]*10 + ["Marta"]*15
+    assert level.wave_frame == level.schedule.waves[4][-1][0] + 1
+    Level.reset()
+
+
+if __name__ == '__main__':
+    unittest.main()
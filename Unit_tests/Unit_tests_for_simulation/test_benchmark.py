@@ -0,0 +1,24 @@
+import unittest
+from Benchmarks.simulation_benchmark import SCENARIOS, prepare, run_scenario, compare
+from Classes.Enemy.Enemy import EnemyManager
+from Classes.Tower.Tower_Classes import Tower, Tower_Manager
+
+
+def test_synthetic_scenario_keeps_enemies_on_map():
+    simulation, tick = prepare("synthetic 100 enemies, 1 tower per type")
+    assert len(Tower_Manager.towers) == len(Tower.tower_types)
+    for _ in range(50):
+        assert tick()
+    assert len(EnemyManager.present) == 100
+
+def test_results_are_compared_against_baseline():
+    result = run_scenario("level TEST", ticks=20, repeat=1, alloc_ticks=5)
+    assert result["ticks"] == 20 and result["ticks_per_second"] > 0 and result["peak_kib_per_tick"] >= 0
+    assert compare({"level TEST": result}, {"level TEST": result}) == []
+    slower = dict(result, ticks_per_second=result["ticks_per_second"] / 2)
+    assert compare({"level TEST": result}, {"level TEST": slower}) == ["level TEST: 50% slower"]
+    assert set(SCENARIOS) >= {"level TEST", "level TRUANCY"}
+
+
+if __name__ == '__main__':
+    unittest.main()
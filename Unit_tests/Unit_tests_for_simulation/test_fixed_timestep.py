@@ -0,0 +1,42 @@
+import hypothesis.strategies as st
+from hypothesis import given, settings
+import os
+import unittest
+from types import SimpleNamespace
+from Classes.Game.Game import Game
+from Classes.Simulation.Simulation import Simulation
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def game(speed):
+    """Game stand-in without window - just the parts used by Game.simulate"""
+    simulation = Simulation("TRUANCY", ROOT_DIRECTORY)
+    simulation.start_wave()
+    ui = SimpleNamespace(FPS=60, simulation_speed=lambda: speed)
+    return SimpleNamespace(ui=ui, simulation=simulation, MAX_FRAME_TIME=Game.MAX_FRAME_TIME)
+
+@settings(max_examples=10, deadline=None)
+@given(st.sampled_from([1, 3, 8]), st.lists(st.floats(min_value=0, max_value=0.05), min_size=1, max_size=20))
+def test_ticks_follow_elapsed_time(speed, frame_times):
+    instance = game(speed)
+    accumulator = 0.0
+    for elapsed in frame_times:
+        accumulator = Game.simulate(instance, elapsed, accumulator)
+        assert 0 <= accumulator < 1
+    # Fraction of a frame not simulated yet is carried over
+    assert abs(instance.simulation.frame + accumulator - sum(frame_times) * 60 * speed) < 1e-6
+
+def test_max_speed_runs_multiple_ticks():
+    instance = game(None)
+    assert Game.simulate(instance, 1 / 60, 0.0) == 0.0
+    assert instance.simulation.frame > 1
+
+def test_frame_time_is_bounded():
+    instance = game(1)
+    Game.simulate(instance, 10, 0.0)
+    assert instance.simulation.frame == Game.MAX_FRAME_TIME * 60
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import numpy as np
+import unittest
+from Classes.Profiling.Frame_Profiler import FrameProfiler
+from Classes.Simulation.Simulation import Simulation
+from Classes.Utilities import Coord
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def test_ring_buffer_keeps_last_frames():
+    FrameProfiler.toggle()
+    try:
+        capacity = FrameProfiler.capacity
+        for frame in range(capacity + 10):
+            FrameProfiler.add("render", frame / 1000)
+            FrameProfiler.add("render", frame / 1000)
+            FrameProfiler.end_frame()
+        assert FrameProfiler.count == capacity and FrameProfiler.index == 10
+        render = FrameProfiler.samples[:, FrameProfiler.SECTIONS.index("render")]
+        assert sorted(render) == [2 * frame / 1000 for frame in range(10, capacity + 10)]
+        p50, p95, p99 = FrameProfiler.percentiles()["render"]
+        assert p50 < p95 < p99 == np.percentile(render, 99) * 1000
+        assert len(FrameProfiler.report()) == len(FrameProfiler.SECTIONS) + 1
+    finally:
+        FrameProfiler.toggle()
+    assert not FrameProfiler.enabled
+
+def test_simulation_subsystems_are_timed():
+    simulation = Simulation("TRUANCY", ROOT_DIRECTORY, auto_start_waves=True)
+    simulation.player.gold = 10**6
+    assert simulation.place_tower("Algebra_LT", Coord(4, 2))
+    simulation.timer = FrameProfiler.add
+    FrameProfiler.toggle()
+    try:
+        for frame in range(50):
+            simulation.step(3)
+            FrameProfiler.end_frame()
+        percentiles = FrameProfiler.percentiles()
+        assert all(percentiles[section][0] > 0 for section in ("enemies", "towers", "projectiles"))
+        assert percentiles["render"] == (0, 0, 0)
+    finally:
+        FrameProfiler.toggle()
+
+def test_simulation_is_not_timed_without_timer():
+    simulation = Simulation("TRUANCY", ROOT_DIRECTORY, auto_start_waves=True)
+    simulation.player.gold = 10**6
+    assert simulation.place_tower("Algebra_LT", Coord(4, 2))
+    FrameProfiler.toggle()
+    try:
+        simulation.step(150)
+        FrameProfiler.end_frame()
+        assert all(FrameProfiler.percentiles()[section] == (0, 0, 0) for section in ("enemies", "towers", "projectiles"))
+    finally:
+        FrameProfiler.toggle()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+Golden traces - state hashes of the TEST and TRUANCY levels played with a fixed set of towers.
+Changes that are not meant to alter gameplay (eg. performance refactors) must keep them identical.
+After an intended gameplay change regenerate them with:
+    GOLDEN_UPDATE=1 python -m pytest Unit_tests/Unit_tests_for_simulation/test_golden_traces.py
+"""
+import os
+import pytest
+import unittest
+from Classes.Simulation.Simulation import Simulation
+from Classes.Tower.Tower_Classes import Tower_Manager
+from Classes.Utilities import Coord
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+TRACES_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden_traces")
+# (tower, tile, target criteria) - covers bouncing, aoe and all target criteria
+TOWERS = (("Algebra_LT", Coord(4, 2), 'front'),
+          ("Analysis_calculus_specialist", Coord(6, 2), 'back'),
+          ("Algebra_complex_", Coord(8, 2), 'high_hp'),
+          ("Analysis_basic", Coord(10, 2), 'low_hp'),
+          ("Programming_object", Coord(11, 3), 'front'),
+          ("Programing_spaghetti_decoder", Coord(13, 5), 'low_hp'))
+
+
+def scenario(level: str) -> Simulation:
+    simulation = Simulation(level, ROOT_DIRECTORY, auto_start_waves=True)
+    simulation.player.gold = 10**6
+    for tower, tile, criteria in TOWERS:
+        assert simulation.place_tower(tower, tile)
+        list(Tower_Manager.towers)[-1].target_criteria = criteria
+    return simulation
+
+@pytest.mark.parametrize("level", ["TEST", "TRUANCY"])
+def test_golden_trace(level):
+    trace = scenario(level).record_trace()
+    path = os.path.join(TRACES_DIRECTORY, f"{level}.trace")
+    if os.environ.get("GOLDEN_UPDATE"):
+        Simulation.save_trace(path, trace)
+    assert Simulation.compare_traces(Simulation.load_trace(path), trace) is None
+
+def test_golden_trace_with_replaced_tower():
+    # Upgrade removes a tower, the next placed tower takes its released slot - towers are updated in slot order
+    simulation = scenario("TEST")
+    simulation.step(600)
+    assert simulation.upgrade_tower(Coord(10, 2), "Analysis_calculus_specialist")
+    simulation.step(1)
+    assert simulation.place_tower("Algebra_basic", Coord(10, 3))
+    assert [tower.tower_type.tower_name for tower in Tower_Manager.towers] == \
+        ["Algebra_LT", "Analysis_calculus_specialist", "Algebra_complex_", "Algebra_basic",
+         "Programming_object", "Programing_spaghetti_decoder", "Analysis_calculus_specialist"]
+    trace = simulation.record_trace()
+    path = os.path.join(TRACES_DIRECTORY, "TEST_replaced_tower.trace")
+    if os.environ.get("GOLDEN_UPDATE"):
+        Simulation.save_trace(path, trace)
+    assert Simulation.compare_traces(Simulation.load_trace(path), trace) is None
+
+def test_runs_are_reproducible():
+    first = scenario("TRUANCY").record_trace(interval=1, max_frames=600)
+    second = scenario("TRUANCY").record_trace(interval=1, max_frames=600)
+    assert first == second
+    assert Simulation.compare_traces(first, second) is None
+    assert Simulation.compare_traces(first, first[:300] + [(301, "0")]) == 301
+
+
+if __name__ == '__main__':
+    unittest.main()
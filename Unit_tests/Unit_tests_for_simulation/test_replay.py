@@ -0,0 +1,65 @@
+import hypothesis.strategies as st
+from hypothesis import given, settings
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from Classes.Game.Game import Game
+from Classes.Simulation.Replay import Replay
+from Classes.Simulation.Simulation import Simulation
+from Classes.Utilities import Coord
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+TILES = (Coord(4, 2), Coord(6, 2), Coord(8, 2), Coord(10, 2), Coord(11, 3), Coord(13, 5))
+
+
+def play_session(wave_frames):
+    """Plays TEST level placing a tower and starting a wave every given number of frames"""
+    simulation = Simulation("TEST", ROOT_DIRECTORY)
+    for i, frames in enumerate(wave_frames):
+        simulation.place_tower("Analysis_basic", TILES[i % len(TILES)])
+        simulation.set_speed(3 if i % 2 else None)
+        simulation.start_wave()
+        simulation.step(frames)
+        if i == 1:
+            simulation.upgrade_tower(TILES[0], "Analysis_calculus_specialist")
+    simulation.step(10**6)
+    return simulation
+
+@settings(max_examples=5, deadline=None)
+@given(st.lists(st.integers(min_value=0, max_value=2000), min_size=1, max_size=5))
+def test_playback_reproduces_session(wave_frames):
+    session = play_session(wave_frames)
+    replay = Replay.from_bytes(session.replay.to_bytes())
+    assert replay.actions == session.replay.actions
+    playback = Simulation.play_replay(replay, ROOT_DIRECTORY)
+    assert playback.frame == session.frame
+    assert playback.state_hash() == session.state_hash()
+
+def test_records_take_eight_bytes():
+    replay = Replay("TEST")
+    header = len(replay.to_bytes())
+    for frame in range(100):
+        replay.record(frame, Replay.WAVE)
+    assert len(replay.to_bytes()) == header + 800
+
+def test_playback_stops_at_max_frames():
+    replay = play_session([500, 500]).replay
+    assert Simulation.play_replay(replay, ROOT_DIRECTORY, max_frames=300).frame == 300
+
+def test_replay_file_name_is_safe_and_failed_saves_are_skipped():
+    with tempfile.TemporaryDirectory() as directory:
+        # Game stand-in without window - just the parts used by Game.save_replay
+        simulation = Simulation("TEST", ROOT_DIRECTORY)
+        instance = SimpleNamespace(replay_directory=directory, simulation=simulation,
+                                   player=SimpleNamespace(name="a/b:c?*"))
+        path = Game.save_replay(instance)
+        assert os.path.dirname(path) == directory and os.path.basename(path).startswith("TEST_a_b_c___")
+        assert Replay.load(path).actions == simulation.replay.actions
+        # Unwritable directory (a file is in its place) - the replay is skipped
+        instance.replay_directory = path
+        assert Game.save_replay(instance) is None
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import hypothesis.strategies as st
+from hypothesis import given, settings
+import os
+import unittest
+from Classes.Simulation.Simulation import Simulation
+from Classes.Simulation.Replay import Replay
+from Classes.Tower.Tower_Classes import Tower_Manager, Tower
+from Classes.Utilities import Coord
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def test_step_waits_for_wave_start():
+    simulation = Simulation("TEST", ROOT_DIRECTORY)
+    assert simulation.step(10) == 0
+    assert simulation.start_wave()
+    assert simulation.step(10) == 10
+    assert simulation.frame == 10
+
+def test_run_without_towers_ends_in_game_over():
+    simulation = Simulation("TRUANCY", ROOT_DIRECTORY)
+    simulation.run()
+    assert simulation.finished
+    assert simulation.game_over
+
+def test_place_tower_on_blocked_tile_fails():
+    simulation = Simulation("TEST", ROOT_DIRECTORY)
+    start = simulation.level.map.paths[0][0]
+    assert not simulation.place_tower("Algebra_basic", start)
+    assert not Tower_Manager.towers
+
+def test_towers_defend_test_level():
+    simulation = Simulation("TEST", ROOT_DIRECTORY, auto_start_waves=True)
+    for tile in (Coord(4, 2), Coord(6, 2), Coord(8, 2), Coord(10, 2), Coord(11, 3), Coord(13, 5)):
+        assert simulation.place_tower("Analysis_basic", tile)
+    simulation.run()
+    assert simulation.finished
+    assert not simulation.game_over
+
+def test_tower_changes_bump_layout_version():
+    simulation = Simulation("TEST", ROOT_DIRECTORY)
+    simulation.player.gold = 1000
+    version = Tower_Manager.layout_version
+    assert simulation.place_tower("Analysis_basic", Coord(4, 2))
+    assert Tower_Manager.layout_version > version
+    version = Tower_Manager.layout_version
+    simulation.step(10)
+    assert Tower_Manager.layout_version == version
+    assert simulation.upgrade_tower(Coord(4, 2), "Analysis_calculus_specialist")
+    assert Tower_Manager.layout_version > version
+
+def test_invalid_or_unaffordable_upgrades_are_rejected():
+    simulation = Simulation("TEST", ROOT_DIRECTORY)
+    simulation.player.gold = 1000
+    assert simulation.place_tower("Analysis_basic", Coord(4, 2))
+    # Another upgrade tree and the same tier
+    assert not simulation.upgrade_tower(Coord(4, 2), "Algebra_LT")
+    assert not simulation.upgrade_tower(Coord(4, 2), "Analysis_basic")
+    simulation.player.gold = Tower.tower_types["Analysis_calculus_specialist"][7] - 1
+    assert not simulation.upgrade_tower(Coord(4, 2), "Analysis_calculus_specialist")
+    assert simulation.player.gold == Tower.tower_types["Analysis_calculus_specialist"][7] - 1
+    assert [action for _, action, _, _ in simulation.replay.actions] == [Replay.PLACE]
+
+@settings(max_examples=10, deadline=None)
+@given(st.integers(min_value=1, max_value=200))
+def test_step_simulates_requested_frames(n_frames):
+    simulation = Simulation("TRUANCY", ROOT_DIRECTORY, auto_start_waves=True)
+    assert simulation.step(n_frames) == n_frames
+    assert simulation.frame == n_frames
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import hypothesis.strategies as st
+from hypothesis import given, settings
+import os
+import unittest
+from Classes.Enemy.Enemy import EnemyManager
+from Classes.Map.Map_Class import Map
+from Classes.Tower.Tower_Classes import Tower_Manager
+from Classes.Utilities import Coord
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+MAP = Map(ROOT_DIRECTORY, "Truancy")
+
+
+def spawn(lives, frames_between = 5):
+    """Spawns enemies with given lives, each one some frames ahead of the next one."""
+    EnemyManager.reset()
+    Tower_Manager.reset()
+    enemies = []
+    for life in lives:
+        for frame in range(frames_between):
+            EnemyManager.update()
+        enemies.append(EnemyManager(MAP, "Marta"))
+        EnemyManager.pool.life[enemies[-1]._slot] = life
+    return enemies
+
+@settings(max_examples=30, deadline=None)
+@given(st.lists(st.integers(min_value=1, max_value=50), min_size=1, max_size=20))
+def test_target_criteria(lives):
+    enemies = spawn(lives)
+    tower_criteria = ['low_hp', 'high_hp', 'front', 'back']
+    for criteria in tower_criteria:
+        tower = Tower_Manager("Algebra_complex_", Coord(120, 240))
+        tower.target_criteria = criteria
+        tower.tower_type.atk = 0
+    targets = Tower_Manager.acquire_targets()
+    assert targets[0] is enemies[lives.index(min(lives))]
+    assert targets[1] is enemies[lives.index(max(lives))]
+    # First spawned enemy is the closest to the end of the path
+    assert targets[2] is enemies[0]
+    assert targets[3] is enemies[-1]
+
+def test_no_target_out_of_range():
+    spawn([5])
+    Tower_Manager("Analysis_basic", Coord(1800, 900)).tower_type.atk = 0
+    assert Tower_Manager.acquire_targets() == [None]
+
+def test_towers_on_cooldown_do_not_target():
+    spawn([5])
+    Tower_Manager("Algebra_complex_", Coord(120, 240))
+    assert Tower_Manager.acquire_targets() == [None]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import hypothesis.strategies as st
+from hypothesis import given
+from math import ceil
+import unittest
+from Classes.Tower.Projectile_Pool import ProjectilePool
+from Classes.Utilities import Coord
+
+coords = st.builds(Coord, st.integers(min_value=0, max_value=1920), st.integers(min_value=0, max_value=1080))
+
+
+def reference_path(start, finish, speed = 60):
+    """Positions of a projectile in following frames (the way Projectiles used to move)"""
+    base = finish - start
+    length = (base.x**2 + base.y**2)**0.5
+    step = Coord(base.x/length*speed, base.y/length*speed) if length else Coord(0, 0)
+    positions, travelled, steps = [], 0, 0
+    while travelled <= length:
+        steps += 1
+        positions.append((ceil(start.x + step.x*steps), ceil(start.y + step.y*steps)))
+        travelled += speed
+    return positions
+
+@given(st.lists(st.tuples(coords, coords, st.integers(min_value=0, max_value=5)), min_size=1, max_size=60))
+def test_projectiles_follow_reference_paths(shots):
+    pool = ProjectilePool(capacity=16)
+    expected = []
+    for start, finish, frames in shots:
+        if pool.fire(start, finish, "bullet") != -1:
+            expected.append(reference_path(start, finish))
+        for frame in range(frames + 1):
+            pool.update()
+            assert sorted(zip(*pool.positions())) == sorted(path[0] for path in expected if path)
+            expected = [path[1:] for path in expected if path]
+    assert pool.count + len(pool.free) == pool.capacity
+
+def test_full_pool_drops_shots_and_reuses_slots():
+    pool = ProjectilePool(capacity=2)
+    assert pool.fire(Coord(0, 0), Coord(100, 0), "bullet") == 0
+    assert pool.fire(Coord(0, 0), Coord(1000, 0), "bullet") == 1
+    assert pool.fire(Coord(0, 0), Coord(100, 0), "bullet") == -1
+    for frame in range(3):
+        pool.update()
+    assert pool.count == 1
+    assert pool.fire(Coord(0, 0), Coord(100, 0), "other") == 0
+    assert [asset for asset, position in pool.displayed()] == ["bullet", "other"]
+    pool.clear()
+    assert not pool.count and sorted(pool.free) == [0, 1]
+
+
+if __name__ == '__main__':
+    unittest.main()
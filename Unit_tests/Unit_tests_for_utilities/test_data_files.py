@@ -0,0 +1,24 @@
+import os
+import unittest
+from Classes.Map.Map_Class import Map, Polyline
+from Classes.Map_generator.assets_builder import validate_data
+from Classes.Utilities import Coord
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+MAP_PATH = os.path.join(ROOT_DIRECTORY, "Assets", "gfx", "maps", "Truancy.dat")
+
+
+def test_map_objects_are_built_from_parsed_data():
+    with open(MAP_PATH) as file:
+        data = Map.parse_map_data(file.readlines())
+    loaded = Map(ROOT_DIRECTORY, "Truancy")
+    assert loaded.name == data["name"] == "Truancy"
+    assert isinstance(loaded.paths[0][0], Coord) and isinstance(loaded.polylines[0], Polyline)
+    assert [tuple(tile) for tile in loaded.paths[0]] == list(data["paths"][0])
+
+def test_game_data_is_valid():
+    assert validate_data(ROOT_DIRECTORY) == []
+
+
+if __name__ == '__main__':
+    unittest.main()
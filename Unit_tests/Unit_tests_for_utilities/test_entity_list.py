@@ -0,0 +1,47 @@
+import hypothesis.strategies as st
+from hypothesis import given
+import unittest
+from Classes.Utilities import EntityList
+
+
+@given(st.lists(st.integers(), max_size=100), st.sets(st.integers(min_value=0, max_value=99)))
+def test_removal_during_iteration_visits_every_entity(items, removed):
+    entities = EntityList()
+    for item in items:
+        entities.add(item)
+    visited = []
+    for i, (handle, item) in enumerate(entities.handles()):
+        visited.append(item)
+        if i in removed:
+            entities.remove(handle)
+    entities.flush()
+    assert visited == items
+    assert list(entities) == [item for i, item in enumerate(items) if i not in removed]
+    assert len(entities) == len(items) - len(removed & set(range(len(items))))
+
+def test_stale_handles_and_slot_reuse():
+    entities = EntityList()
+    first, second = entities.add("a"), entities.add("b")
+    assert entities.remove(first)
+    assert not entities.remove(first)
+    # Slot is released only by flush
+    assert entities.add("c")[0] == 2
+    entities.flush()
+    reused = entities.add("d")
+    assert reused[0] == first[0] and reused != first
+    assert entities.get(first) is None and entities.get(reused) == "d"
+    entities.clear()
+    assert not len(entities) and entities.get(second) is None
+
+def test_entities_removed_later_in_iteration_are_skipped():
+    entities = EntityList()
+    handles = [entities.add(i) for i in range(4)]
+    visited = []
+    for item in entities:
+        visited.append(item)
+        entities.remove(handles[3])
+    assert visited == [0, 1, 2]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import os
+import sys
+import subprocess
+import unittest
+from Classes.Profiling.Startup_Profiler import StartupProfiler
+
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def test_headless_modules_do_not_import_pygame():
+    code = ("import sys, Classes.Simulation.Simulation, Classes.Map_generator.assets_builder; "
+            "print('pygame' in sys.modules, 'PIL' in sys.modules)")
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT_DIRECTORY, capture_output=True, text=True, check=True)
+    assert output.stdout.split() == ["False", "False"]
+
+def test_profiler_records_only_when_enabled():
+    StartupProfiler.enabled = False
+    with StartupProfiler.measure("import", "nothing"):
+        pass
+    assert StartupProfiler.timings == []
+    StartupProfiler.enable()
+    try:
+        with StartupProfiler.measure("import", "a"):
+            pass
+        StartupProfiler.record("decode", "b.png", 0.5)
+        StartupProfiler.mark("first frame")
+        report = StartupProfiler.report()
+        assert [(category, name) for category, name, _ in StartupProfiler.timings] == [("import", "a"), ("decode", "b.png")]
+        assert "500.0  b.png" in report and "first frame" in report
+    finally:
+        StartupProfiler.enabled = False
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,23 @@
-"""This script works as prototype launcher"""
+"""This script works as prototype launcher (run with --profile-startup to report startup timings)"""
 
-from Classes.Game.Game import Game
-import os
+from time import perf_counter
+START = perf_counter()
+import os, sys
+from Classes.Profiling.Startup_Profiler import StartupProfiler
 
 
 if __name__ == "__main__":
+    if "--profile-startup" in sys.argv[1:]:
+        StartupProfiler.enable(START)
+
+    # Heavy dependencies first, so the profile shows them separately from the game modules
+    with StartupProfiler.measure("import", "pygame"):
+        import pygame
+    with StartupProfiler.measure("import", "numpy"):
+        import numpy
+    with StartupProfiler.measure("import", "game modules"):
+        from Classes.Game.Game import Game
+
     # Get current directory for easy relative paths
     scripts_directory = os.path.dirname(os.path.abspath(__file__))
-    Game(scripts_directory, True, True)
\ No newline at end of file
+    Game(scripts_directory, True, True)